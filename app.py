@@ -5,29 +5,70 @@ Aplicación To-Do con Kivy y SQLite
 Interfaz de usuario principal
 """
 
+import logging
+import os
+import time
+
+# Referencia de las métricas de arranque cuando main.py no indica otra
+INICIO_MODULO = time.perf_counter()
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
-from kivy.uix.popup import Popup
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.checkbox import CheckBox
-from kivy.uix.spinner import Spinner
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.graphics import Color, Rectangle
 from kivy.clock import Clock
-from gestor import GestorTareas
+from gestor import (DIAS_ARCHIVO, DIAS_PROXIMAS, ORDENES, ORDENES_ARCHIVO, PRIORIDADES, GestorTareas,
+                    clave_orden, leer_fecha_limite)
+from gestor_async import GestorTareasAsync
+from instrumentacion import instrumentado, metricas
+
+# Spinner y los diálogos (dialogos.py, que importa Popup) no hacen falta
+# para el primer frame: se importan dentro de los métodos que los crean
+
+
+registro = logging.getLogger(__name__)
+
 
+# Tareas cargadas por página; la primera página llena la pantalla inicial
+TAMANO_PAGINA = 50
 
-class TareaWidget(BoxLayout):
+# Segundos entre comprobaciones de escrituras de otros procesos
+INTERVALO_CAMBIOS_EXTERNOS = 1.0
+
+# Segundos tras el primer frame hasta el primer archivado, y entre archivados
+RETARDO_ARCHIVO = 30
+INTERVALO_ARCHIVO = 3600
+
+# Opciones de los selectores de la cabecera -> valores de GestorTareas
+# ("archivadas" lee la base de datos de archivo, solo al elegirla;
+# "vencidas" y "proximas" son pendientes por fecha límite)
+FILTROS_LISTA = {"Todas": "todas", "Pendientes": "pendientes", "Completadas": "completadas",
+                 "Vencidas": "vencidas", "Próximas": "proximas", "Archivadas": "archivadas"}
+ORDENES_LISTA = {"Más recientes": "recientes", "Más antiguas": "antiguas",
+                 "Prioridad": "prioridad", "Fecha límite": "vencimiento"}
+
+# Órdenes que agrupan la lista (cabecera en la primera fila de cada grupo)
+# y cuya clave cambia al editar la tarea
+ORDENES_AGRUPADOS = ("prioridad", "vencimiento")
+
+
+class TareaWidget(RecycleDataViewBehavior, BoxLayout):
     """
-    Widget personalizado para mostrar una tarea individual
+    Fila reciclable que muestra una tarea individual.
+    RecycleView crea solo las filas visibles y las reasigna con refresh_view_attrs
     """
     
-    def __init__(self, tarea_data, app_instance, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.tarea_data = tarea_data
-        self.app = app_instance
+        self.tarea_data = None
+        self.index = None
+        self._actualizando = False
         self.orientation = 'horizontal'
         self.size_hint_y = None
         self.height = 60
@@ -36,14 +77,37 @@ class TareaWidget(BoxLayout):
         
         self.crear_widgets()
     
+    @property
+    def app(self):
+        return App.get_running_app()
+    
     def crear_widgets(self):
         """
-        Crea los widgets para mostrar la tarea
+        Crea los widgets de la fila una sola vez; los datos se asignan en refresh_view_attrs
         """
-        tarea_id, titulo, descripcion, completada, fecha_creacion, fecha_actualizacion = self.tarea_data
+        # Fondo de la fila (transparente mientras la tarea esté pendiente)
+        with self.canvas.before:
+            self.fondo_color = Color(0.9, 0.9, 0.9, 0)
+            self.fondo = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._actualizar_fondo, size=self._actualizar_fondo)
+        
+        # Nombre del grupo en la primera fila de cada uno (solo en los órdenes agrupados)
+        self.grupo_label = Label(
+            size_hint_x=None,
+            width=0,
+            font_size='12sp',
+            halign='left',
+            valign='top',
+            color=(0.2, 0.4, 0.8, 1)
+        )
+        self.grupo_label.bind(size=self.grupo_label.setter('text_size'))
+        
+        # Casilla de selección múltiple (oculta fuera del modo selección)
+        self.seleccion = CheckBox(size_hint_x=None, width=0, opacity=0, disabled=True)
+        self.seleccion.bind(active=self.on_seleccion_change)
         
         # Checkbox para marcar como completada
-        self.checkbox = CheckBox(active=bool(completada))
+        self.checkbox = CheckBox()
         self.checkbox.bind(active=self.on_checkbox_change)
         
         # Layout para el contenido de la tarea
@@ -51,7 +115,6 @@ class TareaWidget(BoxLayout):
         
         # Título de la tarea
         self.titulo_label = Label(
-            text=f"[b]{titulo}[/b]",
             markup=True,
             size_hint_y=0.6,
             text_size=(None, None),
@@ -61,7 +124,6 @@ class TareaWidget(BoxLayout):
         
         # Descripción de la tarea
         self.descripcion_label = Label(
-            text=descripcion if descripcion else "Sin descripción",
             size_hint_y=0.4,
             text_size=(None, None),
             halign='left',
@@ -73,7 +135,7 @@ class TareaWidget(BoxLayout):
         content_layout.add_widget(self.descripcion_label)
         
         # Layout para los botones
-        buttons_layout = BoxLayout(orientation='horizontal', size_hint_x=0.4, spacing=5)
+        self.buttons_layout = buttons_layout = BoxLayout(orientation='horizontal', size_hint_x=0.4, spacing=5)
         
         # Botón Editar
         btn_editar = Button(
@@ -81,7 +143,7 @@ class TareaWidget(BoxLayout):
             size_hint_x=0.5,
             background_color=(0.2, 0.6, 0.8, 1)
         )
-        btn_editar.bind(on_press=lambda x: self.app.editar_tarea(tarea_id))
+        btn_editar.bind(on_press=lambda x: self.app.editar_tarea(self.tarea_data.id))
         
         # Botón Eliminar
         btn_eliminar = Button(
@@ -89,32 +151,78 @@ class TareaWidget(BoxLayout):
             size_hint_x=0.5,
             background_color=(0.8, 0.2, 0.2, 1)
         )
-        btn_eliminar.bind(on_press=lambda x: self.app.eliminar_tarea(tarea_id))
+        btn_eliminar.bind(on_press=lambda x: self.app.eliminar_tarea(self.tarea_data.id))
         
         buttons_layout.add_widget(btn_editar)
         buttons_layout.add_widget(btn_eliminar)
         
         # Agregar todos los widgets al layout principal
+        self.add_widget(self.grupo_label)
+        self.add_widget(self.seleccion)
         self.add_widget(self.checkbox)
         self.add_widget(content_layout)
         self.add_widget(buttons_layout)
+    
+    @instrumentado("interfaz.refresh_view_attrs")
+    def refresh_view_attrs(self, rv, index, data):
+        """
+        Reasigna la fila reciclada a la tarea en la posición index
+        """
+        self.index = index
+        self.tarea_data = tarea = data['tarea']
+        completada = tarea.completada
+        
+        marca = f"{'!' * tarea.prioridad} " if tarea.prioridad else ""
+        self.titulo_label.text = f"[b]{marca}{tarea.titulo}[/b]"
+        descripcion = tarea.descripcion if tarea.descripcion else "Sin descripción"
+        if tarea.fecha_limite is not None:
+            descripcion = f"📅 {time.strftime('%d/%m/%Y', time.localtime(tarea.fecha_limite))} · {descripcion}"
+        self.descripcion_label.text = descripcion
+        
+        app = self.app
+        agrupada = app.orden_vista() in ORDENES_AGRUPADOS and not app.busqueda_activa
+        self.grupo_label.width = 110 if agrupada else 0
+        self.grupo_label.text = app.cabecera_grupo(index) if agrupada else ""
+        en_seleccion = app.modo_seleccion
+        self.seleccion.width = 40 if en_seleccion else 0
+        self.seleccion.opacity = 1 if en_seleccion else 0
+        # Las tareas archivadas solo se consultan
+        archivada = data.get('archivada', False)
+        self.seleccion.disabled = not en_seleccion or archivada
+        self.checkbox.disabled = self.buttons_layout.disabled = archivada
+        
+        # Evitar que el cambio programático dispare on_checkbox_change
+        self._actualizando = True
+        self.checkbox.active = bool(completada)
+        self.seleccion.active = en_seleccion and tarea.id in app.seleccionadas
+        self._actualizando = False
         
-        # Aplicar estilo si está completada
         if completada:
             self.aplicar_estilo_completada()
+        else:
+            self.aplicar_estilo_pendiente()
     
     def on_checkbox_change(self, instance, value):
         """
         Maneja el cambio en el checkbox
         """
-        tarea_id = self.tarea_data[0]
-        self.app.gestor.marcar_completada(tarea_id, value)
-        self.app.actualizar_lista_tareas()
+        if self._actualizando or self.tarea_data is None:
+            return
         
-        if value:
-            self.aplicar_estilo_completada()
-        else:
-            self.aplicar_estilo_pendiente()
+        self.app.cambiar_estado_tarea(self.tarea_data, value)
+    
+    def on_seleccion_change(self, instance, value):
+        """
+        Añade o quita la tarea de la selección múltiple
+        """
+        if self._actualizando or self.tarea_data is None:
+            return
+        
+        self.app.cambiar_seleccion(self.tarea_data, value)
+    
+    def _actualizar_fondo(self, *args):
+        self.fondo.pos = self.pos
+        self.fondo.size = self.size
     
     def aplicar_estilo_completada(self):
         """
@@ -122,11 +230,7 @@ class TareaWidget(BoxLayout):
         """
         self.titulo_label.color = (0.4, 0.4, 0.4, 1)
         self.descripcion_label.color = (0.5, 0.5, 0.5, 1)
-        self.canvas.before.clear()
-        with self.canvas.before:
-            from kivy.graphics import Color, Rectangle
-            Color(0.9, 0.9, 0.9, 1)
-            Rectangle(pos=self.pos, size=self.size)
+        self.fondo_color.a = 1
     
     def aplicar_estilo_pendiente(self):
         """
@@ -134,20 +238,64 @@ class TareaWidget(BoxLayout):
         """
         self.titulo_label.color = (0, 0, 0, 1)
         self.descripcion_label.color = (0.6, 0.6, 0.6, 1)
-        self.canvas.before.clear()
+        self.fondo_color.a = 0
 
 
 class TodoApp(App):
     """
     Aplicación principal To-Do
+    
+    El arranque está pensado para mostrar la primera página cuanto antes:
+    el esquema se comprueba en el hilo de la base de datos, los selectores
+    de filtro se crean tras el primer frame y Popup/Spinner se importan al
+    usarse por primera vez. Los diálogos se construyen una sola vez y se
+    reutilizan desde un pool.
     """
     
+    def __init__(self, inicio_arranque=None, **kwargs):
+        """
+        Args:
+            inicio_arranque (float): time.perf_counter() al iniciar el
+                proceso; por defecto, al importar este módulo
+        """
+        super().__init__(**kwargs)
+        self.inicio_arranque = inicio_arranque if inicio_arranque is not None else INICIO_MODULO
+        # Segundos desde el inicio: construccion, primera_pagina, primer_frame, primera_fila
+        self.metricas_arranque = {}
+    
     def build(self):
         """
         Construye la interfaz de usuario
         """
         self.title = "📝 App To-Do con SQLite"
-        self.gestor = GestorTareas()
+        # Perfil de memoria (TODO_PERFIL_MEMORIA=1): la base es la app aún sin
+        # tareas. memoria (y con él tracemalloc) solo se importa si se pide
+        self.perfil = None
+        if os.environ.get('TODO_PERFIL_MEMORIA', '') not in ('', '0'):
+            from memoria import perfil
+            self.perfil = perfil
+            perfil.iniciar()
+            # Medir cuando el RecycleView ya creó las filas de la última página
+            self.disparar_perfil = Clock.create_trigger(self.medir_memoria_lista, 0.5)
+        # TODO_DB permite abrir otra base de datos (por ejemplo en los benchmarks)
+        self.gestor = GestorTareas(os.environ.get('TODO_DB', 'tareas.db'), inicializar=False)
+        # Las consultas se ejecutan en un hilo aparte para no bloquear los frames;
+        # TODO_RETARDO_DB simula un disco lento (segundos por operación)
+        self.db = GestorTareasAsync(self.gestor, retardo=float(os.environ.get('TODO_RETARDO_DB', 0)))
+        # Primera tarea del hilo (es FIFO): abrir la conexión y comprobar el esquema
+        self.db.llamar('inicializar_db')
+        self.estadisticas = {'total': 0, 'completadas': 0, 'pendientes': 0, 'archivadas': 0}
+        # TODO_DIAS_ARCHIVO: días sin cambios tras los que se archiva una completada
+        self.dias_archivo = int(os.environ.get('TODO_DIAS_ARCHIVO', DIAS_ARCHIVO))
+        self.archivadas_en_curso = 0
+        # Última secuencia del registro de cambios reflejada en la lista
+        self.cursor_cambios = None
+        # Diálogos reutilizables, creados al abrirse por primera vez
+        self.pool_dialogos = None
+        # Los cambios de checkbox se escriben como mucho cada medio segundo
+        self.disparar_vaciado = Clock.create_trigger(self.vaciar_cambios_pendientes, 0.5)
+        # IDs cuyo estado se muestra ya pero aún no se ha enviado a escribir
+        self.estados_sin_guardar = set()
         
         # Layout principal
         main_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
@@ -190,6 +338,29 @@ class TodoApp(App):
         agregar_layout.add_widget(self.descripcion_input)
         agregar_layout.add_widget(btn_agregar)
         
+        # Campo de búsqueda (texto completo sobre título y descripción)
+        self.busqueda_input = TextInput(
+            hint_text="🔍 Buscar tareas...",
+            multiline=False
+        )
+        # Esperar a que el usuario deje de escribir antes de consultar
+        self.disparar_busqueda = Clock.create_trigger(self.ejecutar_busqueda, 0.2)
+        self.busqueda_input.bind(text=lambda instance, texto: self.disparar_busqueda())
+        self.busqueda_activa = False
+        
+        # Filtro por estado y orden; los selectores se añaden tras el primer frame
+        self.filtro = "todas"
+        self.orden = "recientes"
+        self.filtros_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40, spacing=10)
+        self.filtros_layout.add_widget(self.busqueda_input)
+        self.filtro_spinner = None
+        
+        # Acciones sobre varias tareas; los botones se añaden tras el primer frame
+        self.modo_seleccion = False
+        self.seleccionadas = set()
+        self.acciones_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40, spacing=10)
+        self.btn_seleccionar = None
+        
         # Estadísticas
         self.stats_label = Label(
             text="📊 Cargando estadísticas...",
@@ -198,23 +369,165 @@ class TodoApp(App):
             color=(0.4, 0.4, 0.4, 1)
         )
         
-        # ScrollView para la lista de tareas
-        scroll = ScrollView()
-        self.lista_tareas = BoxLayout(orientation='vertical', spacing=5, size_hint_y=None)
-        self.lista_tareas.bind(minimum_height=self.lista_tareas.setter('height'))
-        scroll.add_widget(self.lista_tareas)
+        # Mensaje para la lista vacía (oculto mientras haya tareas)
+        self.sin_tareas_label = Label(
+            text="📝 No hay tareas. ¡Agrega tu primera tarea!",
+            size_hint_y=None,
+            height=0,
+            opacity=0,
+            color=(0.6, 0.6, 0.6, 1)
+        )
+        
+        # RecycleView para la lista de tareas: solo se crean las filas visibles
+        self.lista_tareas = RecycleView(viewclass=TareaWidget)
+        layout_lista = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=5,
+            default_size=(None, 60),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout_lista.bind(minimum_height=layout_lista.setter('height'))
+        self.lista_tareas.add_widget(layout_lista)
+        self.lista_tareas.bind(scroll_y=self.on_scroll_lista)
+        self.hay_mas_tareas = False
         
         # Agregar widgets al layout principal
         main_layout.add_widget(titulo)
         main_layout.add_widget(agregar_layout)
+        main_layout.add_widget(self.filtros_layout)
+        main_layout.add_widget(self.acciones_layout)
         main_layout.add_widget(self.stats_label)
-        main_layout.add_widget(scroll)
+        main_layout.add_widget(self.sin_tareas_label)
+        main_layout.add_widget(self.lista_tareas)
         
-        # Cargar tareas iniciales
-        Clock.schedule_once(lambda dt: self.actualizar_lista_tareas(), 0.1)
+        # Panel de depuración con las latencias (TODO_INSTRUMENTACION=1)
+        if metricas.activa:
+            self.depuracion_label = Label(
+                text="⏱️ Sin mediciones",
+                size_hint_y=None,
+                height=90,
+                font_size='11sp',
+                halign='left',
+                valign='top',
+                color=(0.3, 0.3, 0.3, 1)
+            )
+            self.depuracion_label.bind(size=self.depuracion_label.setter('text_size'))
+            main_layout.add_widget(self.depuracion_label)
+            Clock.schedule_interval(self.actualizar_depuracion, 1)
         
+        # Pedir ya la primera página: la consulta avanza mientras se abre la ventana
+        self.actualizar_lista_tareas()
+        
+        self.registrar_hito('construccion')
         return main_layout
     
+    def on_start(self):
+        """
+        Mide el primer frame y el primer frame con tareas visibles
+        """
+        from kivy.core.window import Window
+        Window.bind(on_flip=self.al_dibujar_frame)
+    
+    def al_dibujar_frame(self, window):
+        if 'primer_frame' not in self.metricas_arranque:
+            self.registrar_hito('primer_frame')
+            Clock.schedule_once(self.construir_filtros)
+            Clock.schedule_once(self.construir_acciones)
+            Clock.schedule_interval(self.comprobar_cambios_externos, INTERVALO_CAMBIOS_EXTERNOS)
+            Clock.schedule_once(self.archivar_antiguas, RETARDO_ARCHIVO)
+            Clock.schedule_interval(self.archivar_antiguas, INTERVALO_ARCHIVO)
+        if 'primera_pagina' in self.metricas_arranque:
+            self.registrar_hito('primera_fila')
+            window.unbind(on_flip=self.al_dibujar_frame)
+    
+    def registrar_hito(self, nombre):
+        """
+        Guarda el tiempo transcurrido desde el inicio del arranque
+        """
+        segundos = time.perf_counter() - self.inicio_arranque
+        self.metricas_arranque[nombre] = segundos
+        registro.info("🚀 Arranque: %s a los %.0f ms", nombre, segundos * 1000)
+        if metricas.activa:
+            metricas.registrar(f"arranque.{nombre}", segundos)
+    
+    def construir_filtros(self, dt=None):
+        """
+        Crea los selectores de filtro y orden (importa Spinner al usarlo)
+        """
+        if self.filtro_spinner is not None:
+            return
+        from kivy.uix.spinner import Spinner
+        
+        self.busqueda_input.size_hint_x = 0.5
+        self.filtro_spinner = Spinner(
+            text="Todas",
+            values=list(FILTROS_LISTA),
+            size_hint_x=0.25
+        )
+        self.filtro_spinner.bind(text=self.cambiar_filtro)
+        self.orden_spinner = Spinner(
+            text="Más recientes",
+            values=list(ORDENES_LISTA),
+            size_hint_x=0.25
+        )
+        self.orden_spinner.bind(text=self.cambiar_orden)
+        self.filtros_layout.add_widget(self.filtro_spinner)
+        self.filtros_layout.add_widget(self.orden_spinner)
+    
+    def construir_acciones(self, dt=None):
+        """
+        Crea la barra de selección múltiple y de borrado de completadas
+        """
+        if self.btn_seleccionar is not None:
+            return
+        
+        self.btn_seleccionar = Button(
+            text="☑️ Seleccionar",
+            background_color=(0.2, 0.6, 0.8, 1)
+        )
+        self.btn_seleccionar.bind(on_press=self.alternar_seleccion)
+        
+        self.btn_completar_seleccion = Button(
+            text="✅ Completar",
+            disabled=True,
+            background_color=(0.2, 0.8, 0.2, 1)
+        )
+        self.btn_completar_seleccion.bind(on_press=lambda x: self.marcar_seleccionadas(True))
+        
+        self.btn_pendiente_seleccion = Button(
+            text="⏳ Pendiente",
+            disabled=True,
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        self.btn_pendiente_seleccion.bind(on_press=lambda x: self.marcar_seleccionadas(False))
+        
+        self.btn_eliminar_seleccion = Button(
+            text="🗑️ Eliminar",
+            disabled=True,
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        self.btn_eliminar_seleccion.bind(on_press=self.confirmar_eliminacion_seleccion)
+        
+        btn_limpiar = Button(
+            text="🧹 Borrar completadas",
+            background_color=(0.8, 0.4, 0.2, 1)
+        )
+        btn_limpiar.bind(on_press=self.confirmar_eliminar_completadas)
+        
+        self.btn_respaldar = Button(
+            text="💾 Respaldar",
+            background_color=(0.4, 0.4, 0.7, 1)
+        )
+        self.btn_respaldar.bind(on_press=self.respaldar)
+        
+        self.acciones_layout.add_widget(self.btn_seleccionar)
+        self.acciones_layout.add_widget(self.btn_completar_seleccion)
+        self.acciones_layout.add_widget(self.btn_pendiente_seleccion)
+        self.acciones_layout.add_widget(self.btn_eliminar_seleccion)
+        self.acciones_layout.add_widget(btn_limpiar)
+        self.acciones_layout.add_widget(self.btn_respaldar)
+    
     def agregar_tarea(self, instance):
         """
         Agrega una nueva tarea
@@ -226,244 +539,786 @@ class TodoApp(App):
             self.mostrar_mensaje("⚠️ Error", "Por favor ingresa un título para la tarea.")
             return
         
-        if self.gestor.agregar_tarea(titulo, descripcion):
-            self.titulo_input.text = ""
-            self.descripcion_input.text = ""
-            self.actualizar_lista_tareas()
-            self.mostrar_mensaje("✅ Éxito", f"Tarea '{titulo}' agregada correctamente.")
-        else:
-            self.mostrar_mensaje("❌ Error", "No se pudo agregar la tarea.")
+        def agregar_y_obtener():
+            tarea_id = self.gestor.agregar_tarea(titulo, descripcion)
+            return self.gestor.obtener_tarea_por_id(tarea_id, completa=False) if tarea_id else None
+        
+        def tarea_agregada(tarea):
+            if tarea:
+                self.insertar_tarea_en_lista(tarea)
+                self.mostrar_mensaje("✅ Éxito", f"Tarea '{titulo}' agregada correctamente.")
+            else:
+                self.mostrar_mensaje("❌ Error", "No se pudo agregar la tarea.")
+        
+        self.titulo_input.text = ""
+        self.descripcion_input.text = ""
+        self.db.enviar(agregar_y_obtener, al_terminar=tarea_agregada)
     
     def actualizar_lista_tareas(self):
         """
         Actualiza la lista de tareas en la interfaz
         """
-        # Limpiar lista actual
-        self.lista_tareas.clear_widgets()
+        self.mostrar_cargando()
         
-        # Obtener tareas de la base de datos
-        tareas = self.gestor.obtener_todas_tareas()
+        # La lista recargada ya incluye todo lo anterior a este punto del registro
+        self.db.llamar('ultimo_cambio', al_terminar=self.fijar_cursor_cambios)
         
-        if not tareas:
-            # Mostrar mensaje si no hay tareas
-            no_tareas_label = Label(
-                text="📝 No hay tareas. ¡Agrega tu primera tarea!",
-                size_hint_y=None,
-                height=100,
-                color=(0.6, 0.6, 0.6, 1)
-            )
-            self.lista_tareas.add_widget(no_tareas_label)
-        else:
-            # Agregar cada tarea como widget
-            for tarea in tareas:
-                tarea_widget = TareaWidget(tarea, self)
-                self.lista_tareas.add_widget(tarea_widget)
+        # Obtener solo la primera página; el resto se carga al desplazarse
+        self.pedir_pagina(None, self.mostrar_primera_pagina)
         
         # Actualizar estadísticas
         self.actualizar_estadisticas()
     
-    def actualizar_estadisticas(self):
+    def pedir_pagina(self, despues_de, al_terminar):
         """
-        Actualiza las estadísticas mostradas
+        Pide al hilo de la base de datos la página siguiente a `despues_de`
+        de la vista actual (tareas, vencimientos o archivo)
         """
-        stats = self.gestor.obtener_estadisticas()
-        self.stats_label.text = f"📊 Total: {stats['total']} | ✅ Completadas: {stats['completadas']} | ⏳ Pendientes: {stats['pendientes']}"
+        if self.filtro == "archivadas":
+            self.db.llamar('obtener_archivadas_pagina', TAMANO_PAGINA, despues_de, orden=self.orden_vista(),
+                           canal='lista', al_terminar=al_terminar)
+        elif self.filtro == "vencidas":
+            self.db.llamar('obtener_vencidas', TAMANO_PAGINA, despues_de, canal='lista', al_terminar=al_terminar)
+        elif self.filtro == "proximas":
+            self.db.llamar('obtener_proximas', DIAS_PROXIMAS, TAMANO_PAGINA, despues_de,
+                           canal='lista', al_terminar=al_terminar)
+        else:
+            self.db.llamar('obtener_tareas_pagina', TAMANO_PAGINA, despues_de, filtro=self.filtro,
+                           orden=self.orden, canal='lista', al_terminar=al_terminar)
     
-    def editar_tarea(self, tarea_id):
+    def datos_lista(self, tareas):
         """
-        Abre un popup para editar una tarea
+        Convierte tareas en elementos de datos del RecycleView
         """
-        tarea = self.gestor.obtener_tarea_por_id(tarea_id)
-        if not tarea:
-            self.mostrar_mensaje("❌ Error", "No se pudo encontrar la tarea.")
+        if self.filtro == "archivadas":
+            return [{'tarea': tarea, 'archivada': True} for tarea in tareas]
+        return [{'tarea': tarea} for tarea in tareas]
+    
+    @instrumentado("interfaz.mostrar_primera_pagina")
+    def mostrar_primera_pagina(self, tareas):
+        """
+        Sustituye el contenido de la lista por la primera página de tareas
+        """
+        if 'primera_pagina' not in self.metricas_arranque:
+            self.registrar_hito('primera_pagina')
+        self.hay_mas_tareas = len(tareas) == TAMANO_PAGINA
+        
+        # Solo se guardan los datos; RecycleView reasigna las filas visibles
+        self.lista_tareas.data = self.datos_lista(tareas)
+        self.lista_tareas.scroll_y = 1
+        if self.perfil:
+            self.disparar_perfil()
+        if self.filtro == "todas":
+            self.mostrar_sin_tareas(not tareas)
+        else:
+            nombre = next(texto for texto, filtro in FILTROS_LISTA.items() if filtro == self.filtro)
+            self.mostrar_sin_tareas(not tareas, f"📝 No hay tareas {nombre.lower()}.")
+    
+    def cargar_mas_tareas(self):
+        """
+        Añade la siguiente página de tareas al final de la lista
+        """
+        datos = self.lista_tareas.data
+        if not self.hay_mas_tareas or not datos or self.db.esta_cargando('lista'):
             return
         
-        # Crear popup de edición
-        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        def agregar_pagina(tareas):
+            self.hay_mas_tareas = len(tareas) == TAMANO_PAGINA
+            datos.extend(self.datos_lista(tareas))
+            if self.perfil:
+                self.disparar_perfil()
         
-        # Título del popup
-        titulo_popup = Label(
-            text=f"✏️ Editar Tarea #{tarea_id}",
-            size_hint_y=None,
-            height=40,
-            color=(0.2, 0.4, 0.8, 1)
-        )
+        self.pedir_pagina(self.clave_orden(datos[-1]['tarea']), agregar_pagina)
+    
+    def on_scroll_lista(self, instance, scroll_y):
+        """
+        Carga la siguiente página al acercarse al final de la lista
+        """
+        if scroll_y <= 0.1 and self.hay_mas_tareas:
+            self.cargar_mas_tareas()
+    
+    def cambiar_filtro(self, spinner, texto):
+        """
+        Vuelve a cargar la lista (o la búsqueda) con el filtro elegido
+        """
+        self.filtro = FILTROS_LISTA[texto]
+        self.recargar_vista()
+    
+    def cambiar_orden(self, spinner, texto):
+        """
+        Vuelve a cargar la lista con el orden elegido
+        """
+        self.orden = ORDENES_LISTA[texto]
+        self.recargar_vista()
+    
+    def recargar_vista(self, estadisticas=False):
+        """
+        Vuelve a cargar la lista o la búsqueda activa
         
-        # Campo de título
-        titulo_input = TextInput(
-            text=tarea[1],
-            hint_text="Título de la tarea...",
-            size_hint_y=None,
-            height=40,
-            multiline=False
-        )
+        Args:
+            estadisticas (bool): Releer también las estadísticas durante una
+                búsqueda (la lista completa siempre las relee)
+        """
+        if self.busqueda_activa:
+            self.ejecutar_busqueda()
+            if estadisticas:
+                self.actualizar_estadisticas()
+        else:
+            self.actualizar_lista_tareas()
+    
+    def coincide_filtro(self, tarea):
+        """
+        Indica si la tarea pertenece a la vista actual
+        """
+        if self.filtro == "pendientes":
+            return not tarea.completada
+        if self.filtro == "completadas":
+            return bool(tarea.completada)
+        if self.filtro in ("vencidas", "proximas"):
+            if tarea.completada or tarea.fecha_limite is None:
+                return False
+            ahora = time.time()
+            if self.filtro == "vencidas":
+                return tarea.fecha_limite < ahora
+            return ahora <= tarea.fecha_limite < ahora + DIAS_PROXIMAS * 86400
+        # La vista de archivo no muestra las tareas de la tabla principal
+        return self.filtro != "archivadas"
+    
+    def orden_vista(self):
+        """
+        Orden en que llega la vista actual: las vencidas y próximas siempre
+        van por fecha límite, y el archivo solo tiene los órdenes por fecha
+        de creación
+        """
+        if self.filtro in ("vencidas", "proximas"):
+            return "vencimiento"
+        if self.filtro == "archivadas" and self.orden not in ORDENES_ARCHIVO:
+            return "recientes"
+        return self.orden
+    
+    # --- Grupos de los órdenes por prioridad y fecha límite ---
+    # La base de datos ya entrega la lista ordenada; cada fila visible
+    # compara su grupo con el de la anterior al reasignarse, sin recorrer
+    # ni reordenar los datos en Python.
+    
+    def grupo_tarea(self, tarea):
+        """
+        Devuelve el nombre del grupo de la tarea en el orden actual
+        """
+        if self.orden_vista() == "prioridad":
+            return f"Prioridad {PRIORIDADES[tarea.prioridad]}"
+        if tarea.fecha_limite is None:
+            return "Sin fecha límite"
+        ahora = time.time()
+        if tarea.fecha_limite < ahora:
+            return "Vencidas"
+        fin_de_hoy = time.mktime(time.localtime(ahora)[:3] + (23, 59, 59, 0, 0, -1))
+        if tarea.fecha_limite <= fin_de_hoy:
+            return "Hoy"
+        if tarea.fecha_limite <= fin_de_hoy + DIAS_PROXIMAS * 86400:
+            return f"Próximos {DIAS_PROXIMAS} días"
+        return "Más adelante"
+    
+    def cabecera_grupo(self, indice):
+        """
+        Devuelve el nombre del grupo si la fila `indice` es la primera de
+        su grupo, o una cadena vacía
+        """
+        datos = self.lista_tareas.data
+        grupo = self.grupo_tarea(datos[indice]['tarea'])
+        if indice > 0 and self.grupo_tarea(datos[indice - 1]['tarea']) == grupo:
+            return ""
+        return grupo
+    
+    # --- Actualizaciones incrementales de la lista ---
+    # La lista está ordenada por la clave del orden elegido (ver
+    # gestor.clave_orden), igual que las consultas, así que cada tarea se
+    # localiza por búsqueda binaria y solo se toca su entrada en los datos
+    # del RecycleView. En los órdenes por prioridad y fecha límite la clave
+    # cambia al editar la tarea, que entonces se mueve a su nueva posición.
+    
+    def clave_orden(self, tarea):
+        return clave_orden(tarea, self.orden_vista())
+    
+    def posicion_en_lista(self, tarea):
+        """
+        Devuelve la primera posición cuya clave no va antes que la de la tarea
+        """
+        clave = self.clave_orden(tarea)
+        datos = self.lista_tareas.data
+        descendente = ORDENES[self.orden_vista()][1] == "DESC"
+        inicio, fin = 0, len(datos)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            clave_medio = self.clave_orden(datos[medio]['tarea'])
+            if (clave_medio > clave) if descendente else (clave_medio < clave):
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+    
+    def buscar_en_lista(self, tarea):
+        """
+        Devuelve la posición de la tarea en la lista, o None si no está cargada
+        """
+        datos = self.lista_tareas.data
+        if not self.busqueda_activa:
+            posicion = self.posicion_en_lista(tarea)
+            if posicion < len(datos) and datos[posicion]['tarea'].id == tarea.id:
+                return posicion
+            # Con la clave de la tarea anterior a una edición externa no se encuentra
+            if self.orden_vista() not in ORDENES_AGRUPADOS:
+                return None
         
-        # Campo de descripción
-        descripcion_input = TextInput(
-            text=tarea[2] or "",
-            hint_text="Descripción (opcional)...",
-            size_hint_y=None,
-            height=40,
-            multiline=False
-        )
+        # Los resultados de búsqueda van por relevancia y son pocos
+        for posicion, item in enumerate(datos):
+            if item['tarea'].id == tarea.id:
+                return posicion
+        return None
+    
+    def colocar_tarea(self, posicion, tarea):
+        """
+        Sustituye la tarea mostrada en `posicion`, moviéndola si su clave de
+        orden ha cambiado (prioridad o fecha límite editadas)
+        """
+        datos = self.lista_tareas.data
+        if self.busqueda_activa or self.clave_orden(datos[posicion]['tarea']) == self.clave_orden(tarea):
+            datos[posicion] = {'tarea': tarea}
+            return
+        datos.pop(posicion)
+        nueva = self.posicion_en_lista(tarea)
+        # Más allá de la última página cargada la tarea llegará al desplazarse
+        if nueva < len(datos) or not self.hay_mas_tareas:
+            datos.insert(nueva, {'tarea': tarea})
+    
+    @instrumentado("interfaz.insertar_tarea_en_lista")
+    def insertar_tarea_en_lista(self, tarea):
+        """
+        Inserta una tarea nueva en su posición de orden
+        """
+        if not tarea:
+            return
         
-        # Layout para botones
-        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        posicion = self.posicion_en_lista(tarea)
+        # Más allá de la última página cargada la tarea llegará al desplazarse;
+        # durante una búsqueda la lista solo muestra resultados
+        visible = not self.busqueda_activa and self.coincide_filtro(tarea)
+        if visible and (posicion < len(self.lista_tareas.data) or not self.hay_mas_tareas):
+            self.lista_tareas.data.insert(posicion, {'tarea': tarea})
+            self.mostrar_sin_tareas(False)
+        self.ajustar_estadisticas(total=1, completadas=1 if tarea.completada else 0)
+    
+    @instrumentado("interfaz.reemplazar_tarea_en_lista")
+    def reemplazar_tarea_en_lista(self, tarea_anterior, tarea):
+        """
+        Sustituye los datos de una tarea ya mostrada, o la quita si ya
+        no pertenece al filtro actual
+        """
+        posicion = self.buscar_en_lista(tarea_anterior)
+        if posicion is not None:
+            if self.coincide_filtro(tarea):
+                self.colocar_tarea(posicion, tarea)
+            else:
+                self.lista_tareas.data.pop(posicion)
+                self.mostrar_sin_tareas(not self.lista_tareas.data)
+        self.ajustar_estadisticas(completadas=bool(tarea.completada) - bool(tarea_anterior.completada))
+    
+    @instrumentado("interfaz.quitar_tarea_de_lista")
+    def quitar_tarea_de_lista(self, tarea):
+        """
+        Quita una tarea eliminada de la lista
+        """
+        posicion = self.buscar_en_lista(tarea)
+        if posicion is not None:
+            self.lista_tareas.data.pop(posicion)
+        self.mostrar_sin_tareas(not self.lista_tareas.data)
+        self.ajustar_estadisticas(total=-1, completadas=-1 if tarea.completada else 0)
+    
+    # --- Cambios hechos por otros procesos ---
+    # Cada INTERVALO_CAMBIOS_EXTERNOS segundos el hilo de la base de datos
+    # consulta PRAGMA data_version; solo si otro proceso ha escrito se leen
+    # las tareas cambiadas desde cursor_cambios y se aplican fila a fila.
+    
+    def fijar_cursor_cambios(self, secuencia):
+        # Una comprobación anterior que llegue tarde no debe hacerlo retroceder
+        self.cursor_cambios = max(self.cursor_cambios or 0, secuencia)
+    
+    def comprobar_cambios_externos(self, dt=None):
+        """
+        Pregunta al gestor si otro proceso ha modificado las tareas
+        """
+        if self.cursor_cambios is None or self.db.esta_cargando('cambios'):
+            return
+        self.db.llamar('comprobar_cambios_externos', self.cursor_cambios,
+                       canal='cambios', al_terminar=self.aplicar_cambios_externos)
+    
+    @instrumentado("interfaz.aplicar_cambios_externos")
+    def aplicar_cambios_externos(self, cambios):
+        """
+        Refleja en la lista las tareas creadas, modificadas o eliminadas por
+        otros procesos, sin recargarla
+        """
+        if not cambios:
+            return
+        self.fijar_cursor_cambios(cambios['cursor'])
         
-        # Botón Guardar
-        btn_guardar = Button(
-            text="💾 Guardar",
-            background_color=(0.2, 0.8, 0.2, 1)
-        )
+        if cambios['desbordado']:
+            self.recargar_vista(estadisticas=True)
+            return
+        if not cambios['tareas'] and not cambios['eliminadas']:
+            return
         
-        # Botón Cancelar
-        btn_cancelar = Button(
-            text="❌ Cancelar",
-            background_color=(0.8, 0.2, 0.2, 1)
-        )
+        for tarea in cambios['tareas']:
+            self.aplicar_tarea_externa(tarea)
         
-        buttons_layout.add_widget(btn_guardar)
-        buttons_layout.add_widget(btn_cancelar)
-        
-        # Agregar widgets al popup
-        popup_layout.add_widget(titulo_popup)
-        popup_layout.add_widget(titulo_input)
-        popup_layout.add_widget(descripcion_input)
-        popup_layout.add_widget(buttons_layout)
-        
-        # Crear y mostrar popup
-        popup = Popup(
-            title="",
-            content=popup_layout,
-            size_hint=(0.8, 0.6),
-            auto_dismiss=False
-        )
+        if cambios['eliminadas']:
+            eliminadas = set(cambios['eliminadas'])
+            datos = self.lista_tareas.data
+            for posicion in reversed([posicion for posicion, item in enumerate(datos)
+                                      if item['tarea'].id in eliminadas]):
+                datos.pop(posicion)
+            if self.seleccionadas & eliminadas:
+                self.seleccionadas -= eliminadas
+                self.actualizar_acciones()
         
-        def guardar_cambios(instance):
-            nuevo_titulo = titulo_input.text.strip()
-            nueva_descripcion = descripcion_input.text.strip()
-            
-            if not nuevo_titulo:
-                self.mostrar_mensaje("⚠️ Error", "El título no puede estar vacío.")
-                return
-            
-            if self.gestor.actualizar_tarea(tarea_id, nuevo_titulo, nueva_descripcion, bool(tarea[3])):
-                popup.dismiss()
-                self.actualizar_lista_tareas()
-                self.mostrar_mensaje("✅ Éxito", "Tarea actualizada correctamente.")
+        self.mostrar_sin_tareas(not self.lista_tareas.data)
+        # Los contadores cambiaron fuera: una lectura de una fila
+        self.actualizar_estadisticas()
+    
+    def aplicar_tarea_externa(self, tarea):
+        """
+        Inserta, sustituye o quita una tarea según su estado actual y la vista
+        """
+        datos = self.lista_tareas.data
+        posicion = self.buscar_en_lista(tarea)
+        if posicion is not None:
+            if self.coincide_filtro(tarea):
+                self.colocar_tarea(posicion, tarea)
             else:
-                self.mostrar_mensaje("❌ Error", "No se pudo actualizar la tarea.")
+                datos.pop(posicion)
+        elif not self.busqueda_activa and self.coincide_filtro(tarea):
+            posicion = self.posicion_en_lista(tarea)
+            if posicion < len(datos) or not self.hay_mas_tareas:
+                datos.insert(posicion, {'tarea': tarea})
+    
+    def cambiar_estado_tarea(self, tarea, completada):
+        """
+        Marca una tarea como completada o pendiente y actualiza solo su fila
+        """
+        # La fila cambia al instante; el estado se guarda en el búfer del gestor
+        # y los clics seguidos se escriben juntos en una sola transacción
+        tarea_nueva = tarea.reemplazar(completada=1 if completada else 0)
+        self.reemplazar_tarea_en_lista(tarea, tarea_nueva)
+        
+        self.gestor.marcar_completada_diferida(tarea.id, completada)
+        self.estados_sin_guardar.add(tarea.id)
+        self.disparar_vaciado()
+    
+    def vaciar_cambios_pendientes(self, dt=None):
+        """
+        Escribe en segundo plano los estados acumulados por los checkboxes;
+        si la escritura falla, las filas vuelven al estado guardado
+        """
+        tareas_ids, self.estados_sin_guardar = self.estados_sin_guardar, set()
+        if self.gestor.hay_cambios_pendientes():
+            self.db.llamar('vaciar_cambios_pendientes', descartar_si_falla=True,
+                           al_fallar=lambda error: self.restaurar_estados(tareas_ids, error))
+    
+    def restaurar_estados(self, tareas_ids, error):
+        """
+        Vuelve a leer las tareas cuyo estado no se pudo escribir y muestra
+        el que tienen en la base de datos
+        """
+        registro.error("❌ No se pudo guardar el estado de %s tareas: %s", len(tareas_ids), error)
         
-        def cancelar(instance):
-            popup.dismiss()
+        def leer_guardadas():
+            tareas = (self.gestor.obtener_tarea_por_id(tarea_id, completa=False) for tarea_id in tareas_ids)
+            return [tarea for tarea in tareas if tarea]
         
-        btn_guardar.bind(on_press=guardar_cambios)
-        btn_cancelar.bind(on_press=cancelar)
+        def aplicar_guardadas(tareas):
+            for tarea in tareas:
+                self.aplicar_tarea_externa(tarea)
+            self.mostrar_sin_tareas(not self.lista_tareas.data)
+            # Los contadores se ajustaron al marcar: se vuelven a leer
+            self.actualizar_estadisticas()
         
-        popup.open()
+        self.db.enviar(leer_guardadas, al_terminar=aplicar_guardadas)
+        self.mostrar_mensaje("❌ Error", "No se pudo guardar el estado de las tareas.")
     
-    def eliminar_tarea(self, tarea_id):
+    def ejecutar_busqueda(self, dt=None):
         """
-        Muestra un popup de confirmación para eliminar una tarea
+        Muestra las tareas que coinciden con el texto de búsqueda,
+        o vuelve a la lista completa si el campo está vacío
         """
-        tarea = self.gestor.obtener_tarea_por_id(tarea_id)
-        if not tarea:
-            self.mostrar_mensaje("❌ Error", "No se pudo encontrar la tarea.")
+        texto = self.busqueda_input.text.strip()
+        if not texto:
+            if self.busqueda_activa:
+                self.busqueda_activa = False
+                self.actualizar_lista_tareas()
             return
         
-        # Crear popup de confirmación
-        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        self.busqueda_activa = True
+        self.hay_mas_tareas = False
+        self.mostrar_cargando()
         
-        # Mensaje de confirmación
-        mensaje = Label(
-            text=f"¿Estás seguro de que quieres eliminar la tarea:\n\n\"{tarea[1]}\"?",
-            text_size=(None, None),
-            halign='center',
-            valign='middle'
-        )
+        def mostrar_resultados(resultados):
+            self.lista_tareas.data = self.datos_lista(resultados)
+            self.lista_tareas.scroll_y = 1
+            self.mostrar_sin_tareas(not resultados, "🔍 No se encontraron tareas.")
         
-        # Layout para botones
-        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        if self.filtro == "archivadas":
+            self.db.llamar('obtener_archivadas_pagina', TAMANO_PAGINA, orden=self.orden_vista(), texto=texto,
+                           canal='lista', al_terminar=mostrar_resultados)
+        else:
+            # La búsqueda en vencidas y próximas abarca todas las pendientes
+            filtro = "pendientes" if self.filtro in ("vencidas", "proximas") else self.filtro
+            self.db.llamar('buscar', texto, filtro=filtro, canal='lista', al_terminar=mostrar_resultados)
+    
+    def mostrar_cargando(self):
+        """
+        Indica que la lista está esperando datos de la base de datos
+        """
+        self.mostrar_sin_tareas(True, "⏳ Cargando tareas...")
+    
+    def mostrar_sin_tareas(self, visible, mensaje="📝 No hay tareas. ¡Agrega tu primera tarea!"):
+        """
+        Muestra u oculta el mensaje de lista vacía
+        """
+        self.sin_tareas_label.text = mensaje
+        self.sin_tareas_label.height = 100 if visible else 0
+        self.sin_tareas_label.opacity = 1 if visible else 0
+    
+    def actualizar_estadisticas(self):
+        """
+        Actualiza las estadísticas mostradas
+        """
+        def mostrar(estadisticas):
+            self.estadisticas = estadisticas
+            self.mostrar_estadisticas()
         
-        # Botón Confirmar
-        btn_confirmar = Button(
-            text="🗑️ Eliminar",
-            background_color=(0.8, 0.2, 0.2, 1)
-        )
+        self.db.llamar('obtener_estadisticas', canal='estadisticas', al_terminar=mostrar)
+    
+    def ajustar_estadisticas(self, total=0, completadas=0):
+        """
+        Aplica el cambio de una mutación a las estadísticas sin volver a consultarlas
+        """
+        stats = self.estadisticas
+        stats['total'] += total
+        stats['completadas'] += completadas
+        stats['pendientes'] = stats['total'] - stats['completadas']
+        self.mostrar_estadisticas()
+    
+    @instrumentado("interfaz.mostrar_estadisticas")
+    def mostrar_estadisticas(self):
+        """
+        Muestra las estadísticas actuales en la etiqueta
+        """
+        stats = self.estadisticas
+        texto = f"📊 Total: {stats['total']} | ✅ Completadas: {stats['completadas']} | ⏳ Pendientes: {stats['pendientes']}"
+        if stats.get('archivadas'):
+            texto += f" | 🗄️ Archivadas: {stats['archivadas']}"
+        self.stats_label.text = texto
+    
+    def actualizar_depuracion(self, dt=None):
+        """
+        Muestra en el panel de depuración las operaciones más costosas
+        """
+        instantanea = metricas.instantanea()
+        operaciones = sorted(instantanea['operaciones'].items(),
+                             key=lambda item: item[1]['total_ms'], reverse=True)
+        lineas = [f"⏱️ Filas leídas: {instantanea['filas_leidas']} | escritas: {instantanea['filas_escritas']}"]
+        for nombre, resumen in operaciones[:5]:
+            lineas.append(f"{nombre}: p50 {resumen['p50_ms']:.2f} / p95 {resumen['p95_ms']:.2f} / "
+                          f"p99 {resumen['p99_ms']:.2f} ms ({resumen['llamadas']})")
+        self.depuracion_label.text = "\n".join(lineas)
+    
+    def medir_memoria_lista(self, dt=None):
+        """
+        Registra la memoria por tarea cargada, por capa y las líneas que más
+        asignaron desde que se construyó la interfaz
+        """
+        from memoria import informe
         
-        # Botón Cancelar
-        btn_cancelar = Button(
-            text="❌ Cancelar",
-            background_color=(0.6, 0.6, 0.6, 1)
-        )
+        for linea in informe(self.perfil.muestrear("lista", len(self.lista_tareas.data))):
+            registro.info(linea)
+    
+    def editar_tarea(self, tarea_id):
+        """
+        Abre un popup para editar una tarea
+        """
+        self.db.llamar('obtener_tarea_por_id', tarea_id, canal='dialogo', al_terminar=self.mostrar_editor)
+    
+    def obtener_dialogo(self, nombre):
+        """
+        Devuelve un diálogo libre del pool, creándolo la primera vez
         
-        buttons_layout.add_widget(btn_confirmar)
-        buttons_layout.add_widget(btn_cancelar)
+        Args:
+            nombre (str): Clase de dialogos.py ('DialogoEditor', 'DialogoMensaje'...)
+        """
+        # dialogos importa Popup: se carga al abrir el primer diálogo, no al arrancar
+        import dialogos
+        if self.pool_dialogos is None:
+            self.pool_dialogos = dialogos.PoolDialogos()
+        return self.pool_dialogos.obtener(getattr(dialogos, nombre))
+    
+    def mostrar_editor(self, tarea):
+        """
+        Abre el popup de edición con los datos de la tarea
+        """
+        if not tarea:
+            self.mostrar_mensaje("❌ Error", "No se pudo encontrar la tarea.")
+            return
+        self.obtener_dialogo('DialogoEditor').mostrar(tarea, self.guardar_edicion)
+    
+    def guardar_edicion(self, dialogo, tarea, nuevo_titulo, nueva_descripcion, prioridad, texto_fecha_limite):
+        """
+        Guarda en segundo plano los cambios del popup de edición
+        """
+        if not nuevo_titulo:
+            self.mostrar_mensaje("⚠️ Error", "El título no puede estar vacío.")
+            return
+        try:
+            fecha_limite = leer_fecha_limite(texto_fecha_limite)
+        except ValueError:
+            self.mostrar_mensaje("⚠️ Error", "La fecha límite debe tener el formato AAAA-MM-DD.")
+            return
+        # El editor muestra solo el día: si no se cambia, se conserva la hora guardada
+        if tarea.fecha_limite is not None and texto_fecha_limite == time.strftime(
+                '%Y-%m-%d', time.localtime(tarea.fecha_limite)):
+            fecha_limite = tarea.fecha_limite
         
-        # Agregar widgets al popup
-        popup_layout.add_widget(mensaje)
-        popup_layout.add_widget(buttons_layout)
+        def actualizar_y_obtener():
+            if not self.gestor.actualizar_tarea(tarea.id, nuevo_titulo, nueva_descripcion, bool(tarea.completada),
+                                                planificacion=(prioridad, fecha_limite)):
+                return None
+            return self.gestor.obtener_tarea_por_id(tarea.id, completa=False) or tarea
         
-        # Crear y mostrar popup
-        popup = Popup(
-            title="⚠️ Confirmar Eliminación",
-            content=popup_layout,
-            size_hint=(0.7, 0.4),
-            auto_dismiss=False
-        )
+        def tarea_actualizada(tarea_nueva):
+            if tarea_nueva:
+                dialogo.cerrar()
+                self.reemplazar_tarea_en_lista(tarea, tarea_nueva)
+                self.mostrar_mensaje("✅ Éxito", "Tarea actualizada correctamente.")
+            else:
+                self.mostrar_mensaje("❌ Error", "No se pudo actualizar la tarea.")
         
-        def confirmar_eliminacion(instance):
-            if self.gestor.eliminar_tarea(tarea_id):
-                popup.dismiss()
-                self.actualizar_lista_tareas()
+        self.db.enviar(actualizar_y_obtener, al_terminar=tarea_actualizada)
+    
+    def eliminar_tarea(self, tarea_id):
+        """
+        Muestra un popup de confirmación para eliminar una tarea
+        """
+        self.db.llamar('obtener_tarea_por_id', tarea_id, completa=False,
+                       canal='dialogo', al_terminar=self.confirmar_eliminacion)
+    
+    def confirmar_eliminacion(self, tarea):
+        """
+        Abre el popup de confirmación de eliminación
+        """
+        if not tarea:
+            self.mostrar_mensaje("❌ Error", "No se pudo encontrar la tarea.")
+            return
+        mensaje = f"¿Estás seguro de que quieres eliminar la tarea:\n\n\"{tarea.titulo}\"?"
+        self.obtener_dialogo('DialogoConfirmacion').mostrar(
+            mensaje, lambda dialogo: self.eliminar_confirmada(dialogo, tarea))
+    
+    def eliminar_confirmada(self, dialogo, tarea):
+        """
+        Elimina la tarea tras confirmarlo el usuario
+        """
+        def tarea_eliminada(correcto):
+            if correcto:
+                dialogo.cerrar()
+                self.quitar_tarea_de_lista(tarea)
                 self.mostrar_mensaje("✅ Éxito", "Tarea eliminada correctamente.")
             else:
                 self.mostrar_mensaje("❌ Error", "No se pudo eliminar la tarea.")
         
-        def cancelar(instance):
-            popup.dismiss()
-        
-        btn_confirmar.bind(on_press=confirmar_eliminacion)
-        btn_cancelar.bind(on_press=cancelar)
-        
-        popup.open()
+        self.db.llamar('eliminar_tarea', tarea.id, al_terminar=tarea_eliminada)
     
-    def mostrar_mensaje(self, titulo, mensaje):
+    # --- Selección múltiple y operaciones masivas ---
+    # Cada operación es una sola transacción en el gestor; al terminar la
+    # lista y las estadísticas se recargan una sola vez.
+    
+    def alternar_seleccion(self, instance=None):
         """
-        Muestra un popup con un mensaje
+        Entra o sale del modo de selección múltiple
+        """
+        self.modo_seleccion = not self.modo_seleccion
+        self.seleccionadas.clear()
+        self.actualizar_acciones()
+        # Las filas visibles muestran u ocultan su casilla de selección
+        self.lista_tareas.refresh_from_data()
+    
+    def cambiar_seleccion(self, tarea, seleccionada):
+        if seleccionada:
+            self.seleccionadas.add(tarea.id)
+        else:
+            self.seleccionadas.discard(tarea.id)
+        self.actualizar_acciones()
+    
+    def actualizar_acciones(self):
+        """
+        Ajusta los botones de la barra de acciones a la selección actual
+        """
+        if self.btn_seleccionar is None:
+            return
+        cantidad = len(self.seleccionadas)
+        self.btn_seleccionar.text = "✖️ Cancelar" if self.modo_seleccion else "☑️ Seleccionar"
+        self.btn_eliminar_seleccion.text = f"🗑️ Eliminar ({cantidad})" if cantidad else "🗑️ Eliminar"
+        for boton in (self.btn_completar_seleccion, self.btn_pendiente_seleccion, self.btn_eliminar_seleccion):
+            boton.disabled = not cantidad
+    
+    def marcar_seleccionadas(self, completada):
+        """
+        Marca todas las tareas seleccionadas como completadas o pendientes
+        """
+        if not self.seleccionadas:
+            return
+        self.db.llamar('marcar_completadas', list(self.seleccionadas), completada,
+                       al_terminar=lambda cambiadas: self.terminar_operacion_masiva())
+    
+    def confirmar_eliminacion_seleccion(self, instance=None):
+        """
+        Pide confirmación para eliminar las tareas seleccionadas
+        """
+        if not self.seleccionadas:
+            return
+        tareas_ids = list(self.seleccionadas)
+        self.obtener_dialogo('DialogoConfirmacion').mostrar(
+            f"¿Estás seguro de que quieres eliminar las {len(tareas_ids)} tareas seleccionadas?",
+            lambda dialogo: self.eliminar_en_bloque(dialogo, 'eliminar_tareas', tareas_ids))
+    
+    def confirmar_eliminar_completadas(self, instance=None):
+        """
+        Pide confirmación para eliminar todas las tareas completadas
+        """
+        # Las archivadas cuentan como completadas, pero no se borran desde aquí
+        completadas = self.estadisticas['completadas'] - self.estadisticas.get('archivadas', 0)
+        if not completadas:
+            self.mostrar_mensaje("ℹ️ Información", "No hay tareas completadas.")
+            return
+        self.obtener_dialogo('DialogoConfirmacion').mostrar(
+            f"¿Estás seguro de que quieres eliminar las {completadas} tareas completadas?",
+            lambda dialogo: self.eliminar_en_bloque(dialogo, 'eliminar_completadas'))
+    
+    def eliminar_en_bloque(self, dialogo, metodo, *args):
         """
-        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        Ejecuta un borrado masivo del gestor y recarga la vista al terminar
         
-        mensaje_label = Label(
-            text=mensaje,
-            text_size=(None, None),
-            halign='center',
-            valign='middle'
-        )
+        Args:
+            dialogo (DialogoConfirmacion): Diálogo que se cierra al terminar
+            metodo (str): 'eliminar_tareas' o 'eliminar_completadas'
+        """
+        def tareas_eliminadas(cantidad):
+            dialogo.cerrar()
+            self.terminar_operacion_masiva()
+            if cantidad:
+                self.liberar_espacio()
+            self.mostrar_mensaje("✅ Éxito", f"{cantidad} tareas eliminadas correctamente.")
         
-        btn_ok = Button(
-            text="OK",
-            size_hint_y=None,
-            height=40,
-            background_color=(0.2, 0.6, 0.8, 1)
-        )
+        self.db.llamar(metodo, *args, al_terminar=tareas_eliminadas)
+    
+    def terminar_operacion_masiva(self):
+        """
+        Sale del modo selección y recarga una sola vez la lista y las estadísticas
+        """
+        self.modo_seleccion = False
+        self.seleccionadas.clear()
+        self.actualizar_acciones()
+        self.recargar_vista(estadisticas=True)
+    
+    def liberar_espacio(self, liberadas=None):
+        """
+        Devuelve al disco el espacio de los borrados grandes, por tandas en
+        el hilo de la base de datos para no retrasar las consultas de la lista
+        """
+        if liberadas == 0:
+            return
+        self.db.llamar('liberar_espacio', canal='espacio', al_terminar=self.liberar_espacio)
+    
+    def archivar_antiguas(self, dt=None):
+        """
+        Mueve al archivo, por lotes en el hilo de la base de datos, las
+        completadas sin cambios en los últimos dias_archivo días
+        """
+        if self.db.esta_cargando('archivo'):
+            return
+        self.archivadas_en_curso = 0
+        self.db.llamar('archivar_completadas', self.dias_archivo, canal='archivo',
+                       al_terminar=self.lote_archivado)
+    
+    def lote_archivado(self, movidas):
+        """
+        Pide el lote siguiente; al terminar recarga la vista una sola vez
+        """
+        if movidas:
+            self.archivadas_en_curso += movidas
+            self.db.llamar('archivar_completadas', self.dias_archivo, canal='archivo',
+                           al_terminar=self.lote_archivado)
+            return
+        if self.archivadas_en_curso:
+            registro.info("🗄️ %s tareas completadas archivadas", self.archivadas_en_curso)
+            self.recargar_vista(estadisticas=True)
+            self.liberar_espacio()
+    
+    def respaldar(self, instance=None):
+        """
+        Respalda la base de datos en caliente: la copia avanza en su propio
+        hilo mientras la lista y las escrituras siguen funcionando
+        """
+        if self.btn_respaldar.disabled:
+            return
+        self.btn_respaldar.disabled = True
+        ultimo = [-1]
         
-        popup_layout.add_widget(mensaje_label)
-        popup_layout.add_widget(btn_ok)
+        def progreso(copiadas, total):
+            # Llega desde el hilo del respaldo: solo se redibuja al cambiar el porcentaje
+            porcentaje = copiadas * 100 // max(total, 1)
+            if porcentaje != ultimo[0]:
+                ultimo[0] = porcentaje
+                Clock.schedule_once(lambda dt: setattr(self.btn_respaldar, 'text', f"💾 {porcentaje} %"))
         
-        popup = Popup(
-            title=titulo,
-            content=popup_layout,
-            size_hint=(0.6, 0.3),
-            auto_dismiss=False
-        )
+        def iniciado(futuro):
+            futuro.add_done_callback(lambda f: Clock.schedule_once(lambda dt: self.respaldo_terminado(f)))
         
-        btn_ok.bind(on_press=popup.dismiss)
-        popup.open()
+        # TODO_RESPALDOS: directorio de los respaldos (por defecto 'respaldos' junto a la base de datos)
+        # Si falla antes de arrancar la copia (al vaciar los estados pendientes) no hay futuro
+        self.db.llamar('respaldar', os.environ.get('TODO_RESPALDOS'), progreso=progreso,
+                       al_terminar=iniciado, al_fallar=self.respaldo_fallido)
+    
+    def respaldo_terminado(self, futuro):
+        """
+        Restaura el botón y muestra dónde quedó el respaldo
+        """
+        try:
+            ruta = futuro.result()
+        except Exception as e:
+            self.respaldo_fallido(e)
+            return
+        self.btn_respaldar.disabled = False
+        self.btn_respaldar.text = "💾 Respaldar"
+        self.mostrar_mensaje("✅ Respaldo", f"Respaldo guardado en {ruta}")
+    
+    def respaldo_fallido(self, error):
+        """
+        Restaura el botón y muestra por qué no se pudo respaldar
+        """
+        self.btn_respaldar.disabled = False
+        self.btn_respaldar.text = "💾 Respaldar"
+        self.mostrar_mensaje("❌ Error", f"No se pudo respaldar la base de datos: {error}")
+    
+    def mostrar_mensaje(self, titulo, mensaje):
+        """
+        Muestra un popup con un mensaje
+        """
+        self.obtener_dialogo('DialogoMensaje').mostrar(titulo, mensaje)
     
     def on_stop(self):
         """
         Se ejecuta cuando la aplicación se cierra
         """
+        # Esperar a que terminen las escrituras pendientes antes de cerrar
+        self.vaciar_cambios_pendientes()
+        self.db.cerrar()
         self.gestor.cerrar_conexion()
-        print("👋 Aplicación cerrada correctamente")
+        registro.info("👋 Aplicación cerrada correctamente")
@@ -0,0 +1,1306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de rendimiento para el gestor de tareas
+Mide la latencia por operación sobre una base de datos de prueba
+
+    python benchmark.py suite --salida actual.json
+    python benchmark.py comparar base.json actual.json
+"""
+
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import migraciones
+from gestor import COLUMNAS_COMPLETAS, FILTROS, ORDENES, GestorTareas, clave_orden
+from importador import importar_archivo
+from instrumentacion import metricas
+from memoria import PRESUPUESTO_DATOS_MB, PRESUPUESTO_INTERFAZ_MB, PerfilMemoria, informe
+from sincronizacion import ServidorSincronizacion, SincronizadorTareas
+
+
+class GestorSinConexionPersistente(GestorTareas):
+    """
+    Réplica del comportamiento anterior: una conexión nueva por operación,
+    cerrada al terminarla (ver por_operacion)
+    """
+    
+    def __init__(self, nombre_db):
+        super().__init__(nombre_db, inicializar=False)
+        self.por_operacion(self.inicializar_db)()
+    
+    def _obtener_conexion(self):
+        conexion = getattr(self._local, "conexion_operacion", None)
+        if conexion is None:
+            conexion = self._local.conexion_operacion = sqlite3.connect(self.nombre_db)
+        return conexion
+    
+    def cerrar_conexion(self):
+        self.por_operacion(self.vaciar_cambios_pendientes)()
+        super().cerrar_conexion()
+    
+    def por_operacion(self, funcion):
+        """
+        Envuelve funcion para que la conexión que abra se cierre al volver,
+        como hacía cada método con 'with sqlite3.connect(...)'
+        """
+        def envuelta(*args, **kwargs):
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                conexion = self._local.__dict__.pop("conexion_operacion", None)
+                if conexion is not None:
+                    conexion.close()
+        return envuelta
+
+
+def poblar_db(nombre_db, filas, legado=False):
+    """
+    Inserta filas de prueba directamente con executemany
+    
+    Args:
+        nombre_db (str): Ruta de la base de datos
+        filas (int): Número de tareas a insertar
+        legado (bool): Crear la tabla anterior a las migraciones, con las
+            fechas como texto y sin user_version
+    """
+    with contextlib.closing(sqlite3.connect(nombre_db)) as conexion:
+        if legado:
+            fecha = time.strftime("%Y-%m-%d %H:%M:%S")
+            conexion.execute('''
+                CREATE TABLE IF NOT EXISTS tareas (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    titulo TEXT NOT NULL,
+                    descripcion TEXT,
+                    completada INTEGER DEFAULT 0,
+                    fecha_creacion TEXT NOT NULL,
+                    fecha_actualizacion TEXT
+                )
+            ''')
+        else:
+            fecha = int(time.time())
+            # Como las que crea GestorTareas: liberar_espacio() no convierte las demás
+            conexion.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            migraciones.migrar(conexion)
+        with conexion:
+            if legado:
+                conexion.executemany(
+                    'INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    ((f"Tarea {i}", f"Descripción de la tarea {i}", i % 2, fecha, fecha)
+                     for i in range(filas))
+                )
+            else:
+                # Prioridades repartidas y una de cada tres sin fecha límite;
+                # el resto vence entre hace 30 días y dentro de 60
+                conexion.executemany(
+                    'INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion, '
+                    'prioridad, fecha_limite) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    ((f"Tarea {i}", f"Descripción de la tarea {i}", i % 2, fecha, fecha, i // 2 % 4,
+                      None if i % 3 == 0 else fecha + (i * 7919 % 90 - 30) * 86400)
+                     for i in range(filas))
+                )
+
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta una función varias veces y devuelve las latencias en milisegundos
+    """
+    tiempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion(i)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def resumir(tiempos):
+    """
+    Resume una lista de latencias en milisegundos
+    
+    Returns:
+        dict: Mediana, percentil 95, media y número de repeticiones
+    """
+    ordenados = sorted(tiempos)
+    p95 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))]
+    return {
+        "mediana_ms": round(statistics.median(ordenados), 4),
+        "p95_ms": round(p95, 4),
+        "media_ms": round(statistics.fmean(ordenados), 4),
+        "repeticiones": len(ordenados),
+    }
+
+
+def operaciones_gestor(gestor, filas):
+    """
+    Operaciones a medir, con el número de repeticiones de cada una
+    """
+    return [
+        ("obtener_tarea_por_id", lambda i: gestor.obtener_tarea_por_id(1 + (i * 7919) % filas), 500),
+        ("marcar_completada", lambda i: gestor.marcar_completada(1 + (i * 7919) % filas, i % 2 == 0), 200),
+        ("agregar_tarea", lambda i: gestor.agregar_tarea(f"Nueva {i}", "Benchmark"), 200),
+        ("obtener_estadisticas", lambda i: gestor.obtener_estadisticas(), 20),
+        ("obtener_todas_tareas", lambda i: gestor.obtener_todas_tareas(), 3),
+    ]
+
+
+def benchmark_conexion(filas):
+    """
+    Compara la latencia por operación antes (conexión por llamada)
+    y después (conexión persistente con WAL y caché)
+    """
+    print(f"🧪 Benchmark de conexión con {filas} tareas")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, clase in (("antes", GestorSinConexionPersistente), ("después", GestorTareas)):
+            nombre_db = os.path.join(directorio, f"bench_{clase.__name__}.db")
+            poblar_db(nombre_db, filas)
+            
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor = clase(nombre_db)
+            
+            for operacion, funcion, repeticiones in operaciones_gestor(gestor, filas):
+                if isinstance(gestor, GestorSinConexionPersistente):
+                    funcion = gestor.por_operacion(funcion)
+                tiempos = medir(funcion, repeticiones)
+                resultados.setdefault(operacion, {})[nombre] = statistics.median(tiempos)
+            
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor.cerrar_conexion()
+    
+    print(f"\n{'Operación':<24}{'Antes (ms)':>12}{'Después (ms)':>14}{'Mejora':>10}")
+    for operacion, tiempos in resultados.items():
+        mejora = tiempos["antes"] / tiempos["después"] if tiempos["después"] else float("inf")
+        print(f"{operacion:<24}{tiempos['antes']:>12.3f}{tiempos['después']:>14.3f}{mejora:>9.1f}x")
+    
+    return resultados
+
+
+def benchmark_importar(filas):
+    """
+    Mide la importación masiva desde CSV y JSONL
+    """
+    print(f"🧪 Benchmark de importación con {filas} tareas")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_jsonl = os.path.join(directorio, "tareas.jsonl")
+        with open(ruta_jsonl, "w", encoding="utf-8") as archivo:
+            for i in range(filas):
+                archivo.write(json.dumps({"titulo": f"Tarea {i}", "descripcion": f"Importada {i}", "completada": i % 2}) + "\n")
+        
+        ruta_csv = os.path.join(directorio, "tareas.csv")
+        with open(ruta_csv, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["titulo", "descripcion", "completada"])
+            escritor.writerows((f"Tarea {i}", f"Importada {i}", i % 2) for i in range(filas))
+        
+        for ruta in (ruta_jsonl, ruta_csv):
+            formato = os.path.splitext(ruta)[1][1:]
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor = GestorTareas(os.path.join(directorio, f"importar_{formato}.db"))
+                inicio = time.perf_counter()
+                importadas = importar_archivo(gestor, ruta)
+                segundos = time.perf_counter() - inicio
+                gestor.cerrar_conexion()
+            
+            resultados[formato] = segundos
+            print(f"{formato:<6} {importadas} tareas en {segundos:.2f} s ({importadas / segundos:,.0f} tareas/s)")
+    
+    return resultados
+
+
+def benchmark_toggles(clics, tareas, clics_por_vaciado):
+    """
+    Simula a un usuario marcando checkboxes seguidos y compara las
+    escrituras directas con el búfer write-behind de marcar_completada
+    """
+    print(f"🧪 Benchmark de checkboxes: {clics} clics sobre {tareas} tareas")
+    aleatorio = random.Random(42)
+    secuencia = [(aleatorio.randint(1, tareas), aleatorio.random() < 0.5) for _ in range(clics)]
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        for modo in ("directo", "diferido"):
+            nombre_db = os.path.join(directorio, f"toggles_{modo}.db")
+            poblar_db(nombre_db, tareas)
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor = GestorTareas(nombre_db)
+                
+                commits = 0
+                inicio = time.perf_counter()
+                for numero, (tarea_id, completada) in enumerate(secuencia, 1):
+                    if modo == "directo":
+                        gestor.marcar_completada(tarea_id, completada)
+                        commits += 1
+                    else:
+                        gestor.marcar_completada_diferida(tarea_id, completada)
+                        # El temporizador de la app vacía el búfer cada cierto tiempo
+                        if numero % clics_por_vaciado == 0 and gestor.vaciar_cambios_pendientes():
+                            commits += 1
+                if gestor.vaciar_cambios_pendientes():
+                    commits += 1
+                segundos = time.perf_counter() - inicio
+                
+                estado_final = sorted((tarea.id, tarea.completada) for tarea in gestor.obtener_todas_tareas())
+                gestor.cerrar_conexion()
+            
+            resultados[modo] = {"commits": commits, "segundos": segundos, "estado": estado_final}
+            print(f"{modo:<9} {commits:>6} commits en {segundos:.3f} s ({clics / segundos:,.0f} clics/s)")
+    
+    ahorro = 1 - resultados["diferido"]["commits"] / resultados["directo"]["commits"]
+    iguales = resultados["directo"]["estado"] == resultados["diferido"]["estado"]
+    print(f"\nCommits ahorrados: {ahorro:.1%} | Estado final idéntico: {'Sí' if iguales else 'No'}")
+    return resultados
+
+
+def benchmark_masivas(filas, seleccion):
+    """
+    Compara las operaciones fila a fila (una transacción por tarea) con las
+    masivas, y mide el espacio que liberar_espacio() devuelve al disco
+    """
+    print(f"🧪 Operaciones masivas: {seleccion} tareas seleccionadas de {filas}")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        for modo in ("fila a fila", "masiva"):
+            nombre_db = os.path.join(directorio, f"masivas_{len(resultados)}.db")
+            poblar_db(nombre_db, filas)
+            gestor = GestorTareas(nombre_db)
+            tareas_ids = random.Random(42).sample(range(1, filas + 1), seleccion)
+            tiempos = {}
+            
+            inicio = time.perf_counter()
+            if modo == "fila a fila":
+                for tarea_id in tareas_ids:
+                    gestor.marcar_completada(tarea_id, True)
+            else:
+                gestor.marcar_completadas(tareas_ids, True)
+            tiempos['marcar'] = time.perf_counter() - inicio
+            
+            inicio = time.perf_counter()
+            if modo == "fila a fila":
+                for tarea_id in tareas_ids:
+                    gestor.eliminar_tarea(tarea_id)
+            else:
+                gestor.eliminar_tareas(tareas_ids)
+            tiempos['eliminar'] = time.perf_counter() - inicio
+            
+            inicio = time.perf_counter()
+            if modo == "fila a fila":
+                completadas = [tarea.id for tarea in gestor.iterar_tareas() if tarea.completada]
+                for tarea_id in completadas:
+                    gestor.eliminar_tarea(tarea_id)
+            else:
+                gestor.eliminar_completadas()
+            tiempos['borrar_completadas'] = time.perf_counter() - inicio
+            
+            resultados[modo] = tiempos
+            gestor.cerrar_conexion()
+        
+        # Espacio recuperado tras el borrado masivo
+        gestor = GestorTareas(nombre_db)
+        conexion = gestor._obtener_conexion()
+        paginas_antes = conexion.execute("PRAGMA page_count").fetchone()[0]
+        inicio = time.perf_counter()
+        tandas = 0
+        while gestor.liberar_espacio():
+            tandas += 1
+        segundos_vacuum = time.perf_counter() - inicio
+        paginas_despues = conexion.execute("PRAGMA page_count").fetchone()[0]
+        tamano_pagina = conexion.execute("PRAGMA page_size").fetchone()[0]
+        gestor.cerrar_conexion()
+    
+    print(f"\n{'Operación':<22}{'Fila a fila (ms)':>18}{'Masiva (ms)':>13}{'Mejora':>9}")
+    for operacion in resultados["masiva"]:
+        antes = resultados["fila a fila"][operacion] * 1000
+        despues = resultados["masiva"][operacion] * 1000
+        print(f"{operacion:<22}{antes:>18.1f}{despues:>13.1f}{antes / max(despues, 1e-9):>8.1f}x")
+    print(f"\n🧹 Espacio liberado: {(paginas_antes - paginas_despues) * tamano_pagina / 1e6:.1f} MB "
+          f"en {tandas} tandas ({segundos_vacuum * 1000:.0f} ms)")
+    return resultados
+
+
+def medir_memoria(cargar):
+    """
+    Devuelve la memoria retenida (bytes) por el resultado de cargar()
+    """
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        resultado = cargar()
+        despues = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return despues - antes, len(resultado)
+
+
+def benchmark_memoria_filas(filas, longitud_descripcion):
+    """
+    Compara los bytes por tarea de las tuplas completas de antes con los
+    objetos Tarea completos (ocupan lo mismo) y con vista previa de la
+    descripción, que es lo que carga la lista
+    """
+    print(f"🧪 Benchmark de memoria con {filas} tareas (descripciones de {longitud_descripcion} caracteres)")
+    relleno = "x" * longitud_descripcion
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "memoria.db")
+        with contextlib.closing(sqlite3.connect(nombre_db)) as conexion:
+            migraciones.migrar(conexion)
+            with conexion:
+                fecha = int(time.time())
+                conexion.executemany(
+                    'INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    ((f"Tarea {i}", f"{i} {relleno}", i % 2, fecha, fecha) for i in range(filas))
+                )
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor = GestorTareas(nombre_db, tamano_cache=0)
+        
+        with contextlib.closing(sqlite3.connect(nombre_db)) as conexion:
+            resultados["tuplas"] = medir_memoria(
+                lambda: conexion.execute(f"SELECT {COLUMNAS_COMPLETAS} FROM tareas ORDER BY fecha_creacion DESC, id DESC").fetchall()
+            )
+        resultados["tarea_completa"] = medir_memoria(lambda: gestor.obtener_tareas_pagina(filas, completas=True))
+        resultados["tarea_vista_previa"] = medir_memoria(lambda: gestor.obtener_tareas_pagina(filas))
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor.cerrar_conexion()
+    
+    print(f"\n{'Formato':<22}{'Bytes/tarea':>12}{'Total (MB)':>12}")
+    for formato, (total, cantidad) in resultados.items():
+        print(f"{formato:<22}{total / cantidad:>12.0f}{total / 1_048_576:>12.1f}")
+    
+    return {formato: total / cantidad for formato, (total, cantidad) in resultados.items()}
+
+
+def benchmark_migracion(filas):
+    """
+    Mide la migración en el sitio de una base de datos anterior a las
+    migraciones (fechas en texto) y la memoria de Python que usa
+    """
+    print(f"🧪 Benchmark de migración con {filas} tareas")
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "legado.db")
+        poblar_db(nombre_db, filas, legado=True)
+        
+        with contextlib.closing(sqlite3.connect(nombre_db)) as conexion:
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            aplicadas = migraciones.migrar(conexion)
+            segundos = time.perf_counter() - inicio
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            
+            version = migraciones.version_esquema(conexion)
+            total, con_fecha_entera = conexion.execute(
+                "SELECT COUNT(*), SUM(typeof(fecha_creacion) = 'integer') FROM tareas"
+            ).fetchone()
+            estadisticas = conexion.execute("SELECT total FROM estadisticas_tareas WHERE id = 1").fetchone()[0]
+    
+    for migracion in aplicadas:
+        print(f"  {migracion}")
+    print(f"\nuser_version {version} en {segundos:.2f} s ({filas / segundos:,.0f} tareas/s)")
+    print(f"Pico de memoria de Python: {pico / 1024:.0f} KB")
+    print(f"Fechas enteras: {con_fecha_entera}/{total} | Estadísticas: {estadisticas}")
+    return {"segundos": segundos, "pico_memoria": pico, "version": version}
+
+
+def operaciones_suite(gestor, filas):
+    """
+    Todas las operaciones públicas de GestorTareas, con las repeticiones
+    de cada una. Las tareas agregadas se eliminan después, así que el
+    tamaño de la tabla apenas cambia durante la medición.
+    """
+    conexion = gestor._obtener_conexion()
+    cursor_medio = conexion.execute(
+        "SELECT fecha_creacion, id FROM tareas ORDER BY fecha_creacion DESC, id DESC LIMIT 1 OFFSET ?",
+        (filas // 2,)
+    ).fetchone()
+    nuevas = []
+    
+    def aleatoria(i):
+        return 1 + (i * 7919) % filas
+    
+    def vaciar_pendientes(i):
+        for j in range(50):
+            gestor.marcar_completada_diferida(aleatoria(i * 50 + j), j % 2 == 0)
+        gestor.vaciar_cambios_pendientes()
+    
+    lote = [(f"Lote {j}", "Benchmark") for j in range(1000)]
+    
+    return [
+        ("agregar_tarea", lambda i: nuevas.append(gestor.agregar_tarea(f"Nueva {i}", "Benchmark")), 200),
+        ("obtener_tarea_por_id", lambda i: gestor.obtener_tarea_por_id(aleatoria(i)), 500),
+        ("obtener_tareas_pagina", lambda i: gestor.obtener_tareas_pagina(50), 200),
+        ("obtener_tareas_pagina_cursor", lambda i: gestor.obtener_tareas_pagina(50, cursor_medio), 200),
+        ("buscar", lambda i: gestor.buscar(f"tarea {aleatoria(i)}"), 100),
+        ("actualizar_tarea", lambda i: gestor.actualizar_tarea(aleatoria(i), f"Editada {i}", "Benchmark", i % 2 == 0), 200),
+        ("marcar_completada", lambda i: gestor.marcar_completada(aleatoria(i), i % 2 == 0), 200),
+        ("vaciar_cambios_pendientes_50", vaciar_pendientes, 50),
+        ("obtener_estadisticas", lambda i: gestor.obtener_estadisticas(), 200),
+        ("eliminar_tarea", lambda i: gestor.eliminar_tarea(nuevas.pop()), 200),
+        ("agregar_tareas_lote_1000", lambda i: gestor.agregar_tareas_lote(lote), 5),
+        ("obtener_todas_tareas", lambda i: gestor.obtener_todas_tareas(), 3 if filas <= 100_000 else 1),
+    ]
+
+
+def preparar_kivy_sin_pantalla():
+    """
+    Configura Kivy para medir sin pantalla ni GPU: backend OpenGL simulado,
+    vídeo SDL ficticio y sin límite de FPS para que Clock.tick no duerma.
+    Debe llamarse antes de importar cualquier módulo de Kivy.
+    """
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    
+    from kivy.config import Config
+    Config.set("graphics", "maxfps", "0")
+
+
+def esperar_interfaz(app, limite=60):
+    """
+    Procesa frames hasta que la interfaz recibe todos los resultados
+    pendientes del hilo de la base de datos
+    """
+    from kivy.clock import Clock
+    
+    fin = time.perf_counter() + limite
+    while True:
+        # El hilo es FIFO: cuando termina esta tarea, las anteriores ya
+        # programaron sus callbacks en el Clock
+        app.db.enviar(lambda: None).result()
+        Clock.tick()
+        if not (app.db.esta_cargando("lista") or app.db.esta_cargando("estadisticas")):
+            return
+        if time.perf_counter() > fin:
+            raise TimeoutError("la interfaz no recibió los resultados a tiempo")
+
+
+def benchmark_interfaz(nombre_db, repeticiones=20):
+    """
+    Mide TodoApp sin pantalla sobre una base de datos ya poblada: la recarga
+    de la lista y las mutaciones de una sola fila, incluido el frame que
+    redibuja el RecycleView
+    
+    Returns:
+        dict: Latencias resumidas por operación
+    """
+    preparar_kivy_sin_pantalla()
+    from kivy.clock import Clock
+    from app import TodoApp
+    from modelos import Tarea
+    
+    os.environ["TODO_DB"] = nombre_db
+    resultados = {}
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = TodoApp()
+        raiz = app.build()
+        raiz.size = (480, 800)
+        app.actualizar_lista_tareas()
+        esperar_interfaz(app)
+        
+        def medir_interfaz(nombre, funcion):
+            tiempos = []
+            for i in range(repeticiones):
+                inicio = time.perf_counter()
+                funcion(i)
+                esperar_interfaz(app)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            resultados[nombre] = resumir(tiempos)
+        
+        # Tareas sintéticas, más recientes que todas las de la base de datos
+        base = int(time.time()) + 3600
+        nuevas = [Tarea(10**9 + i, f"Interfaz {i}", "", 0, base + i, completa=False) for i in range(repeticiones)]
+        
+        medir_interfaz("actualizar_lista_tareas", lambda i: app.actualizar_lista_tareas())
+        medir_interfaz("insertar_tarea_en_lista", lambda i: app.insertar_tarea_en_lista(nuevas[i]))
+        medir_interfaz("reemplazar_tarea_en_lista",
+                       lambda i: app.reemplazar_tarea_en_lista(nuevas[i], nuevas[i].reemplazar(titulo="Editada")))
+        medir_interfaz("cambiar_estado_tarea",
+                       lambda i: app.cambiar_estado_tarea(app.lista_tareas.data[-1]["tarea"], i % 2 == 0))
+        medir_interfaz("quitar_tarea_de_lista", lambda i: app.quitar_tarea_de_lista(nuevas[i]))
+        
+        app.on_stop()
+        Clock.tick()
+    
+    return resultados
+
+
+def medir_arranque_proceso(nombre_db):
+    """
+    Arranque de TodoApp sin pantalla, en un proceso recién creado para
+    incluir la importación de Kivy. Imprime los hitos como JSON en stdout.
+    """
+    inicio = time.perf_counter()
+    preparar_kivy_sin_pantalla()
+    from kivy.clock import Clock
+    import app as modulo_app
+    importacion = time.perf_counter() - inicio
+    
+    os.environ["TODO_DB"] = nombre_db
+    with contextlib.redirect_stdout(sys.stderr):
+        aplicacion = modulo_app.TodoApp(inicio_arranque=inicio)
+        aplicacion.build()
+        Clock.tick()
+        primer_frame = time.perf_counter() - inicio
+        limite = time.perf_counter() + 30
+        while 'primera_pagina' not in aplicacion.metricas_arranque and time.perf_counter() < limite:
+            time.sleep(0.001)
+            Clock.tick()
+        # Un frame más para que el RecycleView cree las filas
+        Clock.tick()
+        primera_fila = time.perf_counter() - inicio
+        diferidos_cargados = [modulo for modulo in ("kivy.uix.popup", "kivy.uix.spinner") if modulo in sys.modules]
+        aplicacion.on_stop()
+    
+    hitos = {
+        "importacion": importacion,
+        "construccion": aplicacion.metricas_arranque.get("construccion"),
+        "primer_frame": primer_frame,
+        "primera_pagina": aplicacion.metricas_arranque.get("primera_pagina"),
+        "primera_fila": primera_fila,
+    }
+    print(json.dumps({"hitos_ms": {nombre: segundos * 1000 for nombre, segundos in hitos.items() if segundos is not None},
+                      "diferidos_cargados": diferidos_cargados}))
+
+
+def benchmark_arranque(filas, ejecuciones, max_primera_fila_ms):
+    """
+    Mide el tiempo hasta el primer frame y hasta la primera fila de TodoApp
+    en procesos nuevos y falla si la mediana supera el presupuesto
+    
+    Returns:
+        bool: True si el arranque está dentro del presupuesto
+    """
+    print(f"🧪 Benchmark de arranque con {filas} tareas ({ejecuciones} procesos)")
+    muestras = {}
+    diferidos = set()
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "arranque.db")
+        poblar_db(nombre_db, filas)
+        
+        for _ in range(ejecuciones):
+            proceso = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "arranque-proceso", nombre_db],
+                capture_output=True, text=True
+            )
+            if proceso.returncode != 0:
+                print(f"❌ El proceso de arranque falló:\n{proceso.stderr.strip()[-2000:]}")
+                return False
+            resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+            for hito, ms in resultado["hitos_ms"].items():
+                muestras.setdefault(hito, []).append(ms)
+            diferidos.update(resultado["diferidos_cargados"])
+    
+    print(f"\n{'Hito':<18}{'Mediana (ms)':>14}{'Máximo (ms)':>13}")
+    for hito, tiempos in muestras.items():
+        print(f"{hito:<18}{statistics.median(tiempos):>14.1f}{max(tiempos):>13.1f}")
+    
+    if diferidos:
+        print(f"⚠️ Módulos que deberían cargarse al usarse ya estaban importados: {', '.join(sorted(diferidos))}")
+    
+    primera_fila = statistics.median(muestras["primera_fila"])
+    if primera_fila > max_primera_fila_ms:
+        print(f"\n❌ Primera fila a los {primera_fila:.0f} ms, por encima del presupuesto de {max_primera_fila_ms:.0f} ms")
+        return False
+    print(f"\n✅ Primera fila dentro del presupuesto de {max_primera_fila_ms:.0f} ms")
+    return True
+
+
+def benchmark_memoria(filas, max_datos_mb, max_interfaz_mb, interfaz=True):
+    """
+    Perfil de memoria de la capa de datos (obtener_todas_tareas y una página
+    con vista previa del mismo tamaño) y de TodoApp con todas las páginas
+    cargadas; falla si alguna supera su presupuesto por cada 10 000 tareas.
+    Sin Kivy instalado solo mide la capa de datos y lo indica como omitido.
+    
+    Returns:
+        bool: True si todas las mediciones están dentro del presupuesto, o
+            None si lo están las de datos pero no se pudo medir la interfaz
+    """
+    print(f"🧪 Perfil de memoria con {filas} tareas")
+    muestras = []
+    omitida = False
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "memoria.db")
+        poblar_db(nombre_db, filas)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor = GestorTareas(nombre_db, tamano_cache=0)
+        for etiqueta, cargar in (("obtener_todas_tareas", gestor.obtener_todas_tareas),
+                                 ("pagina_vista_previa", lambda: gestor.obtener_tareas_pagina(filas))):
+            perfil_datos = PerfilMemoria()
+            perfil_datos.iniciar()
+            tareas = cargar()
+            muestras.append((perfil_datos.muestrear(etiqueta, len(tareas)), max_datos_mb))
+            del tareas
+            perfil_datos.detener()
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor.cerrar_conexion()
+        
+        if interfaz:
+            try:
+                preparar_kivy_sin_pantalla()
+                from kivy.clock import Clock
+                from app import TodoApp
+                from memoria import perfil
+            except ImportError as e:
+                print(f"⚠️ Medición de la interfaz omitida, Kivy no está disponible: {e}")
+                interfaz = False
+                omitida = True
+        
+        if interfaz:
+            os.environ["TODO_DB"] = nombre_db
+            # build() toma la base del perfil compartido antes de crear widgets
+            os.environ["TODO_PERFIL_MEMORIA"] = "1"
+            with contextlib.redirect_stdout(io.StringIO()):
+                app = TodoApp()
+                raiz = app.build()
+                raiz.size = (480, 800)
+                esperar_interfaz(app)
+                while app.hay_mas_tareas:
+                    app.cargar_mas_tareas()
+                    esperar_interfaz(app)
+                # Un frame más para que el RecycleView cree las filas visibles
+                Clock.tick()
+                muestras.append((perfil.muestrear("interfaz", len(app.lista_tareas.data)), max_interfaz_mb))
+                perfil.detener()
+                app.on_stop()
+                Clock.tick()
+    
+    dentro = True
+    print(f"\n{'Medición':<24}{'Tareas':>9}{'Bytes/tarea':>13}{'MB/10k':>9}{'Máximo':>9}")
+    for muestra, maximo in muestras:
+        por_10k = muestra['bytes_por_tarea'] * 10_000 / 1e6
+        dentro = dentro and por_10k <= maximo
+        marca = "" if por_10k <= maximo else "  ❌"
+        print(f"{muestra['etiqueta']:<24}{muestra['tareas']:>9}{muestra['bytes_por_tarea']:>13.0f}"
+              f"{por_10k:>9.2f}{maximo:>9.2f}{marca}")
+    for muestra, _ in muestras:
+        print()
+        print("\n".join(informe(muestra)))
+    
+    if not dentro:
+        print("\n❌ Memoria por tarea por encima del presupuesto")
+        return False
+    if omitida:
+        print("\n⏭️ Capa de datos dentro del presupuesto; interfaz sin comprobar "
+              "(instala Kivy, o usa --sin-interfaz para medir solo los datos)")
+        return None
+    print("\n✅ Memoria por tarea dentro del presupuesto")
+    return True
+
+
+def benchmark_respaldo(filas, pasos=(64, 256, 4096)):
+    """
+    Mide respaldar() mientras otro gestor escribe tareas y lee páginas de
+    la lista sin pausa: duración del respaldo por tamaño de paso y latencia
+    de esas operaciones frente a la misma carga sin respaldo en curso
+    """
+    print(f"🧪 Respaldo en caliente con {filas} tareas")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "respaldo.db")
+        destino = os.path.join(directorio, "respaldos")
+        poblar_db(nombre_db, filas)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor = GestorTareas(nombre_db, tamano_cache=0)
+            otro = GestorTareas(nombre_db, tamano_cache=0)
+        
+        def carga(sigue):
+            # Como la interfaz y otro proceso: una escritura y una página por vuelta
+            escrituras, lecturas = [], []
+            while sigue(len(escrituras)):
+                inicio = time.perf_counter()
+                otro.agregar_tarea(f"Durante el respaldo {len(escrituras)}")
+                escrituras.append((time.perf_counter() - inicio) * 1000)
+                inicio = time.perf_counter()
+                otro.obtener_tareas_pagina(50)
+                lecturas.append((time.perf_counter() - inicio) * 1000)
+            return resumir(escrituras), resumir(lecturas)
+        
+        resultados["sin respaldo"] = (None,) + carga(lambda vueltas: vueltas < 500)
+        for paginas in pasos:
+            inicio = time.perf_counter()
+            futuro = gestor.respaldar(destino, conservar=1, paginas_por_paso=paginas)
+            escrituras, lecturas = carga(lambda vueltas: not futuro.done())
+            futuro.result()
+            resultados[f"{paginas} páginas/paso"] = (time.perf_counter() - inicio, escrituras, lecturas)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            otro.cerrar_conexion()
+            gestor.cerrar_conexion()
+    
+    print(f"\n{'Caso':<20}{'Respaldo (s)':>13}{'Escrituras':>11}{'Escr. p50/p95 (ms)':>20}{'Página p50/p95 (ms)':>21}")
+    for caso, (segundos, escrituras, lecturas) in resultados.items():
+        duracion = "-" if segundos is None else f"{segundos:.2f}"
+        print(f"{caso:<20}{duracion:>13}{escrituras['repeticiones']:>11}"
+              f"{escrituras['mediana_ms']:>11.2f} / {escrituras['p95_ms']:<6.2f}"
+              f"{lecturas['mediana_ms']:>12.2f} / {lecturas['p95_ms']:<6.2f}")
+    return resultados
+
+
+def benchmark_suite(tamanos, salida=None, interfaz=True):
+    """
+    Mide cada operación de GestorTareas sobre bases de datos en disco de
+    varios tamaños y, si Kivy está disponible, la interfaz sin pantalla
+    
+    Args:
+        tamanos (list): Número de tareas de cada base de datos
+        salida (str): Ruta del JSON de resultados (opcional)
+        interfaz (bool): Incluir las mediciones de TodoApp
+    
+    Returns:
+        dict: Resultados con las claves "<grupo>/<filas>/<operación>"
+    """
+    resultado = {
+        "version": 1,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entorno": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "sistema": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+        },
+        "resultados": {},
+    }
+    resultados = resultado["resultados"]
+    
+    for filas in tamanos:
+        print(f"🧪 Suite con {filas} tareas")
+        with tempfile.TemporaryDirectory() as directorio:
+            nombre_db = os.path.join(directorio, f"suite_{filas}.db")
+            inicio = time.perf_counter()
+            poblar_db(nombre_db, filas)
+            print(f"  Base de datos poblada en {time.perf_counter() - inicio:.1f} s")
+            
+            # Sin caché por ID: se mide el acceso a SQLite
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor = GestorTareas(nombre_db, tamano_cache=0)
+            for operacion, funcion, repeticiones in operaciones_suite(gestor, filas):
+                resumen = resumir(medir(funcion, repeticiones))
+                resultados[f"gestor/{filas}/{operacion}"] = resumen
+                print(f"  {operacion:<30}{resumen['mediana_ms']:>10.3f} ms  (p95 {resumen['p95_ms']:.3f})")
+            with contextlib.redirect_stdout(io.StringIO()):
+                gestor.cerrar_conexion()
+            
+            if interfaz:
+                try:
+                    for operacion, resumen in benchmark_interfaz(nombre_db).items():
+                        resultados[f"interfaz/{filas}/{operacion}"] = resumen
+                        print(f"  {operacion:<30}{resumen['mediana_ms']:>10.3f} ms  (p95 {resumen['p95_ms']:.3f})")
+                except ImportError as e:
+                    print(f"⚠️ Mediciones de interfaz omitidas, Kivy no está disponible: {e}")
+                    interfaz = False
+    
+    if salida:
+        with open(salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {salida}")
+    
+    return resultado
+
+
+def comparar_resultados(ruta_base, ruta_actual, umbral=0.2, minimo_ms=0.05):
+    """
+    Compara dos JSON de la suite y marca como regresión cada operación
+    cuya mediana empeora más del umbral
+    
+    Args:
+        ruta_base (str): JSON de referencia
+        ruta_actual (str): JSON a comparar
+        umbral (float): Empeoramiento relativo tolerado (0.2 = 20 %)
+        minimo_ms (float): Diferencia absoluta por debajo de la cual se
+            considera ruido de medición
+    
+    Returns:
+        list: Claves de las operaciones con regresión
+    """
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = json.load(archivo)["resultados"]
+    with open(ruta_actual, encoding="utf-8") as archivo:
+        actual = json.load(archivo)["resultados"]
+    
+    regresiones = []
+    print(f"{'Operación':<52}{'Base (ms)':>12}{'Actual (ms)':>13}{'Cambio':>9}")
+    for clave in sorted(base.keys() & actual.keys()):
+        antes = base[clave]["mediana_ms"]
+        despues = actual[clave]["mediana_ms"]
+        cambio = (despues - antes) / antes if antes else 0.0
+        regresion = cambio > umbral and despues - antes > minimo_ms
+        marca = "  ❌ regresión" if regresion else ""
+        print(f"{clave:<52}{antes:>12.3f}{despues:>13.3f}{cambio:>+9.0%}{marca}")
+        if regresion:
+            regresiones.append(clave)
+    
+    for clave in sorted(base.keys() - actual.keys()):
+        print(f"⚠️ {clave} no está en los resultados actuales")
+    
+    if regresiones:
+        print(f"\n❌ {len(regresiones)} regresiones por encima del {umbral:.0%}")
+    else:
+        print(f"\n✅ Sin regresiones por encima del {umbral:.0%}")
+    return regresiones
+
+
+def benchmark_filtros(filas, repeticiones=50):
+    """
+    Mide el cambio de filtro/orden de la lista: la primera página de cada
+    combinación y una página a mitad de la lista (paginación por cursor),
+    más las vistas de tareas vencidas y próximas
+    """
+    print(f"🧪 Benchmark de filtros con {filas} tareas")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "filtros.db")
+        poblar_db(nombre_db, filas)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor = GestorTareas(nombre_db, tamano_cache=0)
+        conexion = gestor._obtener_conexion()
+        
+        for filtro in FILTROS:
+            for orden in ORDENES:
+                donde = f"WHERE {FILTROS[filtro]}" if FILTROS[filtro] else ""
+                claves, direccion = ORDENES[orden][:2]
+                cursor_medio = conexion.execute(
+                    f"SELECT {', '.join(claves)} FROM tareas {donde} "
+                    f"ORDER BY {', '.join(f'{clave} {direccion}' for clave in claves)} LIMIT 1 OFFSET ?",
+                    (filas // 4,)
+                ).fetchone()
+                primera = medir(lambda i: gestor.obtener_tareas_pagina(50, filtro=filtro, orden=orden), repeticiones)
+                siguiente = medir(lambda i: gestor.obtener_tareas_pagina(50, cursor_medio, filtro=filtro, orden=orden),
+                                  repeticiones)
+                resultados[(filtro, orden)] = (statistics.median(primera), statistics.median(siguiente))
+        
+        # Vistas de plazos: siempre pendientes y por fecha límite
+        for nombre, leer in (("vencidas", gestor.obtener_vencidas), ("proximas", gestor.obtener_proximas)):
+            pagina = leer(limite=50)
+            cursor_medio = clave_orden(pagina[len(pagina) // 2], "vencimiento") if pagina else None
+            primera = medir(lambda i: leer(limite=50), repeticiones)
+            siguiente = medir(lambda i: leer(limite=50, despues_de=cursor_medio), repeticiones)
+            resultados[(nombre, "vencimiento")] = (statistics.median(primera), statistics.median(siguiente))
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            gestor.cerrar_conexion()
+    
+    print(f"\n{'Filtro':<14}{'Orden':<12}{'Primera (ms)':>14}{'Cursor (ms)':>13}")
+    for (filtro, orden), (primera, siguiente) in resultados.items():
+        print(f"{filtro:<14}{orden:<12}{primera:>14.3f}{siguiente:>13.3f}")
+    return resultados
+
+
+def benchmark_instrumentacion(filas, llamadas):
+    """
+    Mide el coste por llamada de la instrumentación: sin decorador,
+    decorada pero desactivada, y activada (con conexión instrumentada)
+    """
+    print(f"🧪 Coste de la instrumentación con {filas} tareas ({llamadas} llamadas por operación)")
+    operaciones = ("obtener_estadisticas", "obtener_tarea_por_id", "obtener_tareas_pagina")
+    resultados = {}
+    
+    def por_llamada(funcion):
+        # Calentamiento: caché de páginas y sentencias preparadas
+        for i in range(llamadas // 10):
+            funcion(1 + i % filas)
+        inicio = time.perf_counter()
+        for i in range(llamadas):
+            funcion(1 + i % filas)
+        return (time.perf_counter() - inicio) / llamadas * 1e6
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "instrumentacion.db")
+        poblar_db(nombre_db, filas)
+        estado_anterior = metricas.activa
+        
+        for modo in ("sin decorador", "desactivada", "activada"):
+            metricas.desactivar()
+            if modo == "activada":
+                metricas.activar()
+                metricas.reiniciar()
+            gestor = GestorTareas(nombre_db, tamano_cache=0)
+            for operacion in operaciones:
+                metodo = getattr(GestorTareas, operacion)
+                if modo == "sin decorador":
+                    metodo = metodo.__wrapped__
+                if operacion == "obtener_estadisticas":
+                    funcion = lambda i, metodo=metodo: metodo(gestor)
+                elif operacion == "obtener_tarea_por_id":
+                    funcion = lambda i, metodo=metodo: metodo(gestor, i)
+                else:
+                    funcion = lambda i, metodo=metodo: metodo(gestor, 20)
+                resultados.setdefault(operacion, {})[modo] = por_llamada(funcion)
+            gestor.cerrar_conexion()
+        
+        instantanea = metricas.instantanea()
+        metricas.activa = estado_anterior
+    
+    print(f"\n{'Operación':<24}{'Sin decorador':>15}{'Desactivada':>13}{'Activada':>11}  (µs/llamada)")
+    for operacion, tiempos in resultados.items():
+        print(f"{operacion:<24}{tiempos['sin decorador']:>15.2f}{tiempos['desactivada']:>13.2f}{tiempos['activada']:>11.2f}")
+    
+    print(f"\nFilas leídas: {instantanea['filas_leidas']} | escritas: {instantanea['filas_escritas']}")
+    for nombre, resumen in instantanea['operaciones'].items():
+        print(f"  {nombre:<32} p50 {resumen['p50_ms']:.4f}  p95 {resumen['p95_ms']:.4f}  "
+              f"p99 {resumen['p99_ms']:.4f} ms  ({resumen['llamadas']} llamadas)")
+    return resultados
+
+
+def benchmark_dialogos(ciclos):
+    """
+    Abre y cierra los diálogos de la app: construyendo uno nuevo en cada
+    ciclo (como antes) o reutilizándolo desde PoolDialogos. Mide el tiempo,
+    las recolecciones del GC y la memoria asignada por tracemalloc.
+    """
+    try:
+        preparar_kivy_sin_pantalla()
+        from kivy.clock import Clock
+        from kivy.core.window import Window  # noqa: F401 - crea la ventana ficticia
+        import dialogos
+        from modelos import Tarea
+    except ImportError as e:
+        print(f"⚠️ Kivy no está disponible, se omite el benchmark de diálogos: {e}")
+        return None
+    
+    print(f"🧪 Diálogos: {ciclos} ciclos de abrir/cerrar por modo")
+    dialogos.DialogoReutilizable.ANIMACION = False
+    tarea = Tarea(1, "Estudiar Python", "Completar el curso de Python básico", 0, int(time.time()), None)
+    mostrar = {
+        dialogos.DialogoMensaje: lambda dialogo: dialogo.mostrar("✅ Éxito", "Tarea actualizada correctamente."),
+        dialogos.DialogoEditor: lambda dialogo: dialogo.mostrar(tarea, lambda *args: None),
+        dialogos.DialogoConfirmacion: lambda dialogo: dialogo.mostrar(f"¿Eliminar \"{tarea.titulo}\"?", lambda *args: None),
+    }
+    clases = list(mostrar)
+    
+    def ciclo_nuevo(i):
+        clase = clases[i % len(clases)]
+        dialogo = clase()
+        mostrar[clase](dialogo)
+        Clock.tick()
+        dialogo.cerrar()
+    
+    pool = dialogos.PoolDialogos()
+    
+    def ciclo_pool(i):
+        clase = clases[i % len(clases)]
+        dialogo = pool.obtener(clase)
+        mostrar[clase](dialogo)
+        Clock.tick()
+        dialogo.cerrar()
+    
+    pausas = []
+    inicio_pausa = [0.0]
+    
+    def medir_gc(fase, info):
+        if fase == "start":
+            inicio_pausa[0] = time.perf_counter()
+        else:
+            pausas.append((info["generation"], time.perf_counter() - inicio_pausa[0]))
+    
+    resultados = {}
+    for modo, ciclo in (("nuevo", ciclo_nuevo), ("pool", ciclo_pool)):
+        # Calentamiento: imports, texturas de fuentes y el propio pool
+        for i in range(len(clases) * 2):
+            ciclo(i)
+        gc.collect()
+        
+        del pausas[:]
+        gc.callbacks.append(medir_gc)
+        try:
+            inicio = time.perf_counter()
+            for i in range(ciclos):
+                ciclo(i)
+            segundos = time.perf_counter() - inicio
+        finally:
+            gc.callbacks.remove(medir_gc)
+        
+        # Segunda pasada solo para la memoria: tracemalloc ralentiza el tiempo
+        gc.collect()
+        tracemalloc.start()
+        try:
+            for i in range(ciclos):
+                ciclo(i)
+            actual, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        resultados[modo] = {
+            'ms_por_ciclo': segundos / ciclos * 1000,
+            'recolecciones': [sum(1 for generacion, _ in pausas if generacion == g) for g in range(3)],
+            'pausa_gc_ms': sum(duracion for _, duracion in pausas) * 1000,
+            'pico_kb': pico / 1024,
+            'retenido_kb': actual / 1024,
+        }
+    
+    print(f"\n{'Modo':<8}{'ms/ciclo':>10}{'GC gen0/1/2':>16}{'Pausa GC (ms)':>15}{'Pico (KB)':>11}{'Retenido (KB)':>15}")
+    for modo, r in resultados.items():
+        recolecciones = "/".join(str(n) for n in r['recolecciones'])
+        print(f"{modo:<8}{r['ms_por_ciclo']:>10.3f}{recolecciones:>16}{r['pausa_gc_ms']:>15.1f}"
+              f"{r['pico_kb']:>11.0f}{r['retenido_kb']:>15.0f}")
+    print(f"\nDiálogos construidos con pool: {pool.creados} (sin pool: {ciclos * 2 + len(clases) * 2})")
+    return resultados
+
+
+def benchmark_sincronizacion(filas, cambios):
+    """
+    Compara la primera sincronización (todas las tareas) con las siguientes
+    (solo los cambios) a través del servidor local; el coste de estas
+    debe depender de `cambios`, no de `filas`
+    """
+    print(f"🧪 Sincronización por deltas: {cambios} cambios sobre {filas} tareas")
+    resultados = {}
+    servidor = ServidorSincronizacion().iniciar()
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_a = os.path.join(directorio, "origen.db")
+        poblar_db(ruta_a, filas)
+        gestor_a = GestorTareas(ruta_a)
+        gestor_b = GestorTareas(os.path.join(directorio, "destino.db"))
+        sinc_a = SincronizadorTareas(gestor_a, servidor.url)
+        sinc_b = SincronizadorTareas(gestor_b, servidor.url)
+        
+        def ronda(nombre):
+            bytes_antes = sinc_a.bytes_enviados + sinc_b.bytes_recibidos
+            inicio = time.perf_counter()
+            enviados = sinc_a.sincronizar()['enviados']
+            aplicados = sinc_b.sincronizar()['aplicados']
+            resultados[nombre] = {
+                'ms': (time.perf_counter() - inicio) * 1000,
+                'enviados': enviados,
+                'aplicados': aplicados,
+                'kb': (sinc_a.bytes_enviados + sinc_b.bytes_recibidos - bytes_antes) / 1024,
+            }
+        
+        ronda("inicial")
+        
+        tareas_ids = random.Random(42).sample(range(1, filas + 1), cambios)
+        mitad = len(tareas_ids) // 2
+        gestor_a.marcar_completadas(tareas_ids[:mitad], False)
+        gestor_a.marcar_completadas(tareas_ids[:mitad], True)
+        gestor_a.eliminar_tareas(tareas_ids[mitad:])
+        ronda("deltas")
+        
+        ronda("sin cambios")
+        
+        iguales = gestor_a.obtener_estadisticas() == gestor_b.obtener_estadisticas()
+        gestor_a.cerrar_conexion()
+        gestor_b.cerrar_conexion()
+        tamano_archivo = os.path.getsize(ruta_a) / 1024
+    servidor.detener()
+    
+    print(f"\n{'Ronda':<14}{'ms':>10}{'Enviados':>10}{'Aplicados':>11}{'KB gzip':>10}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:<14}{r['ms']:>10.1f}{r['enviados']:>10}{r['aplicados']:>11}{r['kb']:>10.1f}")
+    print(f"\nCopiar el archivo entero: {tamano_archivo:.0f} KB; bases de datos iguales: {'✅' if iguales else '❌'}")
+    return resultados
+
+
+def benchmark_archivo(filas, repeticiones=20):
+    """
+    Mide la tabla principal antes y después de archivar las completadas
+    antiguas (la mitad de las filas de poblar_db)
+    """
+    print(f"🧪 Archivado: {filas} tareas, la mitad completadas hace un año")
+    resultados = {}
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "archivo.db")
+        poblar_db(nombre_db, filas)
+        with contextlib.closing(sqlite3.connect(nombre_db)) as conexion, conexion:
+            conexion.execute("UPDATE tareas SET fecha_actualizacion = fecha_actualizacion - 365 * 86400 "
+                             "WHERE completada = 1")
+        
+        gestor = GestorTareas(nombre_db, tamano_cache=0)
+        # (función, repeticiones); medir() pasa el número de repetición
+        operaciones = {
+            'primera_pagina': (lambda i: gestor.obtener_tareas_pagina(50), repeticiones),
+            'pagina_pendientes': (lambda i: gestor.obtener_tareas_pagina(50, filtro="pendientes"), repeticiones),
+            'estadisticas': (lambda i: gestor.obtener_estadisticas(), repeticiones),
+            'verificar_estadisticas': (lambda i: gestor.verificar_estadisticas(), repeticiones),
+            'todas_las_tareas': (lambda i: gestor.obtener_todas_tareas(), 3),
+        }
+        
+        def medir_tabla(nombre):
+            conexion = gestor._obtener_conexion()
+            paginas = conexion.execute("PRAGMA page_count").fetchone()[0] - conexion.execute(
+                "PRAGMA freelist_count").fetchone()[0]
+            resultados[nombre] = {
+                'mb': paginas * conexion.execute("PRAGMA page_size").fetchone()[0] / 1e6,
+                'ms': {operacion: resumir(medir(funcion, veces))['mediana_ms']
+                       for operacion, (funcion, veces) in operaciones.items()},
+            }
+        
+        medir_tabla("antes")
+        
+        inicio = time.perf_counter()
+        archivadas = lotes = 0
+        while True:
+            movidas = gestor.archivar_completadas()
+            if not movidas:
+                break
+            archivadas += movidas
+            lotes += 1
+        segundos_archivo = time.perf_counter() - inicio
+        while gestor.liberar_espacio():
+            pass
+        
+        medir_tabla("después")
+        archivo_mb = os.path.getsize(gestor.nombre_archivo) / 1e6
+        gestor.cerrar_conexion()
+    
+    print(f"\n{'Operación':<24}{'Antes (ms)':>12}{'Después (ms)':>14}{'Mejora':>9}")
+    for operacion in operaciones:
+        antes = resultados["antes"]['ms'][operacion]
+        despues = resultados["después"]['ms'][operacion]
+        print(f"{operacion:<24}{antes:>12.2f}{despues:>14.2f}{antes / max(despues, 1e-9):>8.1f}x")
+    print(f"\n🗄️ {archivadas} tareas archivadas en {lotes} lotes ({segundos_archivo:.1f} s); "
+          f"tabla principal {resultados['antes']['mb']:.1f} -> {resultados['después']['mb']:.1f} MB, "
+          f"archivo {archivo_mb:.1f} MB")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del gestor de tareas")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    
+    parser_conexion = subparsers.add_parser("conexion", help="Latencia por operación antes/después de la conexión persistente")
+    parser_conexion.add_argument("--filas", type=int, default=100_000)
+    
+    parser_importar = subparsers.add_parser("importar", help="Importación masiva desde CSV y JSONL")
+    parser_importar.add_argument("--filas", type=int, default=1_000_000)
+    
+    parser_toggles = subparsers.add_parser("toggles", help="Commits ahorrados por el búfer de checkboxes")
+    parser_toggles.add_argument("--clics", type=int, default=5000)
+    parser_toggles.add_argument("--tareas", type=int, default=200)
+    parser_toggles.add_argument("--clics-por-vaciado", type=int, default=50)
+    
+    parser_masivas = subparsers.add_parser("masivas", help="Operaciones sobre varias tareas frente a una transacción por tarea")
+    parser_masivas.add_argument("--filas", type=int, default=100_000)
+    parser_masivas.add_argument("--seleccion", type=int, default=2000)
+    
+    parser_memoria = subparsers.add_parser("memoria-filas", help="Bytes por tarea: tuplas, Tarea completa y vista previa")
+    parser_memoria.add_argument("--filas", type=int, default=1_000_000)
+    parser_memoria.add_argument("--longitud-descripcion", type=int, default=300)
+    
+    parser_migracion = subparsers.add_parser("migracion", help="Migración en el sitio de una base de datos con fechas en texto")
+    parser_migracion.add_argument("--filas", type=int, default=1_000_000)
+    
+    parser_filtros = subparsers.add_parser("filtros", help="Cambio de filtro y orden de la lista")
+    parser_filtros.add_argument("--filas", type=int, default=1_000_000)
+    
+    parser_instrumentacion = subparsers.add_parser("instrumentacion", help="Coste de la instrumentación activada y desactivada")
+    parser_instrumentacion.add_argument("--filas", type=int, default=10_000)
+    parser_instrumentacion.add_argument("--llamadas", type=int, default=20_000)
+    
+    parser_arranque = subparsers.add_parser("arranque", help="Tiempo hasta el primer frame y la primera fila")
+    parser_arranque.add_argument("--filas", type=int, default=100_000)
+    parser_arranque.add_argument("--ejecuciones", type=int, default=5)
+    parser_arranque.add_argument("--max-primera-fila-ms", type=float, default=1500)
+    
+    # Uso interno de "arranque": un proceso nuevo por medición
+    parser_arranque_proceso = subparsers.add_parser("arranque-proceso")
+    parser_arranque_proceso.add_argument("nombre_db")
+    
+    parser_dialogos = subparsers.add_parser("dialogos", help="Asignaciones y GC al abrir/cerrar diálogos, con y sin pool")
+    parser_dialogos.add_argument("--ciclos", type=int, default=10_000)
+    
+    parser_sincronizacion = subparsers.add_parser("sincronizacion", help="Primera sincronización frente a deltas posteriores")
+    parser_sincronizacion.add_argument("--filas", type=int, default=100_000)
+    parser_sincronizacion.add_argument("--cambios", type=int, default=100)
+    
+    parser_archivo = subparsers.add_parser("archivo", help="Tabla principal antes y después de archivar las completadas")
+    parser_archivo.add_argument("--filas", type=int, default=200_000)
+    
+    parser_perfil = subparsers.add_parser("memoria", help="Memoria por tarea de los datos y la interfaz, con presupuesto")
+    parser_perfil.add_argument("--filas", type=int, default=10_000)
+    parser_perfil.add_argument("--max-datos-mb", type=float, default=PRESUPUESTO_DATOS_MB, help="MB por cada 10 000 tareas")
+    parser_perfil.add_argument("--max-interfaz-mb", type=float, default=PRESUPUESTO_INTERFAZ_MB,
+                               help="MB por cada 10 000 tareas")
+    parser_perfil.add_argument("--sin-interfaz", action="store_true", help="No medir TodoApp")
+    
+    parser_respaldo = subparsers.add_parser("respaldo", help="Respaldo en caliente con escrituras y lecturas simultáneas")
+    parser_respaldo.add_argument("--filas", type=int, default=500_000)
+    
+    parser_suite = subparsers.add_parser("suite", help="Todas las operaciones a varios tamaños, con salida JSON")
+    parser_suite.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser_suite.add_argument("--salida", help="Ruta del JSON de resultados")
+    parser_suite.add_argument("--sin-interfaz", action="store_true", help="No medir TodoApp")
+    
+    parser_comparar = subparsers.add_parser("comparar", help="Marca regresiones frente a un JSON de referencia")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("actual")
+    parser_comparar.add_argument("--umbral", type=float, default=0.2, help="Empeoramiento tolerado (0.2 = 20%%)")
+    parser_comparar.add_argument("--minimo-ms", type=float, default=0.05, help="Diferencias menores se ignoran")
+    
+    args = parser.parse_args()
+    
+    if args.comando == "conexion":
+        benchmark_conexion(args.filas)
+    elif args.comando == "importar":
+        benchmark_importar(args.filas)
+    elif args.comando == "toggles":
+        benchmark_toggles(args.clics, args.tareas, args.clics_por_vaciado)
+    elif args.comando == "masivas":
+        benchmark_masivas(args.filas, args.seleccion)
+    elif args.comando == "memoria-filas":
+        benchmark_memoria_filas(args.filas, args.longitud_descripcion)
+    elif args.comando == "migracion":
+        benchmark_migracion(args.filas)
+    elif args.comando == "filtros":
+        benchmark_filtros(args.filas)
+    elif args.comando == "instrumentacion":
+        benchmark_instrumentacion(args.filas, args.llamadas)
+    elif args.comando == "arranque":
+        if not benchmark_arranque(args.filas, args.ejecuciones, args.max_primera_fila_ms):
+            sys.exit(1)
+    elif args.comando == "arranque-proceso":
+        medir_arranque_proceso(args.nombre_db)
+    elif args.comando == "dialogos":
+        benchmark_dialogos(args.ciclos)
+    elif args.comando == "sincronizacion":
+        benchmark_sincronizacion(args.filas, args.cambios)
+    elif args.comando == "archivo":
+        benchmark_archivo(args.filas)
+    elif args.comando == "memoria":
+        dentro = benchmark_memoria(args.filas, args.max_datos_mb, args.max_interfaz_mb, interfaz=not args.sin_interfaz)
+        # 2: la interfaz no se pudo medir, así que su presupuesto no se ha comprobado
+        if not dentro:
+            sys.exit(1 if dentro is False else 2)
+    elif args.comando == "respaldo":
+        benchmark_respaldo(args.filas)
+    elif args.comando == "suite":
+        benchmark_suite(args.tamanos, args.salida, interfaz=not args.sin_interfaz)
+    elif args.comando == "comparar":
+        if comparar_resultados(args.base, args.actual, args.umbral, args.minimo_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Línea de comandos de la App To-Do: python main.py tareas <comando>
+Usa GestorTareas directamente y nunca importa Kivy, para scripts y cron.
+Lee y escribe JSONL/CSV en streaming por stdin/stdout y escribe por lotes.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from gestor import (DIAS_ARCHIVO, DIAS_PROXIMAS, FILTROS, ORDENES, PAGINAS_POR_PASO_RESPALDO, PRIORIDADES,
+                    RESPALDOS_CONSERVADOS, GestorTareas, clave_orden, leer_fecha_limite)
+from importador import leer_csv_de, leer_jsonl_de
+
+
+# Columnas de export (y de list con --formato jsonl/csv); import las acepta
+CAMPOS_EXPORTACION = ("id", "titulo", "descripcion", "completada", "fecha_creacion", "fecha_actualizacion",
+                      "prioridad", "fecha_limite")
+
+# Tareas leídas por consulta al recorrer la lista
+TAMANO_PAGINA_CLI = 1000
+
+
+def abrir_entrada(ruta):
+    """
+    Devuelve el archivo de entrada; '-' es stdin
+    """
+    if ruta == "-":
+        return sys.stdin
+    return open(ruta, newline='', encoding='utf-8')
+
+
+def leer_ids(valores, tamano_lote):
+    """
+    Agrupa en lotes los IDs de la línea de comandos, o los de stdin
+    (uno por línea) si el único valor es '-'
+    
+    Yields:
+        list: Lotes de como mucho tamano_lote IDs
+    """
+    if valores == ["-"]:
+        valores = (linea.strip() for linea in sys.stdin)
+    ids = (int(valor) for valor in valores if valor)
+    while True:
+        lote = list(itertools.islice(ids, tamano_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def recorrer_paginas(leer_pagina, orden, limite=None):
+    """
+    Recorre una consulta por páginas (paginación por cursor), sin cargar
+    todas las tareas en memoria
+    
+    Args:
+        leer_pagina (callable): Recibe (tamano, despues_de) y devuelve una página
+        orden (str): Orden de la consulta, para calcular el cursor
+        limite (int): Máximo de tareas, o None para todas
+    """
+    despues_de = None
+    restantes = limite
+    while restantes is None or restantes > 0:
+        tamano = TAMANO_PAGINA_CLI if restantes is None else min(TAMANO_PAGINA_CLI, restantes)
+        pagina = leer_pagina(tamano, despues_de)
+        yield from pagina
+        if len(pagina) < tamano:
+            return
+        if restantes is not None:
+            restantes -= len(pagina)
+        despues_de = clave_orden(pagina[-1], orden)
+
+
+def recorrer_tareas(gestor, filtro, orden, limite=None):
+    """
+    Recorre las tareas completas de un filtro, página a página
+    """
+    return recorrer_paginas(
+        lambda tamano, despues_de: gestor.obtener_tareas_pagina(tamano, despues_de, completas=True,
+                                                               filtro=filtro, orden=orden),
+        orden, limite)
+
+
+def recorrer_archivadas(gestor, orden, limite=None, texto=None):
+    """
+    Recorre por páginas las tareas de la base de datos de archivo
+    """
+    return recorrer_paginas(
+        lambda tamano, despues_de: gestor.obtener_archivadas_pagina(tamano, despues_de, orden=orden, texto=texto),
+        orden, limite)
+
+
+def escribir_tareas(tareas, salida, formato):
+    """
+    Escribe las tareas en salida según el formato (texto, jsonl o csv)
+    
+    Returns:
+        int: Número de tareas escritas
+    """
+    escritas = 0
+    if formato == "csv":
+        escritor = csv.writer(salida)
+        escritor.writerow(CAMPOS_EXPORTACION)
+        for tarea in tareas:
+            escritor.writerow([getattr(tarea, campo) for campo in CAMPOS_EXPORTACION])
+            escritas += 1
+    elif formato == "jsonl":
+        for tarea in tareas:
+            salida.write(json.dumps({campo: getattr(tarea, campo) for campo in CAMPOS_EXPORTACION},
+                                    ensure_ascii=False) + "\n")
+            escritas += 1
+    else:
+        for tarea in tareas:
+            marca = "x" if tarea.completada else " "
+            prioridad = f"{'!' * tarea.prioridad} " if tarea.prioridad else ""
+            vence = (f" (vence {time.strftime('%Y-%m-%d', time.localtime(tarea.fecha_limite))})"
+                     if tarea.fecha_limite is not None else "")
+            descripcion = f" — {tarea.descripcion}" if tarea.descripcion else ""
+            salida.write(f"{tarea.id:>7} [{marca}] {prioridad}{tarea.titulo}{vence}{descripcion}\n")
+            escritas += 1
+    return escritas
+
+
+def comando_add(gestor, args):
+    """
+    add: agrega una tarea e imprime su ID
+    """
+    tarea_id = gestor.agregar_tarea(args.titulo, args.descripcion, PRIORIDADES.index(args.prioridad),
+                                    leer_fecha_limite(args.vence))
+    if tarea_id is None:
+        return 1
+    print(tarea_id)
+    return 0
+
+
+def comando_list(gestor, args):
+    """
+    list: escribe las tareas de la vista pedida, página a página
+    """
+    if args.archivadas:
+        tareas = recorrer_archivadas(gestor, args.orden, args.limite, args.buscar)
+    elif args.buscar:
+        tareas = gestor.buscar(args.buscar, args.limite or 50, filtro=args.filtro)
+    else:
+        tareas = recorrer_tareas(gestor, args.filtro, args.orden, args.limite)
+    escribir_tareas(tareas, sys.stdout, args.formato)
+    return 0
+
+
+def comando_plan(gestor, args):
+    """
+    plan: cambia la prioridad o la fecha límite de una tarea
+    """
+    tarea = gestor.obtener_tarea_por_id(args.id)
+    if tarea is None:
+        print(f"❌ No existe la tarea {args.id}", file=sys.stderr)
+        return 1
+    prioridad = tarea.prioridad if args.prioridad is None else PRIORIDADES.index(args.prioridad)
+    fecha_limite = None if args.sin_fecha else tarea.fecha_limite
+    if args.vence is not None:
+        fecha_limite = leer_fecha_limite(args.vence)
+    return 0 if gestor.planificar_tarea(args.id, prioridad, fecha_limite) else 1
+
+
+def comando_due(gestor, args):
+    """
+    due: escribe las pendientes vencidas y luego las que vencen pronto
+    """
+    ahora = int(time.time())
+    tareas = recorrer_paginas(
+        lambda tamano, despues_de: gestor.obtener_vencidas(tamano, despues_de, ahora=ahora),
+        "vencimiento", args.limite)
+    if not args.vencidas:
+        proximas = recorrer_paginas(
+            lambda tamano, despues_de: gestor.obtener_proximas(args.dias, tamano, despues_de, ahora=ahora),
+            "vencimiento")
+        tareas = itertools.islice(itertools.chain(tareas, proximas), args.limite)
+    escribir_tareas(tareas, sys.stdout, args.formato)
+    return 0
+
+
+def comando_done(gestor, args):
+    """
+    done: marca tareas como completadas (o pendientes), una transacción por lote
+    """
+    cambiadas = sum(gestor.marcar_completadas(lote, not args.deshacer)
+                    for lote in leer_ids(args.ids, args.lote))
+    print(cambiadas)
+    return 0
+
+
+def comando_rm(gestor, args):
+    """
+    rm: elimina tareas por ID o todas las completadas y libera el espacio
+    """
+    if args.completadas:
+        eliminadas = gestor.eliminar_completadas()
+    elif args.ids:
+        eliminadas = sum(gestor.eliminar_tareas(lote) for lote in leer_ids(args.ids, args.lote))
+    else:
+        print("❌ Indica IDs, '-' para leerlos de stdin o --completadas", file=sys.stderr)
+        return 2
+    print(eliminadas)
+    if eliminadas and not args.sin_vacuum:
+        while gestor.liberar_espacio():
+            pass
+    return 0
+
+
+def comando_import(gestor, args):
+    """
+    import: inserta tareas JSONL/CSV de un archivo o de stdin, por lotes
+    """
+    formato = args.formato
+    if formato is None:
+        formato = "csv" if args.archivo.lower().endswith(".csv") else "jsonl"
+    
+    leidas = 0
+    
+    def contar(tareas):
+        nonlocal leidas
+        for tarea in tareas:
+            leidas += 1
+            yield tarea
+    
+    # Una tarea no válida (ValueError) llega a main(), que sale con código 2
+    entrada = abrir_entrada(args.archivo)
+    try:
+        tareas = leer_csv_de(entrada) if formato == "csv" else leer_jsonl_de(entrada)
+        insertadas = gestor.agregar_tareas_lote(contar(tareas), args.lote)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+    print(insertadas)
+    # Un error de la base de datos deja el lote sin escribir: no es un éxito
+    if insertadas != leidas:
+        print(f"❌ Solo se importaron {insertadas} de {leidas} tareas", file=sys.stderr)
+        return 1
+    return 0
+
+
+def comando_export(gestor, args):
+    """
+    export: escribe todas las tareas, de la más antigua a la más reciente
+    """
+    if args.salida == "-":
+        escribir_tareas(recorrer_tareas(gestor, args.filtro, "antiguas"), sys.stdout, args.formato)
+    else:
+        with open(args.salida, "w", newline='', encoding='utf-8') as salida:
+            escritas = escribir_tareas(recorrer_tareas(gestor, args.filtro, "antiguas"), salida, args.formato)
+        print(escritas)
+    return 0
+
+
+def comando_archive(gestor, args):
+    """
+    archive: mueve al archivo las completadas antiguas, lote a lote
+    """
+    archivadas = 0
+    while True:
+        movidas = gestor.archivar_completadas(args.dias, args.lote)
+        if not movidas:
+            break
+        archivadas += movidas
+    print(archivadas)
+    if archivadas and not args.sin_vacuum:
+        while gestor.liberar_espacio():
+            pass
+    return 0
+
+
+def comando_vacuum(gestor, args):
+    """
+    vacuum: activa el vacuum incremental (VACUUM completo, una sola vez) y
+    devuelve al disco las páginas libres; imprime cuántas se liberaron
+    """
+    if not gestor.activar_vacuum_incremental():
+        print("❌ No se pudo activar el vacuum incremental", file=sys.stderr)
+        return 1
+    liberadas = 0
+    while True:
+        tanda = gestor.liberar_espacio()
+        if not tanda:
+            break
+        liberadas += tanda
+    print(liberadas)
+    return 0
+
+
+def comando_backup(gestor, args):
+    """
+    backup: copia la base de datos en caliente e imprime la ruta del respaldo;
+    el avance se muestra en stderr si es una terminal
+    """
+    progreso = None
+    if sys.stderr.isatty():
+        def progreso(copiadas, total):
+            print(f"\r💾 {copiadas * 100 // max(total, 1)} %", end="", file=sys.stderr, flush=True)
+    
+    try:
+        ruta = gestor.respaldar(args.destino, args.conservar, progreso, args.paginas).result()
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ No se pudo respaldar: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if progreso is not None:
+            print(file=sys.stderr)
+    print(ruta)
+    return 0
+
+
+def comando_stats(gestor, args):
+    """
+    stats: imprime los contadores de tareas en JSON
+    """
+    estadisticas = gestor.obtener_estadisticas()
+    if args.verificar:
+        estadisticas['verificadas'] = gestor.verificar_estadisticas()
+    print(json.dumps(estadisticas, ensure_ascii=False))
+    return 0
+
+
+def comando_sync(gestor, args):
+    """
+    sync: envía y recibe los cambios desde la última sincronización
+    """
+    # http y urllib solo hacen falta aquí; importarlos arriba retrasaría el resto
+    from sincronizacion import SincronizadorTareas
+    resultado = SincronizadorTareas(gestor, args.url, args.lote).sincronizar()
+    if resultado is None:
+        print("❌ No se pudo sincronizar", file=sys.stderr)
+        return 1
+    print(json.dumps(resultado, ensure_ascii=False))
+    return 0
+
+
+def crear_parser():
+    """
+    Construye el parser de argumentos con un subcomando por operación
+    """
+    parser = argparse.ArgumentParser(prog="main.py tareas", description="Gestión de tareas sin interfaz gráfica")
+    parser.add_argument("--db", default=os.environ.get("TODO_DB", "tareas.db"),
+                        help="Base de datos (por defecto TODO_DB o tareas.db)")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    
+    parser_add = subparsers.add_parser("add", help="Agrega una tarea e imprime su ID")
+    parser_add.add_argument("titulo")
+    parser_add.add_argument("-d", "--descripcion", default="")
+    parser_add.add_argument("-p", "--prioridad", choices=PRIORIDADES, default="ninguna")
+    parser_add.add_argument("--vence", help="Fecha límite YYYY-MM-DD (al final del día) o 'YYYY-MM-DD HH:MM'")
+    parser_add.set_defaults(funcion=comando_add)
+    
+    parser_list = subparsers.add_parser("list", help="Lista las tareas en streaming")
+    parser_list.add_argument("--filtro", choices=list(FILTROS), default="todas")
+    parser_list.add_argument("--orden", choices=list(ORDENES), default="recientes")
+    parser_list.add_argument("--limite", type=int, help="Máximo de tareas (por defecto todas)")
+    parser_list.add_argument("--buscar", help="Texto a buscar en título y descripción")
+    parser_list.add_argument("--archivadas", action="store_true", help="Listar la base de datos de archivo")
+    parser_list.add_argument("--formato", choices=("texto", "jsonl", "csv"), default="texto")
+    parser_list.set_defaults(funcion=comando_list)
+    
+    parser_plan = subparsers.add_parser("plan", help="Cambia la prioridad o la fecha límite de una tarea")
+    parser_plan.add_argument("id", type=int)
+    parser_plan.add_argument("-p", "--prioridad", choices=PRIORIDADES)
+    parser_plan.add_argument("--vence", help="Fecha límite YYYY-MM-DD (al final del día) o 'YYYY-MM-DD HH:MM'")
+    parser_plan.add_argument("--sin-fecha", action="store_true", help="Quitar la fecha límite")
+    parser_plan.set_defaults(funcion=comando_plan)
+    
+    parser_due = subparsers.add_parser("due", help="Lista las pendientes vencidas y las que vencen pronto")
+    parser_due.add_argument("--dias", type=int, default=DIAS_PROXIMAS, help="Días por delante")
+    parser_due.add_argument("--vencidas", action="store_true", help="Solo las vencidas")
+    parser_due.add_argument("--limite", type=int, help="Máximo de tareas (por defecto todas)")
+    parser_due.add_argument("--formato", choices=("texto", "jsonl", "csv"), default="texto")
+    parser_due.set_defaults(funcion=comando_due)
+    
+    parser_done = subparsers.add_parser("done", help="Marca tareas como completadas e imprime cuántas cambiaron")
+    parser_done.add_argument("ids", nargs="+", help="IDs, o '-' para leerlos de stdin")
+    parser_done.add_argument("--deshacer", action="store_true", help="Marcarlas como pendientes")
+    parser_done.add_argument("--lote", type=int, default=5000, help="IDs por transacción")
+    parser_done.set_defaults(funcion=comando_done)
+    
+    parser_rm = subparsers.add_parser("rm", help="Elimina tareas e imprime cuántas se eliminaron")
+    parser_rm.add_argument("ids", nargs="*", help="IDs, o '-' para leerlos de stdin")
+    parser_rm.add_argument("--completadas", action="store_true", help="Eliminar todas las completadas")
+    parser_rm.add_argument("--lote", type=int, default=5000, help="IDs por transacción")
+    parser_rm.add_argument("--sin-vacuum", action="store_true", help="No devolver el espacio libre al disco")
+    parser_rm.set_defaults(funcion=comando_rm)
+    
+    parser_import = subparsers.add_parser("import", help="Importa tareas JSONL o CSV e imprime cuántas")
+    parser_import.add_argument("archivo", nargs="?", default="-", help="Archivo, o '-' para stdin")
+    parser_import.add_argument("--formato", choices=("jsonl", "csv"), help="Por defecto, según la extensión (stdin: jsonl)")
+    parser_import.add_argument("--lote", type=int, default=5000, help="Tareas por transacción")
+    parser_import.set_defaults(funcion=comando_import)
+    
+    parser_export = subparsers.add_parser("export", help="Exporta todas las tareas en JSONL o CSV")
+    parser_export.add_argument("--salida", default="-", help="Archivo, o '-' para stdout")
+    parser_export.add_argument("--formato", choices=("jsonl", "csv"), default="jsonl")
+    parser_export.add_argument("--filtro", choices=list(FILTROS), default="todas")
+    parser_export.set_defaults(funcion=comando_export)
+    
+    parser_archive = subparsers.add_parser("archive", help="Archiva las completadas antiguas e imprime cuántas")
+    parser_archive.add_argument("--dias", type=int, default=DIAS_ARCHIVO, help="Días sin cambios")
+    parser_archive.add_argument("--lote", type=int, default=1000, help="Tareas por transacción")
+    parser_archive.add_argument("--sin-vacuum", action="store_true", help="No devolver el espacio libre al disco")
+    parser_archive.set_defaults(funcion=comando_archive)
+    
+    parser_vacuum = subparsers.add_parser(
+        "vacuum", help="Activa el vacuum incremental (VACUUM completo la primera vez) e imprime las páginas liberadas")
+    parser_vacuum.set_defaults(funcion=comando_vacuum)
+    
+    parser_backup = subparsers.add_parser("backup", help="Respalda la base de datos en caliente e imprime la ruta")
+    parser_backup.add_argument("destino", nargs="?", help="Directorio de los respaldos (por defecto 'respaldos' junto a la base de datos)")
+    parser_backup.add_argument("--conservar", type=int, default=RESPALDOS_CONSERVADOS,
+                               help="Respaldos más recientes que se mantienen (0: todos)")
+    parser_backup.add_argument("--paginas", type=int, default=PAGINAS_POR_PASO_RESPALDO, help="Páginas copiadas por paso")
+    parser_backup.set_defaults(funcion=comando_backup)
+    
+    parser_stats = subparsers.add_parser("stats", help="Imprime las estadísticas en JSON")
+    parser_stats.add_argument("--verificar", action="store_true", help="Recalcularlas con COUNT(*) y repararlas")
+    parser_stats.set_defaults(funcion=comando_stats)
+    
+    parser_sync = subparsers.add_parser("sync", help="Sincroniza por deltas con un servidor e imprime el resumen en JSON")
+    parser_sync.add_argument("url", help="URL base del servidor de sincronización")
+    parser_sync.add_argument("--lote", type=int, default=500, help="Cambios por petición")
+    parser_sync.set_defaults(funcion=comando_sync)
+    
+    return parser
+
+
+def main(argumentos=None):
+    """
+    Ejecuta un comando de la CLI
+    
+    Args:
+        argumentos (list): Argumentos tras 'tareas' (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argumentos)
+    gestor = GestorTareas(args.db, tamano_cache=0)
+    try:
+        return args.funcion(gestor, args)
+    except ValueError as e:
+        # IDs que no son números, JSON mal formado...
+        print(f"❌ Entrada no válida: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo `| head`): no es un error
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    finally:
+        gestor.cerrar_conexion()
+
+
+def probar_cli():
+    """
+    Comprueba los códigos de salida de import con entradas válidas y no válidas
+    """
+    print("🧪 Probando la línea de comandos...")
+    
+    import contextlib
+    import io
+    import tempfile
+    
+    def ejecutar(argumentos, entrada=""):
+        salida, errores = io.StringIO(), io.StringIO()
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(entrada)
+        try:
+            with contextlib.redirect_stdout(salida), contextlib.redirect_stderr(errores):
+                codigo = main(argumentos)
+        finally:
+            sys.stdin = stdin
+        return codigo, salida.getvalue(), errores.getvalue()
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        base = ["--db", os.path.join(directorio, "prueba_cli.db")]
+        
+        codigo, salida, _ = ejecutar(base + ["import", "-"], '{"titulo": "a"}\n\n{"titulo": "b", "prioridad": 3}\n')
+        assert (codigo, salida) == (0, "2\n")
+        
+        # JSON mal formado, prioridad que no es un número y una línea que no es un objeto
+        for entrada, mensaje in (('{"titulo": "a"}\n{bad\n', "línea 2: JSON no válido"),
+                                 ('{"titulo": "a", "prioridad": "alta"}\n', "tarea 1: prioridad no válida: 'alta'"),
+                                 ('{"titulo": "a", "prioridad": 7}\n', "tarea 1: prioridad fuera de rango: 7"),
+                                 ('5\n', "línea 1: se esperaba un objeto JSON, no int")):
+            codigo, salida, errores = ejecutar(base + ["import", "-"], entrada)
+            assert codigo == 2 and salida == "" and mensaje in errores, (entrada, codigo, errores)
+        
+        codigo, salida, _ = ejecutar(base + ["stats"])
+        assert json.loads(salida)['total'] == 2
+    
+    print("✅ Prueba de la línea de comandos completada")
+
+
+if __name__ == "__main__":
+    # python cli.py --probar ejecuta probar_cli()
+    if sys.argv[1:] == ["--probar"]:
+        probar_cli()
+    else:
+        sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diálogos reutilizables de la App To-Do
+Cada diálogo construye sus widgets una sola vez; al volver a abrirlo solo
+cambian los textos y la tarea asociada
+"""
+
+import time
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.spinner import Spinner
+from kivy.uix.textinput import TextInput
+
+from gestor import PRIORIDADES
+
+
+class DialogoReutilizable(Popup):
+    """
+    Popup que se abre y se cierra muchas veces sin reconstruirse
+    """
+    
+    # Los benchmarks la desactivan para abrir y cerrar sin esperar frames
+    ANIMACION = True
+    
+    def __init__(self, **kwargs):
+        super().__init__(auto_dismiss=False, **kwargs)
+        self.en_uso = False
+    
+    def abrir(self):
+        self.en_uso = True
+        self.open(animation=self.ANIMACION)
+    
+    def cerrar(self, *args):
+        self.dismiss(animation=self.ANIMACION)
+    
+    def on_dismiss(self):
+        self.en_uso = False
+
+
+class DialogoMensaje(DialogoReutilizable):
+    """
+    Mensaje informativo con un botón OK
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(size_hint=(0.6, 0.3), **kwargs)
+        
+        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        self.mensaje_label = Label(
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        
+        btn_ok = Button(
+            text="OK",
+            size_hint_y=None,
+            height=40,
+            background_color=(0.2, 0.6, 0.8, 1)
+        )
+        btn_ok.bind(on_press=self.cerrar)
+        
+        popup_layout.add_widget(self.mensaje_label)
+        popup_layout.add_widget(btn_ok)
+        self.content = popup_layout
+    
+    def mostrar(self, titulo, mensaje):
+        self.title = titulo
+        self.mensaje_label.text = mensaje
+        self.abrir()
+
+
+class DialogoEditor(DialogoReutilizable):
+    """
+    Edición del título, la descripción, la prioridad y la fecha límite de una tarea
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(title="", size_hint=(0.8, 0.7), **kwargs)
+        self.tarea = None
+        self._al_guardar = None
+        
+        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        # Título del popup
+        self.titulo_popup = Label(
+            size_hint_y=None,
+            height=40,
+            color=(0.2, 0.4, 0.8, 1)
+        )
+        
+        # Campo de título
+        self.titulo_input = TextInput(
+            hint_text="Título de la tarea...",
+            size_hint_y=None,
+            height=40,
+            multiline=False
+        )
+        
+        # Campo de descripción
+        self.descripcion_input = TextInput(
+            hint_text="Descripción (opcional)...",
+            size_hint_y=None,
+            height=40,
+            multiline=False
+        )
+        
+        # Prioridad y fecha límite en una fila
+        planificacion_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=40, spacing=10)
+        
+        self.prioridad_spinner = Spinner(
+            values=[f"Prioridad {nombre}" for nombre in PRIORIDADES],
+            size_hint_x=0.4
+        )
+        
+        self.fecha_limite_input = TextInput(
+            hint_text="Fecha límite AAAA-MM-DD (opcional)...",
+            size_hint_x=0.6,
+            multiline=False
+        )
+        
+        planificacion_layout.add_widget(self.prioridad_spinner)
+        planificacion_layout.add_widget(self.fecha_limite_input)
+        
+        # Layout para botones
+        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        
+        btn_guardar = Button(
+            text="💾 Guardar",
+            background_color=(0.2, 0.8, 0.2, 1)
+        )
+        btn_guardar.bind(on_press=self._guardar)
+        
+        btn_cancelar = Button(
+            text="❌ Cancelar",
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        btn_cancelar.bind(on_press=self.cerrar)
+        
+        buttons_layout.add_widget(btn_guardar)
+        buttons_layout.add_widget(btn_cancelar)
+        
+        popup_layout.add_widget(self.titulo_popup)
+        popup_layout.add_widget(self.titulo_input)
+        popup_layout.add_widget(self.descripcion_input)
+        popup_layout.add_widget(planificacion_layout)
+        popup_layout.add_widget(buttons_layout)
+        self.content = popup_layout
+    
+    def mostrar(self, tarea, al_guardar):
+        """
+        Args:
+            tarea (Tarea): Tarea completa a editar
+            al_guardar (callable): Recibe (dialogo, tarea, titulo, descripcion,
+                prioridad, texto de la fecha límite)
+        """
+        self.tarea = tarea
+        self._al_guardar = al_guardar
+        self.titulo_popup.text = f"✏️ Editar Tarea #{tarea.id}"
+        self.titulo_input.text = tarea.titulo
+        self.descripcion_input.text = tarea.descripcion or ""
+        self.prioridad_spinner.text = self.prioridad_spinner.values[tarea.prioridad]
+        self.fecha_limite_input.text = (time.strftime('%Y-%m-%d', time.localtime(tarea.fecha_limite))
+                                        if tarea.fecha_limite is not None else "")
+        self.abrir()
+    
+    def _guardar(self, instance):
+        prioridad = self.prioridad_spinner.values.index(self.prioridad_spinner.text)
+        self._al_guardar(self, self.tarea, self.titulo_input.text.strip(), self.descripcion_input.text.strip(),
+                         prioridad, self.fecha_limite_input.text.strip())
+    
+    def on_dismiss(self):
+        super().on_dismiss()
+        # No retener la tarea ni el callback mientras el diálogo espera en el pool
+        self.tarea = self._al_guardar = None
+
+
+class DialogoConfirmacion(DialogoReutilizable):
+    """
+    Confirmación antes de eliminar una o varias tareas
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(title="⚠️ Confirmar Eliminación", size_hint=(0.7, 0.4), **kwargs)
+        self._al_confirmar = None
+        
+        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        
+        self.mensaje_label = Label(
+            text_size=(None, None),
+            halign='center',
+            valign='middle'
+        )
+        
+        buttons_layout = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        
+        btn_confirmar = Button(
+            text="🗑️ Eliminar",
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        btn_confirmar.bind(on_press=self._confirmar)
+        
+        btn_cancelar = Button(
+            text="❌ Cancelar",
+            background_color=(0.6, 0.6, 0.6, 1)
+        )
+        btn_cancelar.bind(on_press=self.cerrar)
+        
+        buttons_layout.add_widget(btn_confirmar)
+        buttons_layout.add_widget(btn_cancelar)
+        
+        popup_layout.add_widget(self.mensaje_label)
+        popup_layout.add_widget(buttons_layout)
+        self.content = popup_layout
+    
+    def mostrar(self, mensaje, al_confirmar):
+        """
+        Args:
+            mensaje (str): Pregunta mostrada al usuario
+            al_confirmar (callable): Recibe el propio diálogo
+        """
+        self._al_confirmar = al_confirmar
+        self.mensaje_label.text = mensaje
+        self.abrir()
+    
+    def _confirmar(self, instance):
+        self._al_confirmar(self)
+    
+    def on_dismiss(self):
+        super().on_dismiss()
+        self._al_confirmar = None
+
+
+class PoolDialogos:
+    """
+    Reutiliza los diálogos cerrados; solo crea uno nuevo si todos los de
+    esa clase están abiertos (por ejemplo, un mensaje sobre el editor)
+    """
+    
+    def __init__(self):
+        self._dialogos = {}
+        self.creados = 0
+    
+    def obtener(self, clase):
+        """
+        Devuelve un diálogo libre de la clase indicada
+        
+        Args:
+            clase (type): Subclase de DialogoReutilizable
+        
+        Returns:
+            DialogoReutilizable: Diálogo cerrado, listo para mostrar()
+        """
+        instancias = self._dialogos.setdefault(clase, [])
+        for dialogo in instancias:
+            if not dialogo.en_uso:
+                return dialogo
+        
+        dialogo = clase()
+        instancias.append(dialogo)
+        self.creados += 1
+        return dialogo
@@ -7,132 +7,820 @@ Maneja todas las operaciones CRUD de las tareas
 
 import sqlite3
 import os
+import contextlib
+import itertools
+import logging
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import time
 from datetime import datetime
 
+import migraciones
+from instrumentacion import instrumentado, metricas
+from modelos import Tarea
+
+
+registro = logging.getLogger(__name__)
+
+
+# PRAGMAs aplicados una sola vez al abrir cada conexión
+PRAGMAS_CONEXION = (
+    "PRAGMA auto_vacuum = INCREMENTAL", # solo surte efecto antes de crear la primera tabla
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",       # ~20 MB de caché de páginas
+    "PRAGMA mmap_size = 268435456",     # 256 MB mapeados en memoria
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Coincidencias recientes que se puntúan por relevancia en cada búsqueda
+CANDIDATOS_BUSQUEDA = 1000
+
+# Caracteres de la descripción que se leen para las filas de la lista
+LONGITUD_VISTA_PREVIA = 80
+
+# Condición SQL de cada filtro de la lista; cada una tiene su índice parcial
+FILTROS = {
+    "todas": "",
+    "pendientes": "completada = 0",
+    "completadas": "completada = 1",
+}
+
+# Columnas de la clave, dirección y comparación del cursor de cada orden
+# de la lista. La clave termina en id para que sea única; cada orden tiene
+# índices compuestos con esas mismas columnas (ver migraciones.py).
+ORDENES = {
+    "recientes": (("fecha_creacion", "id"), "DESC", "<"),
+    "antiguas": (("fecha_creacion", "id"), "ASC", ">"),
+    "prioridad": (("prioridad", "fecha_creacion", "id"), "DESC", "<"),
+    "vencimiento": ((migraciones.CLAVE_FECHA_LIMITE, "id"), "ASC", ">"),
+}
+
+# Órdenes disponibles en el archivo (solo tiene índice por fecha de creación)
+ORDENES_ARCHIVO = ("recientes", "antiguas")
+
+# Nombre de cada prioridad; el valor guardado es su posición
+PRIORIDADES = ("ninguna", "baja", "media", "alta")
+
+# Días por delante que abarcan las tareas próximas a vencer
+DIAS_PROXIMAS = 7
+
+# Segundos que una sentencia espera a que otro proceso suelte el bloqueo
+# de escritura, y reintentos de la transacción entera si aun así no lo consigue
+ESPERA_BLOQUEO = 5.0
+REINTENTOS_BLOQUEO = 3
+ESPERA_REINTENTO = 0.1
+
+# Cambios externos que se aplican uno a uno; con más conviene recargar la lista
+LIMITE_CAMBIOS = 500
+
+# Páginas libres a partir de las que liberar_espacio() devuelve espacio al disco
+MINIMO_PAGINAS_LIBRES = 256
+
+# Páginas liberadas como mucho en cada llamada a liberar_espacio(); las tandas
+# cortas dejan pasar entre medias las consultas de la interfaz
+PAGINAS_POR_TANDA = 2000
+
+# Valor de PRAGMA auto_vacuum en las bases de datos con vacuum incremental
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Días sin cambios tras los que una tarea completada pasa al archivo
+DIAS_ARCHIVO = 30
+
+# Tareas movidas al archivo por transacción
+LOTE_ARCHIVO = 1000
+
+# Respaldos en caliente: páginas copiadas en cada paso de la API de backup
+# (256 páginas de 4 KB = 1 MB), pausa entre pasos y respaldos conservados
+PAGINAS_POR_PASO_RESPALDO = 256
+PAUSA_RESPALDO = 0.005
+RESPALDOS_CONSERVADOS = 5
+
+# Directorio de los respaldos por defecto, junto a la base de datos
+DIRECTORIO_RESPALDOS = "respaldos"
+
+# Columnas de las consultas de lista: la descripción llega truncada
+COLUMNAS_COMPLETAS = "id, titulo, descripcion, completada, fecha_creacion, fecha_actualizacion, prioridad, fecha_limite"
+COLUMNAS_VISTA_PREVIA = (f"id, titulo, substr(descripcion, 1, {LONGITUD_VISTA_PREVIA}), completada, "
+                         "fecha_creacion, fecha_actualizacion, prioridad, fecha_limite")
+
+
+def clave_orden(tarea, orden="recientes"):
+    """
+    Devuelve la clave de la tarea en un orden de la lista, la misma que
+    comparan las consultas: sirve de cursor (despues_de) para la página
+    siguiente y para colocar la tarea en una lista ya cargada
+    
+    Args:
+        tarea (Tarea): Tarea de la lista
+        orden (str): Clave de ORDENES
+    
+    Returns:
+        tuple: Valores de las columnas de la clave del orden
+    """
+    if orden == "vencimiento":
+        fecha_limite = tarea.fecha_limite
+        return (migraciones.SIN_FECHA_LIMITE if fecha_limite is None else fecha_limite, tarea.id)
+    if orden == "prioridad":
+        return (tarea.prioridad, tarea.fecha_creacion, tarea.id)
+    return (tarea.fecha_creacion, tarea.id)
+
+
+def nombre_respaldo(origen, marca):
+    """
+    Nombre del respaldo de una base de datos: tareas.db -> tareas-<marca>.db
+    
+    Args:
+        origen (str): Ruta de la base de datos respaldada
+        marca (str): Fecha y hora del respaldo (AAAAMMDD-HHMMSS-microsegundos)
+    """
+    base, extension = os.path.splitext(os.path.basename(origen))
+    return f"{base}-{marca}{extension}"
+
+
+def patron_respaldo(origen):
+    """
+    Expresión regular de los respaldos de una base de datos (y sus .tmp);
+    el grupo 1 es la marca, que se ordena como la fecha
+    """
+    base, extension = os.path.splitext(os.path.basename(origen))
+    return re.compile(re.escape(base) + r"-(\d{8}-\d{6}-\d{6})" + re.escape(extension) + r"(?:\.tmp)?$")
+
+
+def leer_fecha_limite(texto):
+    """
+    Convierte la fecha límite escrita por el usuario en segundos desde epoch
+    
+    Args:
+        texto (str): 'YYYY-MM-DD' (vence al terminar ese día, hora local),
+            'YYYY-MM-DD HH:MM' o vacío para no tener fecha límite
+    
+    Returns:
+        int: Segundos desde epoch, o None si no hay fecha
+    
+    Raises:
+        ValueError: Si el texto no es una fecha válida
+    """
+    texto = (texto or "").strip()
+    if not texto:
+        return None
+    fecha = datetime.fromisoformat(texto)
+    if len(texto) == 10:
+        fecha = fecha.replace(hour=23, minute=59, second=59)
+    return int(fecha.timestamp())
+
 
 class GestorTareas:
     """
     Clase para gestionar las tareas en la base de datos SQLite
     """
     
-    def __init__(self, nombre_db="tareas.db"):
+    def __init__(self, nombre_db="tareas.db", tamano_cache=1000, inicializar=True, nombre_archivo=None):
         """
         Inicializa el gestor de base de datos
         
         Args:
             nombre_db (str): Nombre del archivo de base de datos
+            tamano_cache (int): Número máximo de tareas en la caché por ID
+            inicializar (bool): Si es False no se abre la base de datos aquí;
+                quien lo crea debe llamar a inicializar_db() antes de usarlo
+                (la interfaz lo hace en el hilo de la base de datos)
+            nombre_archivo (str): Base de datos de las tareas archivadas; por
+                defecto la de nombre_db con el sufijo _archivo (tareas_archivo.db)
         """
         self.nombre_db = nombre_db
-        self.inicializar_db()
+        if nombre_archivo is None:
+            base, extension = os.path.splitext(nombre_db)
+            nombre_archivo = f"{base}_archivo{extension or '.db'}"
+        self.nombre_archivo = nombre_archivo
+        # Una conexión persistente por hilo (sqlite3 no comparte conexiones entre hilos)
+        self._local = threading.local()
+        self._conexiones = []
+        self._candado_conexiones = threading.Lock()
+        # Estados de completada pendientes de escribir (write-behind): id -> 0/1
+        self._completadas_pendientes = {}
+        self._candado_pendientes = threading.Lock()
+        # Caché LRU de filas por ID; se invalida en cada escritura
+        self.tamano_cache = tamano_cache
+        self._cache = OrderedDict()
+        self._candado_cache = threading.Lock()
+        self._generacion_cache = 0
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+        # Un solo respaldo a la vez
+        self._candado_respaldo = threading.Lock()
+        # liberar_espacio() avisa una sola vez de que falta el vacuum incremental
+        self._aviso_vacuum = False
+        if inicializar:
+            self.inicializar_db()
+    
+    def _obtener_conexion(self):
+        """
+        Devuelve la conexión del hilo actual, abriéndola la primera vez
+        
+        Returns:
+            sqlite3.Connection: Conexión configurada con WAL y caché ampliada
+        """
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            # check_same_thread=False solo para poder cerrarla desde cerrar_conexion()
+            conexion = sqlite3.connect(self.nombre_db, timeout=ESPERA_BLOQUEO, check_same_thread=False,
+                                       factory=metricas.fabrica_conexion())
+            for pragma in PRAGMAS_CONEXION:
+                conexion.execute(pragma)
+            self._local.conexion = conexion
+            with self._candado_conexiones:
+                self._conexiones.append(conexion)
+        return conexion
+    
+    def _adjuntar_archivo(self, conexion):
+        """
+        Adjunta la base de datos de archivo a la conexión del hilo como
+        'archivo', creándola si hace falta. Solo se hace al usar el archivo:
+        la lista y el arranque no abren un segundo fichero.
+        """
+        if getattr(self._local, "archivo_adjunto", False):
+            return
+        conexion.execute("ATTACH DATABASE ? AS archivo", (self.nombre_archivo,))
+        with conexion:
+            for sql in migraciones.ESQUEMA_ARCHIVO:
+                conexion.execute(sql)
+            migraciones.completar_archivo(conexion)
+        self._local.archivo_adjunto = True
+    
+    def _escribir(self, sql, parametros=(), varias=False):
+        """
+        Ejecuta una escritura en su propia transacción (ver _en_transaccion)
+        
+        Args:
+            sql (str): Sentencia INSERT, UPDATE o DELETE
+            parametros: Parámetros de la sentencia, o lista de ellos si varias=True
+            varias (bool): Ejecutar con executemany
+        
+        Returns:
+            sqlite3.Cursor: Cursor de la sentencia (rowcount, lastrowid)
+        """
+        if varias:
+            return self._en_transaccion(lambda conexion: conexion.executemany(sql, parametros))
+        return self._en_transaccion(lambda conexion: conexion.execute(sql, parametros))
+    
+    def _en_transaccion(self, operacion):
+        """
+        Ejecuta operacion(conexion) en una transacción; si otro proceso
+        mantiene la base de datos bloqueada más de ESPERA_BLOQUEO segundos,
+        repite la transacción entera con esperas crecientes
+        
+        Args:
+            operacion (callable): Recibe la conexión; puede ejecutar varias
+                sentencias y se repite entera en cada reintento
+        
+        Returns:
+            Lo que devuelva operacion
+        """
+        conexion = self._obtener_conexion()
+        for intento in itertools.count(1):
+            try:
+                with conexion:
+                    return operacion(conexion)
+            except sqlite3.OperationalError as e:
+                # "database is locked" (SQLITE_BUSY) o "database table is locked"
+                if intento > REINTENTOS_BLOQUEO or "locked" not in str(e):
+                    raise
+                registro.warning("⏳ Base de datos bloqueada por otro proceso; reintento %s de %s",
+                                 intento, REINTENTOS_BLOQUEO)
+                time.sleep(ESPERA_REINTENTO * 2 ** (intento - 1))
+    
+    def _guardar_en_cache(self, tareas, generacion):
+        """
+        Guarda filas leídas en la caché, salvo que alguna escritura haya
+        invalidado la caché mientras se leían (generacion distinta)
+        """
+        with self._candado_cache:
+            if generacion != self._generacion_cache or self.tamano_cache <= 0:
+                return
+            # De un lote grande solo caben las últimas tamano_cache filas
+            for tarea in tareas[-self.tamano_cache:]:
+                self._cache[tarea.id] = tarea
+                self._cache.move_to_end(tarea.id)
+            while len(self._cache) > self.tamano_cache:
+                self._cache.popitem(last=False)
+    
+    def _invalidar_cache(self, *tareas_ids, todas=False):
+        """
+        Elimina tareas de la caché tras escribirlas; con todas=True la vacía
+        entera (escrituras que no conocen los IDs afectados)
+        """
+        with self._candado_cache:
+            self._generacion_cache += 1
+            if todas:
+                self._cache.clear()
+            for tarea_id in tareas_ids:
+                self._cache.pop(tarea_id, None)
+    
+    def estadisticas_cache(self):
+        """
+        Obtiene los contadores de la caché de tareas
+        
+        Returns:
+            dict: Aciertos, fallos, tamaño actual y máximo
+        """
+        return {
+            'aciertos': self.aciertos_cache,
+            'fallos': self.fallos_cache,
+            'tamano': len(self._cache),
+            'maximo': self.tamano_cache
+        }
     
     def inicializar_db(self):
         """
-        Crea la tabla de tareas si no existe
+        Crea o actualiza el esquema aplicando las migraciones pendientes
         """
         try:
-            with sqlite3.connect(self.nombre_db) as conexion:
-                cursor = conexion.cursor()
-                
-                # Crear tabla de tareas
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS tareas (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        titulo TEXT NOT NULL,
-                        descripcion TEXT,
-                        completada INTEGER DEFAULT 0,
-                        fecha_creacion TEXT NOT NULL,
-                        fecha_actualizacion TEXT
-                    )
-                ''')
-                
-                conexion.commit()
-                print("✅ Base de datos inicializada correctamente")
-                
+            conexion = self._obtener_conexion()
+            # Caso habitual: esquema al día, basta con leer user_version
+            if migraciones.version_esquema(conexion) == migraciones.VERSION_ACTUAL:
+                return
+            aplicadas = migraciones.migrar(conexion)
+            for migracion in aplicadas:
+                registro.info("🔧 Migración aplicada: %s", migracion)
+            registro.debug("✅ Base de datos inicializada correctamente")
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al inicializar la base de datos: {e}")
+            registro.error("❌ Error al inicializar la base de datos: %s", e)
     
-    def agregar_tarea(self, titulo, descripcion=""):
+    @instrumentado("gestor.agregar_tarea")
+    def agregar_tarea(self, titulo, descripcion="", prioridad=0, fecha_limite=None):
         """
         Agrega una nueva tarea a la base de datos
         
         Args:
             titulo (str): Título de la tarea
             descripcion (str): Descripción de la tarea
-            
+            prioridad (int): Posición en PRIORIDADES (0 ninguna, 3 alta)
+            fecha_limite (int): Segundos desde epoch, o None
+        
         Returns:
-            bool: True si se agregó correctamente, False en caso contrario
+            int: ID de la tarea creada, o None si ocurrió un error
         """
         try:
-            fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            fecha_actual = int(time.time())
             
-            with sqlite3.connect(self.nombre_db) as conexion:
-                cursor = conexion.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO tareas (titulo, descripcion, fecha_creacion, fecha_actualizacion)
-                    VALUES (?, ?, ?, ?)
-                ''', (titulo, descripcion, fecha_actual, fecha_actual))
+            cursor = self._escribir('''
+                INSERT INTO tareas (titulo, descripcion, fecha_creacion, fecha_actualizacion, prioridad, fecha_limite, uuid)
+                VALUES (?, ?, ?, ?, ?, ?, lower(hex(randomblob(16))))
+            ''', (titulo, descripcion, fecha_actual, fecha_actual, prioridad, fecha_limite))
+            
+            registro.debug("✅ Tarea '%s' agregada correctamente", titulo)
+            return cursor.lastrowid
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al agregar tarea: %s", e)
+            return None
+    
+    @instrumentado("gestor.agregar_tareas_lote")
+    def agregar_tareas_lote(self, tareas, tamano_lote=5000, progreso=None):
+        """
+        Agrega muchas tareas usando executemany, una transacción por lote
+        
+        Args:
+            tareas (iterable): Tareas como diccionarios con las claves 'titulo',
+                'descripcion', 'completada', 'prioridad' y 'fecha_limite'
+                (opcionales salvo el título), o como tuplas (titulo, descripcion).
+                Se consume de forma perezosa.
+            tamano_lote (int): Número de tareas escritas por transacción
+            progreso (callable): Función opcional que recibe el total de tareas
+                insertadas tras cada lote
+        
+        Returns:
+            int: Número de tareas insertadas
+        
+        Raises:
+            ValueError: Si una tarea no es válida; indica su posición en la
+                entrada y los lotes anteriores ya quedan escritos
+        """
+        fecha_actual = int(time.time())
+        
+        def convertir():
+            for numero, tarea in enumerate(tareas, 1):
+                try:
+                    yield self._fila_para_insertar(tarea, fecha_actual)
+                except ValueError as e:
+                    raise ValueError(f"tarea {numero}: {e}") from None
+        
+        filas = convertir()
+        insertadas = 0
+        
+        def insertar(conexion):
+            # Los triggers AFTER INSERT fila a fila (texto completo, registro de
+            # cambios y estadísticas) no se disparan mientras carga_masiva tiene
+            # su fila; una sentencia por trigger cubre todo el lote y la
+            # importación es ~2.5 veces más rápida. BEGIN IMMEDIATE: ningún
+            # otro proceso inserta entre la lectura de MAX(id) y el lote.
+            conexion.execute("BEGIN IMMEDIATE")
+            ultimo_id = conexion.execute("SELECT COALESCE(MAX(id), 0) FROM tareas").fetchone()[0]
+            conexion.execute("INSERT INTO carga_masiva (id) VALUES (1)")
+            
+            conexion.executemany('''
+                INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion,
+                                    prioridad, fecha_limite, uuid)
+                VALUES (?, ?, ?, ?, ?, ?, ?, lower(hex(randomblob(16))))
+            ''', lote)
+            
+            for sql in migraciones.EQUIVALENTES_INSERCION_MASIVA.values():
+                conexion.execute(sql, (ultimo_id,))
+            conexion.execute("DELETE FROM carga_masiva")
+        
+        try:
+            while True:
+                lote = list(itertools.islice(filas, tamano_lote))
+                if not lote:
+                    break
                 
-                conexion.commit()
-                print(f"✅ Tarea '{titulo}' agregada correctamente")
-                return True
+                self._en_transaccion(insertar)
                 
+                insertadas += len(lote)
+                if progreso:
+                    progreso(insertadas)
+            
+            registro.info("✅ %s tareas agregadas en lote", insertadas)
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al agregar tarea: {e}")
-            return False
+            registro.error("❌ Error al agregar tareas en lote tras %s tareas: %s", insertadas, e)
+        except ValueError as e:
+            if insertadas:
+                raise ValueError(f"{e} (ya se agregaron {insertadas} tareas)") from None
+            raise
+        
+        return insertadas
+    
+    @staticmethod
+    def _fila_para_insertar(tarea, fecha_actual):
+        """
+        Convierte una tarea de entrada en la tupla de parámetros del INSERT
+        """
+        if isinstance(tarea, dict):
+            titulo = tarea.get('titulo')
+            descripcion = tarea.get('descripcion') or ""
+            completada = tarea.get('completada')
+            fecha_creacion = GestorTareas._fecha_a_epoch(tarea.get('fecha_creacion')) or fecha_actual
+            try:
+                prioridad = int(tarea.get('prioridad') or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f"prioridad no válida: {tarea.get('prioridad')!r}") from None
+            fecha_limite = GestorTareas._fecha_a_epoch(tarea.get('fecha_limite'))
+        elif isinstance(tarea, (tuple, list)):
+            titulo, descripcion = (tuple(tarea) + ("",))[:2]
+            completada, fecha_creacion = False, fecha_actual
+            prioridad, fecha_limite = 0, None
+        else:
+            raise ValueError(f"se esperaba un diccionario o una tupla (titulo, descripcion), no {type(tarea).__name__}")
+        
+        if not titulo:
+            raise ValueError("todas las tareas necesitan un título")
+        if not 0 <= prioridad < len(PRIORIDADES):
+            raise ValueError(f"prioridad fuera de rango: {prioridad}")
+        
+        if isinstance(completada, str):
+            completada = completada.strip().lower() in ("1", "true", "si", "sí")
+        
+        return (titulo, descripcion, 1 if completada else 0, fecha_creacion, fecha_creacion,
+                prioridad, fecha_limite)
+    
+    @staticmethod
+    def _fecha_a_epoch(fecha):
+        """
+        Convierte una fecha de entrada en segundos desde epoch
+        
+        Args:
+            fecha: Entero/float epoch, texto numérico o texto ISO
+                ('YYYY-MM-DD HH:MM:SS', hora local), o None
+        
+        Returns:
+            int: Segundos desde epoch, o None si no hay fecha
+        """
+        if fecha is None or fecha == "":
+            return None
+        if isinstance(fecha, (int, float)):
+            return int(fecha)
+        
+        fecha = str(fecha).strip()
+        if fecha.lstrip('-').isdigit():
+            return int(fecha)
+        return int(datetime.fromisoformat(fecha).timestamp())
     
+    @instrumentado("gestor.obtener_todas_tareas")
     def obtener_todas_tareas(self):
         """
         Obtiene todas las tareas de la base de datos
         
         Returns:
-            list: Lista de tuplas con los datos de las tareas
+            list: Lista de objetos Tarea
         """
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
         try:
-            with sqlite3.connect(self.nombre_db) as conexion:
+            conexion = self._obtener_conexion()
+            with conexion:
                 cursor = conexion.cursor()
+                cursor.row_factory = Tarea.desde_fila
                 
-                cursor.execute('''
-                    SELECT id, titulo, descripcion, completada, fecha_creacion, fecha_actualizacion
+                cursor.execute(f'''
+                    SELECT {COLUMNAS_COMPLETAS}
                     FROM tareas
-                    ORDER BY fecha_creacion DESC
+                    ORDER BY fecha_creacion DESC, id DESC
                 ''')
                 
                 tareas = cursor.fetchall()
                 return tareas
-                
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener tareas: %s", e)
+            return []
+    
+    @instrumentado("gestor.obtener_tareas_pagina")
+    def obtener_tareas_pagina(self, limite=50, despues_de=None, completas=False,
+                              filtro="todas", orden="recientes"):
+        """
+        Obtiene una página de tareas con paginación por cursor (keyset)
+        
+        Args:
+            limite (int): Número máximo de tareas a devolver
+            despues_de (tuple): Clave de la última tarea de la página anterior
+                (ver clave_orden), o None para la primera página
+            completas (bool): Si es False, solo se lee una vista previa de la
+                descripción, suficiente para mostrar la lista
+            filtro (str): 'todas', 'pendientes' o 'completadas'
+            orden (str): 'recientes' o 'antiguas' (por fecha de creación),
+                'prioridad' (de alta a ninguna, recientes primero) o
+                'vencimiento' (fecha límite más cercana primero, sin fecha al final)
+        
+        Returns:
+            list: Lista de objetos Tarea
+        """
+        if filtro not in FILTROS or orden not in ORDENES:
+            raise ValueError(f"filtro u orden desconocido: {filtro!r}, {orden!r}")
+        condiciones = [FILTROS[filtro]] if FILTROS[filtro] else []
+        
+        try:
+            return self._leer_pagina(condiciones, (), orden, despues_de, limite, completas)
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener tareas: %s", e)
+            return []
+    
+    @instrumentado("gestor.obtener_vencidas")
+    def obtener_vencidas(self, limite=50, despues_de=None, ahora=None):
+        """
+        Obtiene una página de tareas pendientes cuya fecha límite ya pasó,
+        de la más atrasada a la más reciente (índice idx_tareas_pendientes_fecha_limite)
+        
+        Args:
+            limite (int): Número máximo de tareas a devolver
+            despues_de (tuple): Clave (fecha límite, id) de la última tarea
+                de la página anterior, o None para la primera página
+            ahora (int): Segundos desde epoch; por defecto, el momento actual
+        
+        Returns:
+            list: Lista de objetos Tarea con la vista previa de la descripción
+        """
+        ahora = int(time.time()) if ahora is None else ahora
+        try:
+            return self._leer_pagina(["completada = 0", f"{migraciones.CLAVE_FECHA_LIMITE} < ?"],
+                                     (ahora,), "vencimiento", despues_de, limite)
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener tareas vencidas: %s", e)
+            return []
+    
+    @instrumentado("gestor.obtener_proximas")
+    def obtener_proximas(self, dias=DIAS_PROXIMAS, limite=50, despues_de=None, ahora=None):
+        """
+        Obtiene una página de tareas pendientes que vencen en los próximos
+        `dias` días, la más cercana primero (mismo índice que las vencidas)
+        
+        Args:
+            dias (int): Días por delante desde ahora
+            limite (int): Número máximo de tareas a devolver
+            despues_de (tuple): Clave (fecha límite, id) de la última tarea
+                de la página anterior, o None para la primera página
+            ahora (int): Segundos desde epoch; por defecto, el momento actual
+        
+        Returns:
+            list: Lista de objetos Tarea con la vista previa de la descripción
+        """
+        ahora = int(time.time()) if ahora is None else ahora
+        clave = migraciones.CLAVE_FECHA_LIMITE
+        try:
+            return self._leer_pagina(["completada = 0", f"{clave} >= ?", f"{clave} < ?"],
+                                     (ahora, ahora + dias * 86400), "vencimiento", despues_de, limite)
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener tareas próximas: %s", e)
+            return []
+    
+    def _leer_pagina(self, condiciones, parametros, orden, despues_de, limite, completas=False):
+        """
+        Lee de tareas una página por cursor (keyset) en uno de los ORDENES
+        
+        SQLite solo usa la primera columna del índice para un rango
+        (fecha_creacion, id) < (?, ?) y recorre todas las tareas con el
+        mismo valor (una importación entera). Por eso la página siguiente
+        es una búsqueda en el índice por cada columna de la clave, de la más
+        concreta a la más general (el resto de la fecha del cursor, luego
+        las fechas siguientes), unidas con UNION ALL. Cada búsqueda ordena
+        solo por las columnas que siguen a sus igualdades: con la expresión
+        de la fecha límite, SQLite no ve que el resto ya sale ordenado.
+        
+        Args:
+            condiciones (list): Condiciones SQL que deben cumplir las tareas
+            parametros (tuple): Parámetros de las condiciones
+            orden (str): Clave de ORDENES
+            despues_de (tuple): Clave de la última tarea leída, o None
+            limite (int): Número máximo de tareas
+            completas (bool): Leer la descripción entera
+        
+        Returns:
+            list: Lista de objetos Tarea
+        """
+        claves, direccion, comparacion = ORDENES[orden]
+        orden_sql = "ORDER BY " + ", ".join(f"{clave} {direccion}" for clave in claves)
+        
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
+        generacion = self._generacion_cache
+        cursor = self._obtener_conexion().cursor()
+        if completas:
+            columnas, cursor.row_factory = COLUMNAS_COMPLETAS, Tarea.desde_fila
+        else:
+            columnas, cursor.row_factory = COLUMNAS_VISTA_PREVIA, Tarea.vista_previa_desde_fila
+        
+        if despues_de is None:
+            donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+            cursor.execute(f'''
+                SELECT {columnas}
+                FROM tareas
+                {donde}
+                {orden_sql}
+                LIMIT ?
+            ''', (*parametros, limite))
+        else:
+            subconsultas, valores = [], []
+            for nivel in reversed(range(len(claves))):
+                terminos = [f"{clave} = ?" for clave in claves[:nivel]]
+                terminos.append(f"{claves[nivel]} {comparacion} ?")
+                orden_nivel = ", ".join(f"{clave} {direccion}" for clave in claves[nivel:])
+                subconsultas.append(f'''
+                    SELECT * FROM (
+                        SELECT {columnas} FROM tareas
+                        WHERE {' AND '.join(condiciones + terminos)}
+                        ORDER BY {orden_nivel} LIMIT ?
+                    )
+                ''')
+                valores.extend((*parametros, *despues_de[:nivel + 1], limite))
+            cursor.execute(f'''
+                SELECT * FROM ({' UNION ALL '.join(subconsultas)})
+                {orden_sql}
+                LIMIT ?
+            ''', (*valores, limite))
+        
+        tareas = cursor.fetchall()
+        self._guardar_en_cache(tareas, generacion)
+        return tareas
+    
+    def iterar_tareas(self, tamano_lote=500):
+        """
+        Recorre todas las tareas en lotes de tamaño fijo sin cargarlas en memoria
+        
+        Args:
+            tamano_lote (int): Número de tareas leídas por consulta
+        
+        Yields:
+            Tarea: Cada tarea completa, en el mismo orden que obtener_todas_tareas
+        """
+        despues_de = None
+        while True:
+            pagina = self.obtener_tareas_pagina(tamano_lote, despues_de, completas=True)
+            yield from pagina
+            
+            if len(pagina) < tamano_lote:
+                return
+            despues_de = (pagina[-1].fecha_creacion, pagina[-1].id)
+    
+    @instrumentado("gestor.buscar")
+    def buscar(self, texto, limite=50, filtro="todas"):
+        """
+        Busca tareas por título y descripción usando el índice FTS5
+        
+        Cada palabra se busca como prefijo ("estu" encuentra "Estudiar") y
+        deben aparecer todas. Se ordenan por relevancia (bm25) las coincidencias
+        más recientes que cumplen el filtro, hasta CANDIDATOS_BUSQUEDA, para
+        que una palabra muy frecuente no obligue a puntuar toda la tabla
+        (~350 ms con 200 000 coincidencias, frente a ~30 ms).
+        
+        Args:
+            texto (str): Texto a buscar
+            limite (int): Número máximo de resultados
+            filtro (str): 'todas', 'pendientes' o 'completadas'
+        
+        Returns:
+            list: Lista de objetos Tarea (con vista previa de la descripción)
+        """
+        if filtro not in FILTROS:
+            raise ValueError(f"filtro desconocido: {filtro!r}")
+        # El filtro va antes del LIMIT: las coincidencias antiguas que lo
+        # cumplen no quedan fuera por las recientes que no
+        condicion = f"AND filtradas.{FILTROS[filtro]}" if FILTROS[filtro] else ""
+        
+        palabras = re.findall(r"\w+", texto)
+        if not palabras:
+            return []
+        
+        consulta = " ".join(f'"{palabra}"*' for palabra in palabras)
+        
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            generacion = self._generacion_cache
+            conexion = self._obtener_conexion()
+            cursor = conexion.cursor()
+            cursor.row_factory = Tarea.vista_previa_desde_fila
+            
+            cursor.execute(f'''
+                SELECT t.id, t.titulo, substr(t.descripcion, 1, {LONGITUD_VISTA_PREVIA}), t.completada,
+                       t.fecha_creacion, t.fecha_actualizacion, t.prioridad, t.fecha_limite
+                FROM (
+                    SELECT tareas_fts.rowid, tareas_fts.rank FROM tareas_fts
+                    JOIN tareas AS filtradas ON filtradas.id = tareas_fts.rowid
+                    WHERE tareas_fts MATCH ? {condicion}
+                    ORDER BY tareas_fts.rowid DESC
+                    LIMIT ?
+                ) AS candidatas
+                JOIN tareas AS t ON t.id = candidatas.rowid
+                ORDER BY candidatas.rank
+                LIMIT ?
+            ''', (consulta, CANDIDATOS_BUSQUEDA, limite))
+            
+            tareas = cursor.fetchall()
+            self._guardar_en_cache(tareas, generacion)
+            return tareas
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al obtener tareas: {e}")
+            registro.error("❌ Error al buscar tareas: %s", e)
             return []
     
-    def obtener_tarea_por_id(self, tarea_id):
+    @instrumentado("gestor.obtener_tarea_por_id")
+    def obtener_tarea_por_id(self, tarea_id, completa=True):
         """
         Obtiene una tarea específica por su ID
         
         Args:
             tarea_id (int): ID de la tarea
-            
+            completa (bool): Si es False, sirve también una tarea de la caché
+                que solo tenga la vista previa de la descripción
+        
         Returns:
-            tuple: Datos de la tarea o None si no existe
+            Tarea: Datos de la tarea o None si no existe
         """
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
+        with self._candado_cache:
+            tarea = self._cache.get(tarea_id)
+            if tarea is not None and (tarea.completa or not completa):
+                self._cache.move_to_end(tarea_id)
+                self.aciertos_cache += 1
+                return tarea
+            self.fallos_cache += 1
+            generacion = self._generacion_cache
+        
         try:
-            with sqlite3.connect(self.nombre_db) as conexion:
+            conexion = self._obtener_conexion()
+            with conexion:
                 cursor = conexion.cursor()
+                cursor.row_factory = Tarea.desde_fila
                 
-                cursor.execute('''
-                    SELECT id, titulo, descripcion, completada, fecha_creacion, fecha_actualizacion
+                cursor.execute(f'''
+                    SELECT {COLUMNAS_COMPLETAS}
                     FROM tareas
                     WHERE id = ?
                 ''', (tarea_id,))
                 
                 tarea = cursor.fetchone()
+                if tarea is not None:
+                    self._guardar_en_cache([tarea], generacion)
                 return tarea
-                
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al obtener tarea: {e}")
+            registro.error("❌ Error al obtener tarea: %s", e)
             return None
     
-    def actualizar_tarea(self, tarea_id, titulo, descripcion="", completada=False):
+    @instrumentado("gestor.actualizar_tarea")
+    def actualizar_tarea(self, tarea_id, titulo, descripcion="", completada=False, planificacion=None):
         """
         Actualiza una tarea existente
         
@@ -141,100 +829,314 @@ class GestorTareas:
             titulo (str): Nuevo título
             descripcion (str): Nueva descripción
             completada (bool): Estado de completada
-            
+            planificacion (tuple): (prioridad, fecha_limite) a guardar en la
+                misma escritura (ver planificar_tarea); None las conserva
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
+        if planificacion is not None and not 0 <= planificacion[0] < len(PRIORIDADES):
+            registro.error("❌ Prioridad fuera de rango: %s", planificacion[0])
+            return False
+        
+        # Respetar el orden con los cambios diferidos anteriores
+        self.vaciar_cambios_pendientes()
+        
         try:
-            fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            fecha_actual = int(time.time())
             estado_completada = 1 if completada else 0
             
-            with sqlite3.connect(self.nombre_db) as conexion:
-                cursor = conexion.cursor()
-                
-                cursor.execute('''
+            if planificacion is None:
+                cursor = self._escribir('''
                     UPDATE tareas
                     SET titulo = ?, descripcion = ?, completada = ?, fecha_actualizacion = ?
                     WHERE id = ?
                 ''', (titulo, descripcion, estado_completada, fecha_actual, tarea_id))
-                
-                if cursor.rowcount > 0:
-                    conexion.commit()
-                    print(f"✅ Tarea ID {tarea_id} actualizada correctamente")
-                    return True
-                else:
-                    print(f"⚠️ No se encontró la tarea con ID {tarea_id}")
-                    return False
-                    
+            else:
+                # Una sola transacción: una entrada en cambios y una invalidación
+                cursor = self._escribir('''
+                    UPDATE tareas
+                    SET titulo = ?, descripcion = ?, completada = ?, prioridad = ?, fecha_limite = ?,
+                        fecha_actualizacion = ?
+                    WHERE id = ?
+                ''', (titulo, descripcion, estado_completada, *planificacion, fecha_actual, tarea_id))
+            
+            if cursor.rowcount > 0:
+                self._invalidar_cache(tarea_id)
+                registro.debug("✅ Tarea ID %s actualizada correctamente", tarea_id)
+                return True
+            else:
+                registro.warning("⚠️ No se encontró la tarea con ID %s", tarea_id)
+                return False
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al actualizar tarea: {e}")
+            registro.error("❌ Error al actualizar tarea: %s", e)
             return False
     
-    def eliminar_tarea(self, tarea_id):
+    @instrumentado("gestor.planificar_tarea")
+    def planificar_tarea(self, tarea_id, prioridad=0, fecha_limite=None):
         """
-        Elimina una tarea de la base de datos
+        Cambia la prioridad y la fecha límite de una tarea
         
         Args:
-            tarea_id (int): ID de la tarea a eliminar
-            
+            tarea_id (int): ID de la tarea
+            prioridad (int): Posición en PRIORIDADES (0 ninguna, 3 alta)
+            fecha_limite (int): Segundos desde epoch, o None para quitarla
+        
         Returns:
-            bool: True si se eliminó correctamente, False en caso contrario
+            bool: True si se actualizó correctamente, False en caso contrario
         """
+        if not 0 <= prioridad < len(PRIORIDADES):
+            registro.error("❌ Prioridad fuera de rango: %s", prioridad)
+            return False
+        
         try:
-            with sqlite3.connect(self.nombre_db) as conexion:
-                cursor = conexion.cursor()
-                
-                cursor.execute('DELETE FROM tareas WHERE id = ?', (tarea_id,))
-                
-                if cursor.rowcount > 0:
-                    conexion.commit()
-                    print(f"✅ Tarea ID {tarea_id} eliminada correctamente")
-                    return True
-                else:
-                    print(f"⚠️ No se encontró la tarea con ID {tarea_id}")
-                    return False
-                    
+            cursor = self._escribir('''
+                UPDATE tareas
+                SET prioridad = ?, fecha_limite = ?, fecha_actualizacion = ?
+                WHERE id = ?
+            ''', (prioridad, fecha_limite, int(time.time()), tarea_id))
+            
+            if cursor.rowcount > 0:
+                self._invalidar_cache(tarea_id)
+                registro.debug("✅ Tarea ID %s planificada: prioridad %s", tarea_id, PRIORIDADES[prioridad])
+                return True
+            else:
+                registro.warning("⚠️ No se encontró la tarea con ID %s", tarea_id)
+                return False
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al eliminar tarea: {e}")
+            registro.error("❌ Error al planificar tarea: %s", e)
             return False
     
-    def marcar_completada(self, tarea_id, completada=True):
+    @instrumentado("gestor.eliminar_tarea")
+    def eliminar_tarea(self, tarea_id):
         """
-        Marca una tarea como completada o no completada
+        Elimina una tarea de la base de datos
         
         Args:
-            tarea_id (int): ID de la tarea
-            completada (bool): True para marcar como completada, False para desmarcar
-            
+            tarea_id (int): ID de la tarea a eliminar
+        
+        Returns:
+            bool: True si se eliminó correctamente, False en caso contrario
+        """
+        # Respetar el orden con los cambios diferidos anteriores
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            cursor = self._escribir('DELETE FROM tareas WHERE id = ?', (tarea_id,))
+            
+            if cursor.rowcount > 0:
+                self._invalidar_cache(tarea_id)
+                registro.debug("✅ Tarea ID %s eliminada correctamente", tarea_id)
+                return True
+            else:
+                registro.warning("⚠️ No se encontró la tarea con ID %s", tarea_id)
+                return False
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al eliminar tarea: %s", e)
+            return False
+    
+    @instrumentado("gestor.eliminar_tareas")
+    def eliminar_tareas(self, tareas_ids):
+        """
+        Elimina varias tareas en una sola transacción
+        
+        Args:
+            tareas_ids (iterable): IDs de las tareas a eliminar
+        
+        Returns:
+            int: Número de tareas eliminadas
+        """
+        tareas_ids = list(dict.fromkeys(tareas_ids))
+        if not tareas_ids:
+            return 0
+        
+        # Respetar el orden con los cambios diferidos anteriores
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            cursor = self._escribir('DELETE FROM tareas WHERE id = ?',
+                                    [(tarea_id,) for tarea_id in tareas_ids], varias=True)
+            
+            self._invalidar_cache(*tareas_ids)
+            registro.debug("✅ %s tareas eliminadas", cursor.rowcount)
+            return cursor.rowcount
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al eliminar tareas: %s", e)
+            return 0
+    
+    @instrumentado("gestor.eliminar_completadas")
+    def eliminar_completadas(self):
+        """
+        Elimina todas las tareas completadas con una sola sentencia
+        (recorre el índice parcial idx_tareas_completadas)
+        
+        Returns:
+            int: Número de tareas eliminadas
+        """
+        # Las casillas marcadas justo antes también cuentan
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            cursor = self._escribir('DELETE FROM tareas WHERE completada = 1')
+            
+            self._invalidar_cache(todas=True)
+            registro.debug("✅ %s tareas completadas eliminadas", cursor.rowcount)
+            return cursor.rowcount
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al eliminar tareas completadas: %s", e)
+            return 0
+    
+    @instrumentado("gestor.marcar_completada")
+    def marcar_completada(self, tarea_id, completada=True):
+        """
+        Marca una tarea como completada o no completada
+        
+        Args:
+            tarea_id (int): ID de la tarea
+            completada (bool): True para marcar como completada, False para desmarcar
+        
         Returns:
             bool: True si se actualizó correctamente, False en caso contrario
         """
+        # Respetar el orden con los cambios diferidos anteriores
+        self.vaciar_cambios_pendientes()
+        
         try:
-            fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            fecha_actual = int(time.time())
             estado_completada = 1 if completada else 0
             
-            with sqlite3.connect(self.nombre_db) as conexion:
-                cursor = conexion.cursor()
-                
-                cursor.execute('''
-                    UPDATE tareas
-                    SET completada = ?, fecha_actualizacion = ?
-                    WHERE id = ?
-                ''', (estado_completada, fecha_actual, tarea_id))
-                
-                if cursor.rowcount > 0:
-                    conexion.commit()
-                    estado_texto = "completada" if completada else "pendiente"
-                    print(f"✅ Tarea ID {tarea_id} marcada como {estado_texto}")
-                    return True
-                else:
-                    print(f"⚠️ No se encontró la tarea con ID {tarea_id}")
-                    return False
-                    
+            cursor = self._escribir('''
+                UPDATE tareas
+                SET completada = ?, fecha_actualizacion = ?
+                WHERE id = ?
+            ''', (estado_completada, fecha_actual, tarea_id))
+            
+            if cursor.rowcount > 0:
+                self._invalidar_cache(tarea_id)
+                estado_texto = "completada" if completada else "pendiente"
+                registro.debug("✅ Tarea ID %s marcada como %s", tarea_id, estado_texto)
+                return True
+            else:
+                registro.warning("⚠️ No se encontró la tarea con ID %s", tarea_id)
+                return False
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al marcar tarea: {e}")
+            registro.error("❌ Error al marcar tarea: %s", e)
             return False
     
+    @instrumentado("gestor.marcar_completadas")
+    def marcar_completadas(self, tareas_ids, completada=True):
+        """
+        Marca varias tareas como completadas o pendientes en una sola transacción
+        
+        Args:
+            tareas_ids (iterable): IDs de las tareas
+            completada (bool): True para marcar como completadas, False para desmarcar
+        
+        Returns:
+            int: Número de tareas cuyo estado cambió
+        """
+        tareas_ids = list(dict.fromkeys(tareas_ids))
+        if not tareas_ids:
+            return 0
+        
+        # Los estados diferidos anteriores no deben pisar este cambio
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            fecha_actual = int(time.time())
+            estado_completada = 1 if completada else 0
+            
+            # Solo se tocan las filas cuyo estado cambia de verdad
+            cursor = self._escribir('''
+                UPDATE tareas
+                SET completada = ?, fecha_actualizacion = ?
+                WHERE id = ? AND completada IS NOT ?
+            ''', [(estado_completada, fecha_actual, tarea_id, estado_completada) for tarea_id in tareas_ids],
+                varias=True)
+            
+            self._invalidar_cache(*tareas_ids)
+            registro.debug("✅ %s tareas marcadas como %s", cursor.rowcount,
+                           "completadas" if completada else "pendientes")
+            return cursor.rowcount
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al marcar tareas: %s", e)
+            return 0
+    
+    def marcar_completada_diferida(self, tarea_id, completada=True):
+        """
+        Registra el nuevo estado de una tarea sin escribirlo todavía
+        
+        Los cambios repetidos sobre la misma tarea se combinan y solo se
+        escribe el último, todos juntos en vaciar_cambios_pendientes().
+        
+        Args:
+            tarea_id (int): ID de la tarea
+            completada (bool): True para marcar como completada, False para desmarcar
+        """
+        with self._candado_pendientes:
+            self._completadas_pendientes[tarea_id] = 1 if completada else 0
+    
+    def hay_cambios_pendientes(self):
+        """
+        Indica si quedan estados de completada sin escribir
+        """
+        return bool(self._completadas_pendientes)
+    
+    @instrumentado("gestor.vaciar_cambios_pendientes")
+    def vaciar_cambios_pendientes(self, descartar_si_falla=False):
+        """
+        Escribe en una sola transacción los estados registrados con
+        marcar_completada_diferida
+        
+        Args:
+            descartar_si_falla (bool): Si la escritura falla, olvidar esos
+                estados y propagar el error (quien llama vuelve a leer las
+                filas) en lugar de conservarlos para el siguiente intento
+        
+        Returns:
+            int: Número de tareas escritas
+        
+        Raises:
+            sqlite3.Error: Si la escritura falla y descartar_si_falla es True
+        """
+        if not self._completadas_pendientes:
+            return 0
+        
+        with self._candado_pendientes:
+            pendientes, self._completadas_pendientes = self._completadas_pendientes, {}
+        
+        try:
+            fecha_actual = int(time.time())
+            
+            # Solo se tocan las filas cuyo estado cambia de verdad
+            self._escribir('''
+                UPDATE tareas
+                SET completada = ?, fecha_actualizacion = ?
+                WHERE id = ? AND completada IS NOT ?
+            ''', [(estado, fecha_actual, tarea_id, estado) for tarea_id, estado in pendientes.items()],
+                varias=True)
+            
+            self._invalidar_cache(*pendientes)
+            return len(pendientes)
+        
+        except sqlite3.Error as e:
+            if descartar_si_falla:
+                raise
+            registro.error("❌ Error al escribir cambios pendientes: %s", e)
+            # Conservar los estados no escritos, salvo los que ya se hayan vuelto a cambiar
+            with self._candado_pendientes:
+                for tarea_id, estado in pendientes.items():
+                    self._completadas_pendientes.setdefault(tarea_id, estado)
+            return 0
+    
+    @instrumentado("gestor.obtener_estadisticas")
     def obtener_estadisticas(self):
         """
         Obtiene estadísticas de las tareas
@@ -242,37 +1144,682 @@ class GestorTareas:
         Returns:
             dict: Diccionario con estadísticas
         """
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
         try:
-            with sqlite3.connect(self.nombre_db) as conexion:
+            conexion = self._obtener_conexion()
+            with conexion:
                 cursor = conexion.cursor()
                 
-                # Total de tareas
-                cursor.execute('SELECT COUNT(*) FROM tareas')
-                total = cursor.fetchone()[0]
-                
-                # Tareas completadas
-                cursor.execute('SELECT COUNT(*) FROM tareas WHERE completada = 1')
-                completadas = cursor.fetchone()[0]
+                # Contadores mantenidos por triggers: lectura de una sola fila
+                cursor.execute('SELECT total, completadas FROM estadisticas_tareas WHERE id = 1')
+                fila = cursor.fetchone()
+                total, completadas = fila if fila else (0, 0)
                 
                 # Tareas pendientes
                 pendientes = total - completadas
                 
+                # Las archivadas (todas completadas) cuentan en el total; sin
+                # archivo no se crea uno solo para leer un cero
+                archivadas = 0
+                if os.path.exists(self.nombre_archivo):
+                    self._adjuntar_archivo(conexion)
+                    cursor.execute('SELECT total FROM archivo.estadisticas_archivo WHERE id = 1')
+                    fila = cursor.fetchone()
+                    archivadas = fila[0] if fila else 0
+                
                 return {
-                    'total': total,
-                    'completadas': completadas,
-                    'pendientes': pendientes
+                    'total': total + archivadas,
+                    'completadas': completadas + archivadas,
+                    'pendientes': pendientes,
+                    'archivadas': archivadas
                 }
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener estadísticas: %s", e)
+            return {'total': 0, 'completadas': 0, 'pendientes': 0, 'archivadas': 0}
+    
+    @instrumentado("gestor.verificar_estadisticas")
+    def verificar_estadisticas(self, reparar=True):
+        """
+        Recalcula las estadísticas con COUNT(*) y las compara con los contadores
+        
+        Args:
+            reparar (bool): Si es True, corrige los contadores que no coincidan
+        
+        Returns:
+            bool: True si los contadores eran correctos, False en caso contrario
+        """
+        # Las lecturas ven los cambios de estado aún no escritos
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            conexion = self._obtener_conexion()
+            with conexion:
+                cursor = conexion.cursor()
+                
+                cursor.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(completada = 1), 0) FROM tareas
+                ''')
+                total, completadas = cursor.fetchone()
+                
+                cursor.execute('SELECT total, completadas FROM estadisticas_tareas WHERE id = 1')
+                correctas = cursor.fetchone() == (total, completadas)
+                
+                if not correctas:
+                    registro.warning("⚠️ Estadísticas desincronizadas; valores reales: total=%s, completadas=%s", total, completadas)
+                    if reparar:
+                        cursor.execute('''
+                            INSERT OR REPLACE INTO estadisticas_tareas (id, total, completadas)
+                            VALUES (1, ?, ?)
+                        ''', (total, completadas))
                 
+                return correctas
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al verificar estadísticas: %s", e)
+            return False
+    
+    @instrumentado("gestor.ultimo_cambio")
+    def ultimo_cambio(self):
+        """
+        Obtiene la posición actual del registro de cambios
+        
+        Returns:
+            int: Secuencia del último cambio (0 si no hay ninguno)
+        """
+        try:
+            conexion = self._obtener_conexion()
+            # Conocer la versión actual evita tomar como externos los cambios anteriores
+            self._local.version_datos = conexion.execute('PRAGMA data_version').fetchone()[0]
+            return conexion.execute('SELECT COALESCE(MAX(secuencia), 0) FROM cambios').fetchone()[0]
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al leer el registro de cambios: %s", e)
+            return 0
+    
+    @instrumentado("gestor.comprobar_cambios_externos")
+    def comprobar_cambios_externos(self, desde, limite=LIMITE_CAMBIOS):
+        """
+        Devuelve las tareas que han cambiado desde la secuencia `desde` si
+        otra conexión (otra instancia de la app, un script) ha escrito
+        
+        PRAGMA data_version solo cambia cuando otra conexión confirma una
+        transacción: mientras nadie más escriba, la comprobación no lee
+        ninguna tabla. Los cambios propios que vengan mezclados se pueden
+        volver a aplicar sin efecto.
+        
+        Args:
+            desde (int): Última secuencia ya aplicada (ver ultimo_cambio)
+            limite (int): Máximo de cambios devueltos uno a uno
+        
+        Returns:
+            dict: None si no hay escrituras externas; si no, 'cursor' (nueva
+                secuencia), 'tareas' (vista previa de las creadas o
+                modificadas), 'eliminadas' (IDs) y 'desbordado' (True si había
+                más de `limite` cambios y conviene recargar la lista entera)
+        """
+        try:
+            conexion = self._obtener_conexion()
+            version = conexion.execute('PRAGMA data_version').fetchone()[0]
+            if version == getattr(self._local, "version_datos", None):
+                return None
+            self._local.version_datos = version
+            # Los estados aún sin escribir no deben quedar tapados por los leídos
+            self.vaciar_cambios_pendientes()
+            
+            filas = conexion.execute(f'''
+                SELECT c.secuencia, c.tarea_id, {COLUMNAS_VISTA_PREVIA}
+                FROM cambios AS c LEFT JOIN tareas ON tareas.id = c.tarea_id
+                WHERE c.secuencia > ?
+                ORDER BY c.secuencia
+                LIMIT ?
+            ''', (desde, limite + 1)).fetchall()
+            
+            if len(filas) > limite:
+                self._invalidar_cache(todas=True)
+                cursor_cambios = conexion.execute('SELECT COALESCE(MAX(secuencia), 0) FROM cambios').fetchone()[0]
+                return {'cursor': cursor_cambios, 'tareas': [], 'eliminadas': [], 'desbordado': True}
+            
+            tareas, eliminadas = [], []
+            for fila in filas:
+                if fila[2] is None:
+                    eliminadas.append(fila[1])
+                else:
+                    tareas.append(Tarea.vista_previa_desde_fila(None, fila[2:]))
+            # Otra conexión ha escrito estas filas: la caché ya no es fiable
+            self._invalidar_cache(*(fila[1] for fila in filas))
+            
+            if filas:
+                registro.debug("🔄 %s cambios externos", len(filas))
+            return {
+                'cursor': filas[-1][0] if filas else desde,
+                'tareas': tareas,
+                'eliminadas': eliminadas,
+                'desbordado': False,
+            }
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al comprobar cambios externos: %s", e)
+            return None
+    
+    @instrumentado("gestor.cambios_para_enviar")
+    def cambios_para_enviar(self, desde, limite=LIMITE_CAMBIOS):
+        """
+        Lee los cambios locales posteriores a la secuencia `desde` en el
+        formato de sincronizacion.py; los llegados del servidor se omiten.
+        Recorre solo el registro de cambios, no la tabla entera.
+        
+        Args:
+            desde (int): Última secuencia ya enviada
+            limite (int): Máximo de filas del registro leídas
+        
+        Returns:
+            tuple: (cambios, cursor) con la lista de diccionarios y la
+                secuencia hasta la que se ha leído (`desde` si no hay más)
+        """
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            conexion = self._obtener_conexion()
+            filas = conexion.execute('''
+                SELECT c.secuencia, c.eliminada, COALESCE(t.uuid, c.uuid), t.titulo, t.descripcion,
+                       t.completada, t.fecha_creacion,
+                       CASE WHEN c.eliminada THEN c.fecha
+                            ELSE COALESCE(t.fecha_actualizacion, t.fecha_creacion) END,
+                       t.prioridad, t.fecha_limite
+                FROM cambios AS c LEFT JOIN tareas AS t ON t.id = c.tarea_id
+                WHERE c.secuencia > ? AND c.remoto = 0
+                ORDER BY c.secuencia
+                LIMIT ?
+            ''', (desde, limite)).fetchall()
+            
+            cambios = []
+            for (secuencia, eliminada, uuid, titulo, descripcion, completada, fecha_creacion, fecha,
+                 prioridad, fecha_limite) in filas:
+                # Eliminaciones anteriores a la versión 6 del esquema: sin uuid no se pueden enviar
+                if uuid is None or (not eliminada and titulo is None):
+                    continue
+                if eliminada:
+                    cambios.append({'uuid': uuid, 'eliminada': 1, 'fecha_actualizacion': fecha})
+                else:
+                    cambios.append({
+                        'uuid': uuid,
+                        'eliminada': 0,
+                        'titulo': titulo,
+                        'descripcion': descripcion,
+                        'completada': completada,
+                        'fecha_creacion': fecha_creacion,
+                        'fecha_actualizacion': fecha,
+                        'prioridad': prioridad,
+                        'fecha_limite': fecha_limite,
+                    })
+            return cambios, filas[-1][0] if filas else desde
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al leer los cambios para sincronizar: %s", e)
+            return [], desde
+    
+    @instrumentado("gestor.aplicar_cambios_remotos")
+    def aplicar_cambios_remotos(self, cambios, estado=None):
+        """
+        Aplica en una sola transacción cambios recibidos del servidor, con
+        la última escritura como ganadora: cada cambio solo sustituye a la
+        versión local si su fecha_actualizacion no es anterior (tampoco
+        resucita una tarea eliminada aquí más tarde)
+        
+        Args:
+            cambios (list): Diccionarios con el formato de cambios_para_enviar
+                ('prioridad' y 'fecha_limite' son opcionales: los clientes
+                anteriores a la versión 8 del esquema no las envían)
+            estado (dict): Claves de sincronización a guardar en la misma
+                transacción (el cursor recibido), para no perderlo ni
+                adelantarlo si algo falla
+        
+        Returns:
+            int: Número de cambios aplicados, o None si ocurrió un error
+        """
+        self.vaciar_cambios_pendientes()
+        
+        def aplicar(conexion):
+            # IMMEDIATE: las lecturas de versión y las escrituras van juntas
+            conexion.execute("BEGIN IMMEDIATE")
+            inicio = conexion.execute('SELECT COALESCE(MAX(secuencia), 0) FROM cambios').fetchone()[0]
+            aplicados = 0
+            
+            for cambio in cambios:
+                fecha = cambio['fecha_actualizacion']
+                local = conexion.execute('''
+                    SELECT id, COALESCE(fecha_actualizacion, fecha_creacion) FROM tareas WHERE uuid = ?
+                ''', (cambio['uuid'],)).fetchone()
+                
+                if local is None:
+                    if cambio['eliminada']:
+                        continue
+                    eliminada_en = conexion.execute('''
+                        SELECT MAX(fecha) FROM cambios WHERE uuid = ? AND eliminada = 1
+                    ''', (cambio['uuid'],)).fetchone()[0]
+                    if eliminada_en is not None and eliminada_en > fecha:
+                        continue
+                    conexion.execute('''
+                        INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion,
+                                            prioridad, fecha_limite, uuid)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (cambio['titulo'], cambio['descripcion'], cambio['completada'],
+                          cambio['fecha_creacion'], fecha, cambio.get('prioridad', 0),
+                          cambio.get('fecha_limite'), cambio['uuid']))
+                elif fecha < local[1]:
+                    # La versión local es más reciente; se enviará en la próxima sincronización
+                    continue
+                elif cambio['eliminada']:
+                    conexion.execute('DELETE FROM tareas WHERE id = ?', (local[0],))
+                    conexion.execute('UPDATE cambios SET fecha = ? WHERE tarea_id = ?', (fecha, local[0]))
+                else:
+                    conexion.execute('''
+                        UPDATE tareas
+                        SET titulo = ?, descripcion = ?, completada = ?, fecha_actualizacion = ?,
+                            prioridad = ?, fecha_limite = ?
+                        WHERE id = ?
+                    ''', (cambio['titulo'], cambio['descripcion'], cambio['completada'], fecha,
+                          cambio.get('prioridad', 0), cambio.get('fecha_limite'), local[0]))
+                aplicados += 1
+            
+            # Los cambios que acaban de escribir los triggers no se reenvían al servidor
+            conexion.execute('UPDATE cambios SET remoto = 1 WHERE secuencia > ?', (inicio,))
+            conexion.executemany('INSERT OR REPLACE INTO sincronizacion (clave, valor) VALUES (?, ?)',
+                                 (estado or {}).items())
+            return aplicados
+        
+        try:
+            aplicados = self._en_transaccion(aplicar)
+            if aplicados:
+                self._invalidar_cache(todas=True)
+                registro.debug("🔄 %s cambios remotos aplicados de %s recibidos", aplicados, len(cambios))
+            return aplicados
+        
+        except (sqlite3.Error, KeyError) as e:
+            registro.error("❌ Error al aplicar cambios remotos: %s", e)
+            return None
+    
+    def obtener_estado_sincronizacion(self, clave, por_defecto=None):
+        """
+        Lee un valor guardado por el motor de sincronización (cursores,
+        identificador del dispositivo)
+        
+        Args:
+            clave (str): Nombre del valor
+            por_defecto: Valor devuelto si no está guardado
+        
+        Returns:
+            Valor guardado, o por_defecto
+        """
+        try:
+            fila = self._obtener_conexion().execute(
+                'SELECT valor FROM sincronizacion WHERE clave = ?', (clave,)).fetchone()
+            return fila[0] if fila else por_defecto
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al leer el estado de sincronización: %s", e)
+            return por_defecto
+    
+    def guardar_estado_sincronizacion(self, clave, valor):
+        """
+        Guarda un valor del motor de sincronización
+        
+        Args:
+            clave (str): Nombre del valor
+            valor: Entero o texto
+        
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        try:
+            self._escribir('INSERT OR REPLACE INTO sincronizacion (clave, valor) VALUES (?, ?)', (clave, valor))
+            return True
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al guardar el estado de sincronización: %s", e)
+            return False
+    
+    @instrumentado("gestor.archivar_completadas")
+    def archivar_completadas(self, dias=DIAS_ARCHIVO, tamano_lote=LOTE_ARCHIVO):
+        """
+        Mueve a la base de datos de archivo un lote de tareas completadas
+        sin cambios en los últimos `dias` días, para que la tabla tareas (y
+        sus índices) solo contenga las tareas en uso
+        
+        Cada llamada es una transacción corta; se repite mientras devuelva
+        tareas movidas. En modo WAL la transacción no es atómica entre las
+        dos bases de datos: si se interrumpe, la tarea puede quedar en ambas
+        y la siguiente llamada termina de moverla sin duplicarla.
+        
+        Con la sincronización en uso se saltan las tareas con cambios locales
+        aún no enviados: la fila del registro que los anota se sustituiría
+        por la del archivado, que no se envía, y el cambio se perdería.
+        
+        Args:
+            dias (int): Antigüedad mínima desde la última actualización
+            tamano_lote (int): Máximo de tareas movidas en esta llamada
+        
+        Returns:
+            int: Tareas movidas al archivo
+        """
+        self.vaciar_cambios_pendientes()
+        limite_fecha = int(time.time()) - dias * 86400
+        
+        def mover(conexion):
+            conexion.execute("BEGIN IMMEDIATE")
+            inicio = conexion.execute('SELECT COALESCE(MAX(secuencia), 0) FROM cambios').fetchone()[0]
+            # Sin cursor de envío no se ha sincronizado nunca: no hay nada que perder
+            enviado = conexion.execute(
+                "SELECT valor FROM sincronizacion WHERE clave = 'cursor_envio'").fetchone()
+            # Usa el índice parcial idx_tareas_completadas_actualizacion
+            tareas_ids = [(fila[0],) for fila in conexion.execute('''
+                SELECT id FROM main.tareas
+                WHERE completada = 1 AND fecha_actualizacion < ?
+                  AND id NOT IN (SELECT tarea_id FROM cambios WHERE secuencia > ? AND remoto = 0)
+                LIMIT ?
+            ''', (limite_fecha, inicio if enviado is None else enviado[0], tamano_lote))]
+            if not tareas_ids:
+                return 0
+            
+            fecha_archivo = int(time.time())
+            conexion.executemany(f'''
+                INSERT OR IGNORE INTO archivo.tareas_archivadas
+                    ({COLUMNAS_COMPLETAS}, uuid, fecha_archivo)
+                SELECT {COLUMNAS_COMPLETAS}, uuid, {fecha_archivo} FROM main.tareas WHERE id = ?
+            ''', tareas_ids)
+            conexion.executemany('DELETE FROM main.tareas WHERE id = ?', tareas_ids)
+            # Archivar no es eliminar: la sincronización no debe borrarlas en otros dispositivos
+            conexion.execute('UPDATE cambios SET remoto = 1 WHERE secuencia > ?', (inicio,))
+            return len(tareas_ids)
+        
+        try:
+            conexion = self._obtener_conexion()
+            # Caso habitual: nada que archivar; no se abre (ni crea) el archivo
+            if conexion.execute('''
+                SELECT 1 FROM tareas WHERE completada = 1 AND fecha_actualizacion < ? LIMIT 1
+            ''', (limite_fecha,)).fetchone() is None:
+                return 0
+            self._adjuntar_archivo(conexion)
+            movidas = self._en_transaccion(mover)
+            if movidas:
+                self._invalidar_cache(todas=True)
+                registro.debug("🗄️ %s tareas completadas movidas al archivo", movidas)
+            return movidas
+        
         except sqlite3.Error as e:
-            print(f"❌ Error al obtener estadísticas: {e}")
-            return {'total': 0, 'completadas': 0, 'pendientes': 0}
+            registro.error("❌ Error al archivar tareas: %s", e)
+            return 0
+    
+    @instrumentado("gestor.obtener_archivadas_pagina")
+    def obtener_archivadas_pagina(self, limite=50, despues_de=None, orden="recientes", texto=None):
+        """
+        Obtiene una página de tareas archivadas (paginación por cursor, como
+        obtener_tareas_pagina). Solo se consulta al abrir la vista de archivo.
+        
+        Args:
+            limite (int): Número máximo de tareas a devolver
+            despues_de (tuple): Clave (fecha_creacion, id) de la última tarea
+                de la página anterior, o None para la primera página
+            orden (str): Uno de ORDENES_ARCHIVO: 'recientes' o 'antiguas'
+                (por fecha de creación)
+            texto (str): Si se indica, solo las que lo contienen en el
+                título o la descripción (el archivo no tiene índice FTS)
+        
+        Returns:
+            list: Lista de objetos Tarea con la vista previa de la descripción
+        """
+        if orden not in ORDENES_ARCHIVO:
+            raise ValueError(f"orden desconocido en el archivo: {orden!r}")
+        if not os.path.exists(self.nombre_archivo):
+            return []
+        direccion, comparacion = ORDENES[orden][1:]
+        
+        condiciones, parametros = [], []
+        if despues_de is not None:
+            condiciones.append(f"(fecha_creacion, id) {comparacion} (?, ?)")
+            parametros.extend(despues_de)
+        if texto:
+            patron = "%" + re.sub(r"([%_\\])", r"\\\1", texto) + "%"
+            condiciones.append("(titulo LIKE ? ESCAPE '\\' OR descripcion LIKE ? ESCAPE '\\')")
+            parametros.extend((patron, patron))
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        
+        try:
+            conexion = self._obtener_conexion()
+            self._adjuntar_archivo(conexion)
+            cursor = conexion.cursor()
+            cursor.row_factory = Tarea.vista_previa_desde_fila
+            cursor.execute(f'''
+                SELECT {COLUMNAS_VISTA_PREVIA}
+                FROM archivo.tareas_archivadas
+                {donde}
+                ORDER BY fecha_creacion {direccion}, id {direccion}
+                LIMIT ?
+            ''', (*parametros, limite))
+            return cursor.fetchall()
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al obtener tareas archivadas: %s", e)
+            return []
+    
+    @instrumentado("gestor.liberar_espacio")
+    def liberar_espacio(self, paginas=PAGINAS_POR_TANDA):
+        """
+        Devuelve al disco las páginas que dejan libres los borrados grandes
+        
+        Con auto_vacuum incremental libera como mucho `paginas` por llamada.
+        Una base de datos creada sin él no se toca (un VACUUM completo
+        bloquearía a todos los escritores): se convierte una sola vez, de
+        forma explícita, con activar_vacuum_incremental(). Puede tardar: no
+        llamarlo desde el hilo de la interfaz.
+        
+        Args:
+            paginas (int): Máximo de páginas a liberar en esta llamada
+        
+        Returns:
+            int: Páginas liberadas (0 si quedaban menos de MINIMO_PAGINAS_LIBRES
+                o si la base de datos no tiene vacuum incremental)
+        """
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            conexion = self._obtener_conexion()
+            libres = conexion.execute('PRAGMA freelist_count').fetchone()[0]
+            if libres < MINIMO_PAGINAS_LIBRES:
+                return 0
+            
+            if conexion.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                if not self._aviso_vacuum:
+                    self._aviso_vacuum = True
+                    registro.warning("⚠️ %s páginas libres sin vacuum incremental: "
+                                     "ejecuta 'python main.py tareas vacuum' para activarlo", libres)
+                return 0
+            
+            # execute() solo avanzaría un paso del PRAGMA (una página);
+            # executescript lo ejecuta hasta el final
+            conexion.executescript(f'PRAGMA incremental_vacuum({int(paginas)})')
+            
+            # En modo WAL el archivo no encoge hasta el checkpoint
+            conexion.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+            
+            liberadas = libres - conexion.execute('PRAGMA freelist_count').fetchone()[0]
+            registro.debug("🧹 %s páginas liberadas", liberadas)
+            return liberadas
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al liberar espacio: %s", e)
+            return 0
+    
+    def activar_vacuum_incremental(self):
+        """
+        Convierte una base de datos creada sin auto_vacuum incremental con
+        un VACUUM completo, que reescribe el archivo entero y bloquea a los
+        demás escritores mientras dura. Solo hace falta una vez.
+        
+        Returns:
+            bool: True si la base de datos tiene ya vacuum incremental
+                (de antes o convertida ahora), False si falló
+        """
+        self.vaciar_cambios_pendientes()
+        
+        try:
+            conexion = self._obtener_conexion()
+            if conexion.execute('PRAGMA auto_vacuum').fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+                return True
+            
+            registro.warning("⚠️ Activando el vacuum incremental: VACUUM completo, la base de datos "
+                             "queda bloqueada hasta que termine")
+            conexion.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conexion.execute('VACUUM')
+            conexion.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+            self._aviso_vacuum = False
+            return True
+        
+        except sqlite3.Error as e:
+            registro.error("❌ Error al activar el vacuum incremental: %s", e)
+            return False
+    
+    def respaldar(self, destino=None, conservar=RESPALDOS_CONSERVADOS, progreso=None,
+                  paginas_por_paso=PAGINAS_POR_PASO_RESPALDO, pausa=PAUSA_RESPALDO):
+        """
+        Copia en caliente la base de datos (y el archivo, si existe) con la
+        API de backup de SQLite, unas pocas páginas por paso en un hilo propio
+        
+        La conexión del respaldo mantiene una transacción de lectura durante
+        toda la copia: en modo WAL las escrituras de la interfaz y de otros
+        procesos siguen adelante, y la copia es la instantánea del principio
+        en lugar de reiniciarse con cada cambio (que, con escrituras
+        frecuentes, no terminaría nunca). Cada copia se escribe como .tmp y
+        se renombra al terminar: nunca queda un respaldo a medias con el
+        nombre definitivo.
+        
+        Args:
+            destino (str): Directorio de los respaldos; por defecto
+                'respaldos' junto a la base de datos
+            conservar (int): Respaldos más recientes que se mantienen; los
+                anteriores se eliminan al terminar (0 para no eliminar ninguno)
+            progreso (callable): Recibe (páginas copiadas, páginas totales)
+                tras cada paso, en el hilo del respaldo
+            paginas_por_paso (int): Páginas copiadas en cada paso
+            pausa (float): Segundos de espera entre pasos
+        
+        Returns:
+            concurrent.futures.Future: Ruta del respaldo de la base de datos
+                cuando termina, o la excepción si falla
+        """
+        if destino is None:
+            destino = os.path.join(os.path.dirname(os.path.abspath(self.nombre_db)), DIRECTORIO_RESPALDOS)
+        # Los estados de completada aún no escritos también entran en el respaldo
+        self.vaciar_cambios_pendientes()
+        
+        futuro = Future()
+        futuro.set_running_or_notify_cancel()
+        
+        def ejecutar():
+            try:
+                futuro.set_result(self._copiar_respaldo(destino, conservar, progreso, paginas_por_paso, pausa))
+            except Exception as e:
+                registro.error("❌ Error al respaldar la base de datos: %s", e)
+                futuro.set_exception(e)
+        
+        threading.Thread(target=ejecutar, name="respaldo-db", daemon=True).start()
+        return futuro
+    
+    def _copiar_respaldo(self, destino, conservar, progreso, paginas_por_paso, pausa):
+        """
+        Hace la copia de respaldar() en el hilo del respaldo
+        
+        Returns:
+            str: Ruta del respaldo de la base de datos
+        """
+        with self._candado_respaldo:
+            os.makedirs(destino, exist_ok=True)
+            marca = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            copias = [("main", self.nombre_db)]
+            if os.path.exists(self.nombre_archivo):
+                copias.append(("archivo", self.nombre_archivo))
+            rutas = [os.path.join(destino, nombre_respaldo(origen, marca)) for _, origen in copias]
+            
+            inicio = time.perf_counter()
+            with contextlib.closing(sqlite3.connect(self.nombre_db, timeout=ESPERA_BLOQUEO)) as conexion:
+                if len(copias) > 1:
+                    conexion.execute("ATTACH DATABASE ? AS archivo", (self.nombre_archivo,))
+                # Fija la instantánea de cada base de datos, main primero: una
+                # tarea archivada entre medias queda en las dos, no en ninguna
+                conexion.execute("BEGIN")
+                totales = []
+                for esquema, _ in copias:
+                    conexion.execute(f"SELECT COUNT(*) FROM {esquema}.sqlite_master").fetchone()
+                    totales.append(conexion.execute(f"PRAGMA {esquema}.page_count").fetchone()[0])
+                total = sum(totales)
+                
+                copiadas = 0
+                for (esquema, _), ruta, paginas in zip(copias, rutas, totales):
+                    def avanzar(estado, restantes, paginas_esquema, previas=copiadas):
+                        progreso(previas + paginas_esquema - restantes, total)
+                    
+                    with contextlib.closing(sqlite3.connect(ruta + ".tmp")) as copia:
+                        conexion.backup(copia, pages=paginas_por_paso, name=esquema, sleep=pausa,
+                                        progress=avanzar if progreso else None)
+                    copiadas += paginas
+                conexion.rollback()
+            
+            for ruta in rutas:
+                os.replace(ruta + ".tmp", ruta)
+            eliminados = self._rotar_respaldos(destino, conservar)
+            registro.info("💾 Respaldo %s: %s páginas en %.1f s (%s antiguos eliminados)",
+                          rutas[0], total, time.perf_counter() - inicio, eliminados)
+            return rutas[0]
+    
+    def _rotar_respaldos(self, destino, conservar):
+        """
+        Elimina los respaldos anteriores a los `conservar` más recientes y
+        las copias .tmp que dejó un respaldo interrumpido
+        
+        Returns:
+            int: Respaldos eliminados
+        """
+        patrones = [patron_respaldo(origen) for origen in (self.nombre_db, self.nombre_archivo)]
+        archivos = {}
+        for nombre in os.listdir(destino):
+            for patron in patrones:
+                coincidencia = patron.match(nombre)
+                if coincidencia:
+                    archivos.setdefault(coincidencia.group(1), []).append(nombre)
+        
+        # Un respaldo está completo si existe la copia de la base de datos principal
+        completos = sorted(marca for marca in archivos
+                           if nombre_respaldo(self.nombre_db, marca) in archivos[marca])
+        conservados = set(completos[-conservar:]) if conservar else set(completos)
+        eliminados = 0
+        for marca, nombres in archivos.items():
+            for nombre in nombres:
+                if marca not in conservados or nombre.endswith(".tmp"):
+                    os.remove(os.path.join(destino, nombre))
+            eliminados += marca in completos and marca not in conservados
+        return eliminados
     
     def cerrar_conexion(self):
         """
-        Cierra la conexión a la base de datos
+        Cierra todas las conexiones abiertas por el gestor
         """
-        # SQLite maneja automáticamente las conexiones con el context manager
-        print("🔒 Conexión a la base de datos cerrada")
+        self.vaciar_cambios_pendientes()
+        
+        with self._candado_conexiones:
+            conexiones, self._conexiones = self._conexiones, []
+        
+        for conexion in conexiones:
+            try:
+                conexion.close()
+            except sqlite3.Error as e:
+                registro.error("❌ Error al cerrar la conexión: %s", e)
+        
+        # Las conexiones de otros hilos quedan cerradas; se descarta la referencia local
+        self._local = threading.local()
+        registro.debug("🔒 Conexión a la base de datos cerrada")
 
 
 # Función de prueba para verificar el funcionamiento
@@ -294,7 +1841,7 @@ def probar_gestor():
     print(f"\n📋 Total de tareas: {len(tareas)}")
     
     for tarea in tareas:
-        print(f"ID: {tarea[0]}, Título: {tarea[1]}, Completada: {'Sí' if tarea[3] else 'No'}")
+        print(f"ID: {tarea.id}, Título: {tarea.titulo}, Completada: {'Sí' if tarea.completada else 'No'}")
     
     # Obtener estadísticas
     stats = gestor.obtener_estadisticas()
@@ -303,5 +1850,459 @@ def probar_gestor():
     print("✅ Prueba completada")
 
 
+def probar_cache():
+    """
+    Comprueba que la caché por ID nunca devuelve datos obsoletos
+    tras actualizar, marcar o eliminar una tarea
+    """
+    print("🧪 Probando la caché de tareas...")
+    
+    # tempfile solo lo usan las pruebas; importarlo arriba retrasaría la CLI
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorTareas(os.path.join(directorio, "prueba_cache.db"), tamano_cache=2)
+        
+        tarea_id = gestor.agregar_tarea("Original", "Descripción")
+        otra_id = gestor.agregar_tarea("Otra")
+        
+        # La carga de la lista llena la caché
+        gestor.obtener_tareas_pagina(10)
+        assert gestor.obtener_tarea_por_id(tarea_id, completa=False).titulo == "Original"
+        assert gestor.estadisticas_cache()['aciertos'] == 1
+        
+        gestor.actualizar_tarea(tarea_id, "Editada", "Nueva descripción")
+        tarea = gestor.obtener_tarea_por_id(tarea_id)
+        assert (tarea.titulo, tarea.descripcion) == ("Editada", "Nueva descripción")
+        assert len({tarea, tarea.reemplazar(), tarea.reemplazar(completa=False)}) == 2
+        
+        gestor.marcar_completada(tarea_id, True)
+        assert gestor.obtener_tarea_por_id(tarea_id).completada == 1
+        
+        gestor.marcar_completada_diferida(tarea_id, False)
+        assert gestor.obtener_tarea_por_id(tarea_id).completada == 0
+        
+        # Un vaciado que falla conserva los estados, salvo que se pida descartarlos
+        conexion = gestor._obtener_conexion()
+        conexion.execute("CREATE TEMP TRIGGER trg_fallo BEFORE UPDATE ON tareas BEGIN SELECT RAISE(ABORT, 'fallo'); END")
+        gestor.marcar_completada_diferida(tarea_id, True)
+        assert gestor.vaciar_cambios_pendientes() == 0 and gestor.hay_cambios_pendientes()
+        try:
+            gestor.vaciar_cambios_pendientes(descartar_si_falla=True)
+            assert False, "el vaciado debía fallar"
+        except sqlite3.Error:
+            pass
+        assert not gestor.hay_cambios_pendientes()
+        conexion.execute("DROP TRIGGER trg_fallo")
+        assert gestor.obtener_tarea_por_id(tarea_id).completada == 0
+        
+        gestor.eliminar_tarea(tarea_id)
+        assert gestor.obtener_tarea_por_id(tarea_id) is None
+        
+        # Tamaño acotado: la entrada menos usada sale primero
+        tercera_id = gestor.agregar_tarea("Tercera")
+        gestor.obtener_tarea_por_id(otra_id)
+        gestor.obtener_tarea_por_id(tercera_id)
+        gestor.obtener_tarea_por_id(otra_id)
+        assert gestor.estadisticas_cache()['tamano'] <= 2
+        
+        print(f"📊 Caché: {gestor.estadisticas_cache()}")
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de caché completada")
+
+
+def probar_busqueda():
+    """
+    Verifica que el filtro de la búsqueda no pierde coincidencias antiguas
+    cuando hay más de CANDIDATOS_BUSQUEDA recientes que no lo cumplen
+    """
+    print("🧪 Probando la búsqueda...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorTareas(os.path.join(directorio, "prueba_busqueda.db"))
+        gestor.agregar_tareas_lote({'titulo': f"informe {i}", 'completada': i < 10}
+                                   for i in range(CANDIDATOS_BUSQUEDA + 500))
+        
+        completadas = gestor.buscar("informe", filtro="completadas")
+        assert sorted(tarea.titulo for tarea in completadas) == sorted(f"informe {i}" for i in range(10))
+        assert len(gestor.buscar("informe", filtro="pendientes")) == 50
+        assert all(not tarea.completada for tarea in gestor.buscar("informe", filtro="pendientes"))
+        assert [tarea.titulo for tarea in gestor.buscar("informe 3", filtro="completadas")][:1] == ["informe 3"]
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de búsqueda completada")
+
+
+def probar_operaciones_masivas():
+    """
+    Comprueba las operaciones sobre varias tareas y que el espacio de los
+    borrados grandes vuelve al disco
+    """
+    print("🧪 Probando las operaciones masivas...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "prueba_masivas.db")
+        gestor = GestorTareas(nombre_db)
+        
+        ids = [gestor.agregar_tarea(f"Tarea {i}") for i in range(6)]
+        gestor.obtener_tareas_pagina(10)
+        
+        assert gestor.marcar_completadas(ids[:4]) == 4
+        # Las que ya estaban completadas no se vuelven a escribir
+        assert gestor.marcar_completadas(ids[:2]) == 0
+        assert gestor.marcar_completadas(ids[3:4], False) == 1
+        assert gestor.obtener_tarea_por_id(ids[0], completa=False).completada == 1
+        assert gestor.obtener_estadisticas()['completadas'] == 3
+        
+        # Un estado diferido anterior no pisa el cambio masivo
+        gestor.marcar_completada_diferida(ids[4], False)
+        assert gestor.marcar_completadas([ids[4]]) == 1
+        assert gestor.obtener_tarea_por_id(ids[4]).completada == 1
+        
+        assert gestor.eliminar_tareas([ids[5], ids[5], 999]) == 1
+        assert gestor.obtener_tarea_por_id(ids[5]) is None
+        
+        assert gestor.eliminar_completadas() == 4
+        assert gestor.obtener_tarea_por_id(ids[0]) is None
+        assert [tarea.id for tarea in gestor.obtener_tareas_pagina(10)] == [ids[3]]
+        assert gestor.obtener_estadisticas() == {'total': 1, 'completadas': 0, 'pendientes': 1, 'archivadas': 0}
+        assert gestor.verificar_estadisticas(reparar=False)
+        
+        # Borrado grande: las páginas libres vuelven al disco por tandas
+        version_esquema = gestor._obtener_conexion().execute("PRAGMA schema_version").fetchone()[0]
+        gestor.agregar_tareas_lote({'titulo': f"Masiva {i}", 'descripcion': "x" * 500, 'completada': 1}
+                                   for i in range(5000))
+        # El lote aplica en una sentencia lo que hacen los triggers fila a fila
+        assert gestor.verificar_estadisticas(reparar=False)
+        assert [tarea.titulo for tarea in gestor.buscar("masiva 4999")][:1] == ["Masiva 4999"]
+        conexion = gestor._obtener_conexion()
+        assert conexion.execute("SELECT COUNT(*) FROM cambios WHERE tarea_id IN (SELECT id FROM tareas)").fetchone()[0] == 5001
+        assert conexion.execute("SELECT COUNT(*) FROM carga_masiva").fetchone()[0] == 0
+        # Sin cambios de esquema: las demás conexiones no vuelven a preparar nada
+        assert conexion.execute("PRAGMA schema_version").fetchone()[0] == version_esquema
+        paginas_llena = conexion.execute('PRAGMA page_count').fetchone()[0]
+        assert gestor.eliminar_completadas() == 5000
+        liberadas = 0
+        while True:
+            tanda = gestor.liberar_espacio()
+            if not tanda:
+                break
+            liberadas += tanda
+        paginas_final = conexion.execute('PRAGMA page_count').fetchone()[0]
+        assert liberadas > 0 and paginas_final < paginas_llena
+        
+        print(f"🧹 {liberadas} páginas liberadas: {paginas_llena} -> {paginas_final} páginas")
+        gestor.cerrar_conexion()
+        
+        # Una base de datos creada sin vacuum incremental no se convierte sola
+        nombre_antigua = os.path.join(directorio, "prueba_sin_incremental.db")
+        with contextlib.closing(sqlite3.connect(nombre_antigua)) as antigua:
+            migraciones.migrar(antigua)
+        antigua = GestorTareas(nombre_antigua)
+        antigua.agregar_tareas_lote({'titulo': f"Antigua {i}", 'descripcion': "x" * 500, 'completada': 1}
+                                    for i in range(2000))
+        antigua.eliminar_completadas()
+        conexion = antigua._obtener_conexion()
+        assert antigua.liberar_espacio() == 0
+        assert conexion.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL
+        assert antigua.activar_vacuum_incremental()
+        assert conexion.execute('PRAGMA auto_vacuum').fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+        antigua.cerrar_conexion()
+    
+    print("✅ Prueba de operaciones masivas completada")
+
+
+def probar_cambios_externos():
+    """
+    Comprueba que un gestor ve solo las escrituras de otra conexión (como
+    otra instancia de la app) y solo las filas que cambiaron
+    """
+    print("🧪 Probando la detección de cambios externos...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "prueba_cambios.db")
+        gestor = GestorTareas(nombre_db)
+        otro = GestorTareas(nombre_db)
+        
+        primera_id = gestor.agregar_tarea("Propia")
+        cursor_cambios = gestor.ultimo_cambio()
+        assert gestor.comprobar_cambios_externos(cursor_cambios) is None
+        
+        # Las escrituras propias no cambian data_version
+        gestor.marcar_completada(primera_id, True)
+        assert gestor.comprobar_cambios_externos(cursor_cambios) is None
+        
+        gestor.obtener_tarea_por_id(primera_id)
+        nueva_id = otro.agregar_tarea("Externa")
+        otro.actualizar_tarea(primera_id, "Editada fuera", "", True)
+        cambios = gestor.comprobar_cambios_externos(cursor_cambios)
+        assert sorted(tarea.id for tarea in cambios['tareas']) == [primera_id, nueva_id]
+        assert not cambios['eliminadas'] and not cambios['desbordado']
+        # La caché no devuelve la versión anterior a la escritura externa
+        assert gestor.obtener_tarea_por_id(primera_id).titulo == "Editada fuera"
+        
+        cursor_cambios = cambios['cursor']
+        assert gestor.comprobar_cambios_externos(cursor_cambios) is None
+        otro.eliminar_tarea(nueva_id)
+        cambios = gestor.comprobar_cambios_externos(cursor_cambios)
+        assert cambios['eliminadas'] == [nueva_id] and not cambios['tareas']
+        
+        # Demasiados cambios: mejor recargar la lista entera
+        otro.agregar_tareas_lote(("Lote", "") for _ in range(20))
+        cambios = gestor.comprobar_cambios_externos(cambios['cursor'], limite=10)
+        assert cambios['desbordado'] and cambios['cursor'] == gestor.ultimo_cambio()
+        
+        otro.cerrar_conexion()
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de cambios externos completada")
+
+
+def probar_archivo():
+    """
+    Comprueba que las completadas antiguas pasan al archivo por lotes, que
+    las estadísticas suman ambas bases de datos y que la vista de archivo
+    las encuentra
+    """
+    print("🧪 Probando el archivado de tareas completadas...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "prueba_archivo.db")
+        gestor = GestorTareas(nombre_db)
+        assert gestor.nombre_archivo == os.path.join(directorio, "prueba_archivo_archivo.db")
+        
+        gestor.agregar_tareas_lote({'titulo': f"Tarea {i}", 'completada': i % 2} for i in range(250))
+        assert gestor.archivar_completadas() == 0
+        # Sin archivar nada todavía no existe el archivo
+        assert not os.path.exists(gestor.nombre_archivo)
+        
+        # 100 completadas antiguas; las recientes y las pendientes se quedan
+        hace_un_ano = int(time.time()) - 365 * 86400
+        with gestor._obtener_conexion() as conexion:
+            conexion.execute("UPDATE tareas SET fecha_actualizacion = ? WHERE id <= 200", (hace_un_ano,))
+        cursor_cambios = gestor.ultimo_cambio()
+        
+        lotes = []
+        while True:
+            movidas = gestor.archivar_completadas(tamano_lote=40)
+            if not movidas:
+                break
+            lotes.append(movidas)
+        assert lotes == [40, 40, 20]
+        
+        assert gestor.obtener_estadisticas() == {'total': 250, 'completadas': 125, 'pendientes': 125, 'archivadas': 100}
+        assert gestor.verificar_estadisticas()
+        conexion = gestor._obtener_conexion()
+        assert conexion.execute("SELECT COUNT(*) FROM tareas WHERE completada = 1").fetchone()[0] == 25
+        # Las tareas salen de la lista, pero no se envían como eliminadas al sincronizar
+        assert conexion.execute("SELECT COUNT(*) FROM cambios WHERE secuencia > ? AND remoto = 0",
+                                (cursor_cambios,)).fetchone()[0] == 0
+        
+        pagina = gestor.obtener_archivadas_pagina(60)
+        assert len(pagina) == 60 and all(tarea.completada for tarea in pagina)
+        siguiente = gestor.obtener_archivadas_pagina(60, (pagina[-1].fecha_creacion, pagina[-1].id))
+        assert len(siguiente) == 40 and not {t.id for t in pagina} & {t.id for t in siguiente}
+        assert [tarea.titulo for tarea in gestor.obtener_archivadas_pagina(texto="Tarea 19")] == \
+            ["Tarea 199", "Tarea 197", "Tarea 195", "Tarea 193", "Tarea 191", "Tarea 19"]
+        assert gestor.obtener_archivadas_pagina(texto="100%") == []
+        
+        # Otro gestor (otro proceso) lee el archivo existente
+        otro = GestorTareas(nombre_db)
+        assert otro.obtener_estadisticas()['archivadas'] == 100
+        otro.cerrar_conexion()
+        
+        # Sincronizando, una completada con un cambio sin enviar no se archiva
+        with gestor._obtener_conexion() as conexion:
+            conexion.execute("UPDATE tareas SET fecha_actualizacion = ? WHERE id > 200", (hace_un_ano,))
+        gestor.guardar_estado_sincronizacion("cursor_envio", gestor.ultimo_cambio())
+        with gestor._obtener_conexion() as conexion:
+            conexion.execute("UPDATE tareas SET titulo = 'Sin enviar' WHERE id = 202")
+        assert gestor.archivar_completadas() == 24
+        assert gestor.obtener_tarea_por_id(202).titulo == "Sin enviar"
+        cambios, _ = gestor.cambios_para_enviar(gestor.obtener_estado_sincronizacion("cursor_envio"))
+        assert [(cambio['titulo'], cambio['eliminada']) for cambio in cambios] == [("Sin enviar", 0)]
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de archivado completada")
+
+
+def probar_prioridades():
+    """
+    Comprueba las consultas por prioridad y fecha límite: resultados,
+    paginación por cursor y que cada consulta usa su índice sin ordenar
+    """
+    print("🧪 Probando prioridades y fechas límite...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorTareas(os.path.join(directorio, "prueba_prioridades.db"))
+        ahora = int(time.time())
+        # Cada tarea i: prioridad i % 4, fecha límite cada 2 días desde hace 10 (o ninguna)
+        gestor.agregar_tareas_lote({
+            'titulo': f"Tarea {i}",
+            'completada': i % 5 == 0,
+            'prioridad': i % 4,
+            'fecha_limite': ahora + (i - 5) * 2 * 86400 if i % 3 else None,
+        } for i in range(30))
+        todas = gestor.obtener_tareas_pagina(100, completas=True)
+        
+        for orden, (_, direccion, _) in ORDENES.items():
+            esperado = sorted(todas, key=lambda tarea: clave_orden(tarea, orden), reverse=direccion == "DESC")
+            primera = gestor.obtener_tareas_pagina(7, orden=orden, completas=True)
+            resto = gestor.obtener_tareas_pagina(100, clave_orden(primera[-1], orden), orden=orden, completas=True)
+            assert primera + resto == esperado, orden
+        
+        pendientes = [tarea for tarea in todas if not tarea.completada and tarea.fecha_limite is not None]
+        vencidas = gestor.obtener_vencidas(ahora=ahora)
+        assert [tarea.id for tarea in vencidas] == \
+            [tarea.id for tarea in sorted(pendientes, key=lambda t: t.fecha_limite) if tarea.fecha_limite < ahora]
+        proximas = gestor.obtener_proximas(7, ahora=ahora)
+        assert [tarea.titulo for tarea in proximas] == ["Tarea 7", "Tarea 8"]
+        assert gestor.obtener_vencidas(2, clave_orden(vencidas[1], "vencimiento"), ahora=ahora) == vencidas[2:4]
+        
+        assert gestor.planificar_tarea(proximas[0].id, 3, None)
+        assert not gestor.planificar_tarea(proximas[0].id, 9)
+        assert gestor.obtener_proximas(7, ahora=ahora)[0].titulo == "Tarea 8"
+        tarea = gestor.obtener_tarea_por_id(proximas[0].id)
+        assert (tarea.prioridad, tarea.fecha_limite) == (3, None)
+        
+        # Editar título y planificación a la vez deja un único cambio registrado
+        conexion = gestor._obtener_conexion()
+        secuencia = conexion.execute("SELECT MAX(secuencia) FROM cambios").fetchone()[0]
+        assert gestor.actualizar_tarea(tarea.id, "Replanificada", "", False, (2, ahora))
+        assert not gestor.actualizar_tarea(tarea.id, "Replanificada", "", False, (9, ahora))
+        tarea = gestor.obtener_tarea_por_id(tarea.id)
+        assert (tarea.titulo, tarea.prioridad, tarea.fecha_limite) == ("Replanificada", 2, ahora)
+        assert conexion.execute("SELECT MAX(secuencia) FROM cambios").fetchone()[0] == secuencia + 1
+        assert leer_fecha_limite("2030-01-31") == int(datetime(2030, 1, 31, 23, 59, 59).timestamp())
+        assert leer_fecha_limite("") is None
+        
+        # Ninguna consulta recorre la tabla ni ordena sus filas
+        consultas = []
+        conexion.set_trace_callback(consultas.append)
+        for filtro in FILTROS:
+            for orden in ORDENES:
+                gestor.obtener_tareas_pagina(5, filtro=filtro, orden=orden)
+        gestor.obtener_vencidas(ahora=ahora)
+        gestor.obtener_proximas(ahora=ahora)
+        conexion.set_trace_callback(None)
+        for consulta in consultas:
+            plan = [fila[3] for fila in conexion.execute(f"EXPLAIN QUERY PLAN {consulta}")]
+            assert len(plan) == 1 and "USING INDEX" in plan[0], (consulta, plan)
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de prioridades completada")
+
+
+def probar_memoria():
+    """
+    Comprueba el presupuesto de memoria de la capa de datos por cada
+    10 000 tareas: todas las filas completas y una página con vista previa
+    (la interfaz se mide con benchmark.py memoria, que necesita Kivy)
+    """
+    print("🧪 Probando el presupuesto de memoria de la capa de datos...")
+    
+    import tempfile
+    from memoria import PRESUPUESTO_DATOS_MB, PerfilMemoria
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorTareas(os.path.join(directorio, "prueba_memoria.db"), tamano_cache=0)
+        filas = 10_000
+        gestor.agregar_tareas_lote((f"Tarea {i}", f"Descripción de la tarea {i}") for i in range(filas))
+        
+        for etiqueta, cargar in (("obtener_todas_tareas", gestor.obtener_todas_tareas),
+                                 ("pagina_vista_previa", lambda: gestor.obtener_tareas_pagina(filas))):
+            perfil_datos = PerfilMemoria()
+            perfil_datos.iniciar()
+            tareas = cargar()
+            muestra = perfil_datos.muestrear(etiqueta, len(tareas))
+            del tareas
+            perfil_datos.detener()
+            por_10k = muestra['bytes_por_tarea'] * 10_000 / 1e6
+            print(f"🧠 {etiqueta}: {por_10k:.2f} MB por cada 10 000 tareas (máximo {PRESUPUESTO_DATOS_MB})")
+            assert muestra['tareas'] == filas and por_10k <= PRESUPUESTO_DATOS_MB, (etiqueta, por_10k)
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de memoria completada")
+
+
+def probar_respaldo():
+    """
+    Comprueba el respaldo en caliente: la copia es una instantánea coherente
+    aunque otro gestor escriba mientras tanto, incluye el archivo y los
+    cambios diferidos, informa del progreso y solo conserva los más recientes
+    """
+    print("🧪 Probando los respaldos...")
+    
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        nombre_db = os.path.join(directorio, "prueba_respaldo.db")
+        destino = os.path.join(directorio, "respaldos")
+        gestor = GestorTareas(nombre_db)
+        gestor.agregar_tareas_lote({'titulo': f"Tarea {i}", 'descripcion': "x" * 500, 'completada': i % 2}
+                                   for i in range(3000))
+        with gestor._obtener_conexion() as conexion:
+            conexion.execute("UPDATE tareas SET fecha_actualizacion = 0 WHERE id <= 1000")
+        while gestor.archivar_completadas():
+            pass
+        gestor.marcar_completada_diferida(1, True)
+        
+        # Otro gestor (como otro proceso) escribe durante toda la copia
+        otro = GestorTareas(nombre_db)
+        parar = threading.Event()
+        escritas = []
+        
+        def escribir():
+            while not parar.is_set():
+                escritas.append(otro.agregar_tarea("Durante el respaldo"))
+        
+        hilo = threading.Thread(target=escribir)
+        hilo.start()
+        avance = []
+        ruta = gestor.respaldar(destino, conservar=2, paginas_por_paso=8,
+                                progreso=lambda copiadas, total: avance.append((copiadas, total))).result()
+        parar.set()
+        hilo.join()
+        assert escritas and all(escritas)
+        
+        assert [copiadas for copiadas, _ in avance] == sorted(copiadas for copiadas, _ in avance)
+        assert avance[-1][0] == avance[-1][1] and len({total for _, total in avance}) == 1
+        with contextlib.closing(sqlite3.connect(ruta)) as copia:
+            assert copia.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+            total, completadas = copia.execute("SELECT total, completadas FROM estadisticas_tareas").fetchone()
+            assert (total, completadas) == copia.execute(
+                "SELECT COUNT(*), SUM(completada = 1) FROM tareas").fetchone()
+            assert copia.execute("SELECT completada FROM tareas WHERE id = 1").fetchone() == (1,)
+        with contextlib.closing(sqlite3.connect(os.path.join(
+                destino, nombre_respaldo(gestor.nombre_archivo, patron_respaldo(nombre_db).match(
+                    os.path.basename(ruta)).group(1))))) as copia:
+            assert copia.execute("SELECT COUNT(*) FROM tareas_archivadas").fetchone() == (500,)
+        
+        # Rotación: solo quedan los 2 últimos (base de datos y archivo) y ningún .tmp
+        with open(os.path.join(destino, nombre_respaldo(nombre_db, "20000101-000000-000000") + ".tmp"), "w"):
+            pass
+        ultimas = [gestor.respaldar(destino, conservar=2).result() for _ in range(2)]
+        assert sorted(os.listdir(destino)) == sorted(
+            [os.path.basename(ruta) for ruta in ultimas]
+            + [os.path.basename(ruta).replace("prueba_respaldo-", "prueba_respaldo_archivo-") for ruta in ultimas])
+        
+        otro.cerrar_conexion()
+        gestor.cerrar_conexion()
+    
+    print("✅ Prueba de respaldos completada")
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     probar_gestor()
+    probar_cache()
+    probar_busqueda()
+    probar_operaciones_masivas()
+    probar_cambios_externos()
+    probar_archivo()
+    probar_prioridades()
+    probar_memoria()
+    probar_respaldo()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fachada asíncrona del gestor de tareas para la interfaz Kivy
+Ejecuta las consultas en un hilo dedicado y entrega los resultados
+en el hilo de la interfaz mediante Clock.schedule_once
+"""
+
+import logging
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from kivy.clock import Clock
+
+from instrumentacion import metricas
+
+
+registro = logging.getLogger(__name__)
+
+
+class GestorTareasAsync:
+    """
+    Ejecuta las operaciones de GestorTareas fuera del bucle de Kivy
+    
+    Todas las llamadas pasan por un único hilo de trabajo, así que se
+    ejecutan en el mismo orden en que se enviaron.
+    """
+    
+    def __init__(self, gestor, retardo=0.0):
+        """
+        Inicializa la fachada asíncrona
+        
+        Args:
+            gestor (GestorTareas): Gestor que realiza las operaciones
+            retardo (float): Segundos de espera añadidos a cada operación,
+                para simular un disco lento durante las pruebas
+        """
+        self.gestor = gestor
+        self.retardo = retardo
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gestor-db")
+        # Última lectura enviada por canal; las anteriores quedan obsoletas
+        self._lecturas = {}
+    
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None, canal=None, **kwargs):
+        """
+        Ejecuta una función en el hilo de la base de datos
+        
+        Args:
+            funcion (callable): Función a ejecutar
+            al_terminar (callable): Recibe el resultado en el hilo de la interfaz
+            al_fallar (callable): Recibe la excepción en el hilo de la interfaz
+            canal (str): Si se indica, una nueva llamada en el mismo canal
+                cancela la anterior y descarta su resultado
+        
+        Returns:
+            concurrent.futures.Future: Resultado futuro de la operación
+        """
+        # Tiempo desde el envío hasta la entrega en la interfaz, cola incluida
+        inicio = time.perf_counter() if metricas.activa else None
+        futuro = self._ejecutor.submit(self._ejecutar, funcion, args, kwargs)
+        
+        if canal is not None:
+            anterior = self._lecturas.get(canal)
+            if anterior is not None:
+                anterior.cancel()
+            self._lecturas[canal] = futuro
+        
+        def entregar(dt):
+            # Una lectura reemplazada por otra más reciente ya no interesa
+            if canal is not None:
+                if self._lecturas.get(canal) is not futuro:
+                    return
+                del self._lecturas[canal]
+            
+            try:
+                resultado = futuro.result()
+            except CancelledError:
+                return
+            except Exception as e:
+                if al_fallar:
+                    al_fallar(e)
+                else:
+                    registro.error("❌ Error en operación de base de datos: %s", e)
+                return
+            
+            if al_terminar:
+                al_terminar(resultado)
+            if inicio is not None:
+                nombre = canal or getattr(funcion, '__name__', 'funcion')
+                metricas.registrar(f"async.{nombre}", time.perf_counter() - inicio)
+        
+        futuro.add_done_callback(lambda f: Clock.schedule_once(entregar))
+        return futuro
+    
+    def llamar(self, metodo, *args, al_terminar=None, al_fallar=None, canal=None, **kwargs):
+        """
+        Ejecuta un método del gestor por nombre en el hilo de la base de datos
+        
+        Args:
+            metodo (str): Nombre del método de GestorTareas
+        
+        Returns:
+            concurrent.futures.Future: Resultado futuro de la operación
+        """
+        return self.enviar(getattr(self.gestor, metodo), *args, al_terminar=al_terminar,
+                           al_fallar=al_fallar, canal=canal, **kwargs)
+    
+    def cancelar(self, canal):
+        """
+        Descarta la lectura pendiente de un canal
+        """
+        futuro = self._lecturas.pop(canal, None)
+        if futuro is not None:
+            futuro.cancel()
+    
+    def esta_cargando(self, canal):
+        """
+        Indica si hay una lectura pendiente en el canal
+        """
+        return canal in self._lecturas
+    
+    def _ejecutar(self, funcion, args, kwargs):
+        if self.retardo:
+            time.sleep(self.retardo)
+        return funcion(*args, **kwargs)
+    
+    def cerrar(self):
+        """
+        Espera a que terminen las operaciones pendientes y detiene el hilo
+        """
+        self._ejecutor.shutdown(wait=True)
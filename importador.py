@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de tareas desde archivos CSV y JSONL
+Los archivos se leen línea a línea y se escriben por lotes con GestorTareas
+"""
+
+import csv
+import json
+
+
+def leer_csv(ruta):
+    """
+    Lee tareas de un CSV con cabecera (titulo, descripcion, completada)
+    
+    Args:
+        ruta (str): Ruta del archivo CSV
+    
+    Yields:
+        dict: Una tarea por fila, sin cargar el archivo completo
+    """
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        yield from leer_csv_de(archivo)
+
+
+def leer_csv_de(archivo):
+    """
+    Igual que leer_csv, sobre un archivo ya abierto (por ejemplo sys.stdin)
+    """
+    yield from csv.DictReader(archivo)
+
+
+def leer_jsonl(ruta):
+    """
+    Lee tareas de un archivo JSONL (un objeto JSON por línea)
+    
+    Args:
+        ruta (str): Ruta del archivo JSONL
+    
+    Yields:
+        dict: Una tarea por línea no vacía
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        yield from leer_jsonl_de(archivo)
+
+
+def leer_jsonl_de(archivo):
+    """
+    Igual que leer_jsonl, sobre un archivo ya abierto (por ejemplo sys.stdin)
+    
+    Raises:
+        ValueError: Con el número de línea, si una línea no es un objeto JSON
+    """
+    for numero, linea in enumerate(archivo, 1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            tarea = json.loads(linea)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"línea {numero}: JSON no válido ({e.msg})") from None
+        if not isinstance(tarea, dict):
+            raise ValueError(f"línea {numero}: se esperaba un objeto JSON, no {type(tarea).__name__}")
+        yield tarea
+
+
+def importar_csv(gestor, ruta, tamano_lote=5000, progreso=None):
+    """
+    Importa tareas desde un CSV
+    
+    Args:
+        gestor (GestorTareas): Gestor de la base de datos destino
+        ruta (str): Ruta del archivo CSV
+        tamano_lote (int): Tareas escritas por transacción
+        progreso (callable): Recibe el total importado tras cada lote
+    
+    Returns:
+        int: Número de tareas importadas
+    """
+    return gestor.agregar_tareas_lote(leer_csv(ruta), tamano_lote, progreso)
+
+
+def importar_jsonl(gestor, ruta, tamano_lote=5000, progreso=None):
+    """
+    Importa tareas desde un archivo JSONL
+    
+    Args:
+        gestor (GestorTareas): Gestor de la base de datos destino
+        ruta (str): Ruta del archivo JSONL
+        tamano_lote (int): Tareas escritas por transacción
+        progreso (callable): Recibe el total importado tras cada lote
+    
+    Returns:
+        int: Número de tareas importadas
+    """
+    return gestor.agregar_tareas_lote(leer_jsonl(ruta), tamano_lote, progreso)
+
+
+def importar_archivo(gestor, ruta, tamano_lote=5000, progreso=None):
+    """
+    Importa un archivo eligiendo el formato por su extensión (.csv o .jsonl)
+    """
+    if ruta.lower().endswith('.csv'):
+        return importar_csv(gestor, ruta, tamano_lote, progreso)
+    return importar_jsonl(gestor, ruta, tamano_lote, progreso)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentación de la App To-Do
+Histogramas de latencia por operación y contadores de filas, activables
+con TODO_INSTRUMENTACION=1 o con metricas.activar()
+"""
+
+import bisect
+import functools
+import os
+import sqlite3
+import threading
+import time
+
+
+# Límites superiores de los cubos del histograma, en microsegundos:
+# crecen un 10 % cada uno, de 1 µs a ~100 s (error de los percentiles ≤ 10 %)
+LIMITES_CUBOS_US = []
+_limite = 1.0
+while _limite < 1e8:
+    LIMITES_CUBOS_US.append(_limite)
+    _limite *= 1.1
+del _limite
+
+# Sentencias SQL que escriben filas (se cuentan con cursor.rowcount)
+VERBOS_ESCRITURA = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+
+class Histograma:
+    """
+    Histograma de latencias con cubos logarítmicos de tamaño fijo: la
+    memoria no crece con el número de muestras
+    """
+    
+    __slots__ = ('cubos', 'llamadas', 'total', 'maximo')
+    
+    def __init__(self):
+        self.cubos = [0] * (len(LIMITES_CUBOS_US) + 1)
+        self.llamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+    
+    def registrar(self, segundos):
+        """
+        Añade una muestra al histograma
+        """
+        self.cubos[bisect.bisect_left(LIMITES_CUBOS_US, segundos * 1e6)] += 1
+        self.llamadas += 1
+        self.total += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+    
+    def percentil(self, p):
+        """
+        Devuelve el percentil p (0-100) en milisegundos, como el límite
+        superior del cubo que lo contiene
+        """
+        if not self.llamadas:
+            return 0.0
+        objetivo = self.llamadas * p / 100
+        acumulado = 0
+        for indice, cantidad in enumerate(self.cubos):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                if indice == len(LIMITES_CUBOS_US):
+                    return self.maximo * 1000
+                return min(LIMITES_CUBOS_US[indice] / 1000, self.maximo * 1000)
+        return self.maximo * 1000
+    
+    def resumen(self):
+        """
+        Returns:
+            dict: Llamadas, percentiles 50/95/99, máximo y total en milisegundos
+        """
+        return {
+            'llamadas': self.llamadas,
+            'p50_ms': round(self.percentil(50), 4),
+            'p95_ms': round(self.percentil(95), 4),
+            'p99_ms': round(self.percentil(99), 4),
+            'max_ms': round(self.maximo * 1000, 4),
+            'total_ms': round(self.total * 1000, 3),
+        }
+
+
+class Instrumentacion:
+    """
+    Registro global de latencias y filas leídas/escritas
+    
+    Desactivada, cada operación instrumentada solo comprueba un atributo
+    y las conexiones nuevas son sqlite3.Connection normales.
+    """
+    
+    def __init__(self, activa=False):
+        self.activa = activa
+        self._candado = threading.Lock()
+        self.reiniciar()
+    
+    def activar(self):
+        """
+        Empieza a registrar; las conexiones SQL abiertas a partir de ahora
+        también se miden sentencia a sentencia
+        """
+        self.activa = True
+    
+    def desactivar(self):
+        self.activa = False
+    
+    def reiniciar(self):
+        """
+        Descarta todas las mediciones acumuladas
+        """
+        with self._candado:
+            self._histogramas = {}
+            self.filas_leidas = 0
+            self.filas_escritas = 0
+    
+    def registrar(self, operacion, segundos, leidas=0, escritas=0):
+        """
+        Añade una medición
+        
+        Args:
+            operacion (str): Nombre de la operación (p. ej. 'gestor.buscar')
+            segundos (float): Duración medida
+            leidas (int): Filas leídas durante la operación
+            escritas (int): Filas escritas durante la operación
+        """
+        with self._candado:
+            histograma = self._histogramas.get(operacion)
+            if histograma is None:
+                histograma = self._histogramas[operacion] = Histograma()
+            histograma.registrar(segundos)
+            self.filas_leidas += leidas
+            self.filas_escritas += escritas
+    
+    def instantanea(self):
+        """
+        Copia de las mediciones actuales
+        
+        Returns:
+            dict: 'operaciones' (resumen por operación), 'filas_leidas'
+                y 'filas_escritas'
+        """
+        with self._candado:
+            return {
+                'operaciones': {nombre: histograma.resumen()
+                                for nombre, histograma in sorted(self._histogramas.items())},
+                'filas_leidas': self.filas_leidas,
+                'filas_escritas': self.filas_escritas,
+            }
+    
+    def fabrica_conexion(self):
+        """
+        Clase de conexión para sqlite3.connect(factory=...): instrumentada
+        solo si la instrumentación está activa al abrir la conexión
+        """
+        return ConexionInstrumentada if self.activa else sqlite3.Connection
+
+
+# Instancia compartida por el gestor y la interfaz
+metricas = Instrumentacion(activa=os.environ.get("TODO_INSTRUMENTACION", "") not in ("", "0"))
+
+
+def instrumentado(operacion):
+    """
+    Decorador que mide cada llamada a la función bajo el nombre dado
+    
+    Args:
+        operacion (str): Nombre con el que se agrupan las mediciones
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not metricas.activa:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                metricas.registrar(operacion, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mide cada sentencia ('sql.SELECT', 'sql.UPDATE'...), la
+    lectura de resultados ('sql.fetch') y cuenta las filas
+    """
+    
+    def execute(self, sql, parametros=()):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            self._registrar(sql, inicio)
+    
+    def executemany(self, sql, parametros):
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, parametros)
+        finally:
+            self._registrar(sql, inicio)
+    
+    def _registrar(self, sql, inicio):
+        segundos = time.perf_counter() - inicio
+        verbo = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "?"
+        escritas = max(self.rowcount, 0) if verbo in VERBOS_ESCRITURA else 0
+        metricas.registrar(f"sql.{verbo}", segundos, escritas=escritas)
+    
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        metricas.registrar("sql.fetch", time.perf_counter() - inicio, leidas=fila is not None)
+        return fila
+    
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        filas = super().fetchmany(self.arraysize if size is None else size)
+        metricas.registrar("sql.fetch", time.perf_counter() - inicio, leidas=len(filas))
+        return filas
+    
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        metricas.registrar("sql.fetch", time.perf_counter() - inicio, leidas=len(filas))
+        return filas
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    """
+    Conexión cuyos cursores, incluidos los de execute/executemany, son
+    CursorInstrumentado
+    """
+    
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+    
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
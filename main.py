@@ -3,16 +3,39 @@
 """
 Aplicación To-Do con Kivy y SQLite
 Archivo principal que ejecuta la aplicación
+(o la línea de comandos: python main.py tareas --help)
 """
 
-from app import TodoApp
+import logging
+import os
+import sys
+import time
 
 
 if __name__ == '__main__':
+    # Las métricas de arranque cuentan desde aquí, antes de importar Kivy
+    inicio = time.perf_counter()
+    
+    # main.py tareas <comando>: línea de comandos sin Kivy ni mensajes de inicio
+    if sys.argv[1:2] == ['tareas']:
+        logging.basicConfig(level=os.environ.get('TODO_LOG', 'WARNING').upper(), format="%(message)s")
+        from cli import main
+        sys.exit(main(sys.argv[2:]))
+    
+    # --perfil-memoria equivale a TODO_PERFIL_MEMORIA=1; se quita antes de
+    # que Kivy lea los argumentos
+    if '--perfil-memoria' in sys.argv:
+        sys.argv.remove('--perfil-memoria')
+        os.environ.setdefault('TODO_PERFIL_MEMORIA', '1')
+    
     print("🚀 Iniciando App To-Do con SQLite...")
     print("📱 Aplicación desarrollada con Kivy 2.3.1")
     print("🗄️ Base de datos: SQLite3")
     print("=" * 50)
     
+    # TODO_LOG=DEBUG muestra cada operación del gestor
+    logging.basicConfig(level=os.environ.get('TODO_LOG', 'INFO').upper(), format="%(message)s")
+    
     # Ejecutar la aplicación
-    TodoApp().run()
\ No newline at end of file
+    from app import TodoApp
+    TodoApp(inicio_arranque=inicio).run()
\ No newline at end of file
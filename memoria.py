@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfil de memoria de la App To-Do
+Instantáneas de tracemalloc y recuento de widgets y texturas tras cada
+recarga de la lista, activable con TODO_PERFIL_MEMORIA=1 (o el número de
+marcos de pila que se guardan por asignación), con python main.py
+--perfil-memoria o con perfil.iniciar()
+"""
+
+import fnmatch
+import gc
+import os
+import sys
+import tracemalloc
+
+
+# Capa a la que se atribuye cada archivo que asigna memoria (el primero que coincide)
+CAPAS = (
+    ("kivy", ("*/kivy/*", "*\\kivy\\*")),
+    ("interfaz", ("*app.py", "*dialogos.py")),
+    ("datos", ("*gestor.py", "*gestor_async.py", "*modelos.py", "*migraciones.py")),
+)
+
+# Asignaciones que son del propio perfil (fnmatch lo usan los filtros)
+# o de la importación de módulos
+FILTROS_TRACEMALLOC = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, fnmatch.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Bytes por píxel de las texturas de las etiquetas (RGBA)
+BYTES_POR_PIXEL = 4
+
+# Presupuesto de memoria retenida por cada 10 000 tareas cargadas, en MB
+# (benchmark.py memoria y probar_memoria de gestor.py)
+PRESUPUESTO_DATOS_MB = 5
+PRESUPUESTO_INTERFAZ_MB = 20
+
+
+def capa_de(archivo):
+    """
+    Devuelve la capa ('kivy', 'interfaz', 'datos' u 'otros') de un archivo
+    """
+    for capa, patrones in CAPAS:
+        if any(fnmatch.fnmatch(archivo, patron) for patron in patrones):
+            return capa
+    return "otros"
+
+
+def contar_widgets():
+    """
+    Cuenta los widgets vivos por clase y las texturas que muestran
+    
+    Las texturas viven en la memoria de la GPU (o de SDL), fuera del
+    alcance de tracemalloc: se estiman por su tamaño en píxeles.
+    
+    Returns:
+        tuple: (dict clase -> widgets, número de texturas, bytes estimados)
+    """
+    modulo = sys.modules.get("kivy.uix.widget")
+    if modulo is None:
+        # Sin Kivy importado (línea de comandos, benchmarks del gestor) no hay widgets
+        return {}, 0, 0
+    
+    widgets = {}
+    texturas = {}
+    for objeto in gc.get_objects():
+        if isinstance(objeto, modulo.Widget):
+            nombre = type(objeto).__name__
+            widgets[nombre] = widgets.get(nombre, 0) + 1
+            textura = getattr(objeto, "texture", None)
+            if textura is not None:
+                texturas[id(textura)] = textura.width * textura.height * BYTES_POR_PIXEL
+    return widgets, len(texturas), sum(texturas.values())
+
+
+class PerfilMemoria:
+    """
+    Mide la memoria retenida desde una instantánea base: por tarea cargada,
+    por capa y por línea que la asignó
+    
+    Desactivado no arranca tracemalloc, que ralentiza cada asignación.
+    """
+    
+    def __init__(self, activo=False, marcos=1):
+        self.activo = activo
+        self.marcos = marcos
+        self.base = None
+    
+    def iniciar(self):
+        """
+        Arranca tracemalloc (si no estaba en marcha) y toma la instantánea
+        base con la que se comparan las siguientes muestras
+        """
+        self.activo = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.marcos)
+        gc.collect()
+        self.base = tracemalloc.take_snapshot().filter_traces(FILTROS_TRACEMALLOC)
+    
+    def detener(self):
+        """
+        Detiene tracemalloc y descarta la instantánea base
+        """
+        self.activo = False
+        self.base = None
+        tracemalloc.stop()
+    
+    def muestrear(self, etiqueta, tareas, principales=10):
+        """
+        Compara la memoria actual con la base
+        
+        Args:
+            etiqueta (str): Nombre de la muestra (p. ej. 'lista')
+            tareas (int): Tareas cargadas en ese momento, para el coste por tarea
+            principales (int): Número de líneas que más memoria asignaron a incluir
+        
+        Returns:
+            dict: 'etiqueta', 'tareas', 'bytes' y 'bytes_por_tarea' retenidos
+                desde la base, 'capas' (bytes por capa), 'widgets' (por clase),
+                'texturas', 'bytes_texturas' y 'principales' (lista de
+                (línea, bytes, asignaciones))
+        """
+        if self.base is None:
+            self.iniciar()
+        # Las asignaciones ya liberadas pero aún en ciclos no cuentan
+        gc.collect()
+        instantanea = tracemalloc.take_snapshot().filter_traces(FILTROS_TRACEMALLOC)
+        # Después de la instantánea: la lista de gc.get_objects() no se mide
+        widgets, texturas, bytes_texturas = contar_widgets()
+        
+        capas = {}
+        total = 0
+        for diferencia in instantanea.compare_to(self.base, "filename"):
+            capa = capa_de(diferencia.traceback[0].filename)
+            capas[capa] = capas.get(capa, 0) + diferencia.size_diff
+            total += diferencia.size_diff
+        
+        lineas = []
+        for diferencia in instantanea.compare_to(self.base, "lineno")[:principales]:
+            marco = diferencia.traceback[0]
+            archivo = os.path.join(*marco.filename.replace("\\", "/").split("/")[-2:])
+            lineas.append((f"{archivo}:{marco.lineno}", diferencia.size_diff, diferencia.count_diff))
+        
+        return {
+            'etiqueta': etiqueta,
+            'tareas': tareas,
+            'bytes': total,
+            'bytes_por_tarea': total / tareas if tareas else 0.0,
+            'capas': capas,
+            'widgets': widgets,
+            'texturas': texturas,
+            'bytes_texturas': bytes_texturas,
+            'principales': lineas,
+        }
+
+
+def informe(muestra):
+    """
+    Convierte una muestra de PerfilMemoria.muestrear en líneas de texto
+    
+    Returns:
+        list: Líneas listas para el registro o la consola
+    """
+    lineas = [
+        f"🧠 Memoria [{muestra['etiqueta']}]: {muestra['bytes'] / 1e6:.2f} MB para {muestra['tareas']} tareas "
+        f"({muestra['bytes_por_tarea']:.0f} bytes/tarea)",
+        "   Capas: " + ", ".join(f"{capa} {bytes_capa / 1e6:.2f} MB"
+                                 for capa, bytes_capa in sorted(muestra['capas'].items(),
+                                                                key=lambda item: item[1], reverse=True)),
+    ]
+    if muestra['widgets']:
+        widgets = sorted(muestra['widgets'].items(), key=lambda item: item[1], reverse=True)
+        lineas.append(f"   Widgets: {sum(muestra['widgets'].values())} ("
+                      + ", ".join(f"{nombre} {cantidad}" for nombre, cantidad in widgets[:5]) + ")")
+        lineas.append(f"   Texturas: {muestra['texturas']} (~{muestra['bytes_texturas'] / 1e6:.2f} MB fuera de tracemalloc)")
+    for linea, bytes_linea, asignaciones in muestra['principales']:
+        lineas.append(f"   {bytes_linea / 1024:>9.1f} KB {asignaciones:>7} asig.  {linea}")
+    return lineas
+
+
+def _marcos_entorno():
+    """
+    Marcos de pila pedidos con TODO_PERFIL_MEMORIA (0 si está desactivado)
+    """
+    valor = os.environ.get("TODO_PERFIL_MEMORIA", "")
+    if valor in ("", "0"):
+        return 0
+    return int(valor) if valor.isdigit() else 1
+
+
+# Instancia compartida por la interfaz; se inicia al construirla
+perfil = PerfilMemoria(activo=_marcos_entorno() > 0, marcos=max(_marcos_entorno(), 1))
@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migraciones del esquema de la base de datos de la App To-Do
+La versión aplicada se guarda en PRAGMA user_version
+"""
+
+import os
+import sqlite3
+
+
+# Triggers que mantienen los contadores de estadisticas_tareas
+TRIGGERS_ESTADISTICAS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_insertar AFTER INSERT ON tareas
+    BEGIN
+        UPDATE estadisticas_tareas
+        SET total = total + 1, completadas = completadas + (NEW.completada = 1)
+        WHERE id = 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_eliminar AFTER DELETE ON tareas
+    BEGIN
+        UPDATE estadisticas_tareas
+        SET total = total - 1, completadas = completadas - (OLD.completada = 1)
+        WHERE id = 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_actualizar AFTER UPDATE OF completada ON tareas
+    BEGIN
+        UPDATE estadisticas_tareas
+        SET completadas = completadas + (NEW.completada = 1) - (OLD.completada = 1)
+        WHERE id = 1;
+    END
+    ''',
+)
+
+# Triggers que sincronizan el índice de texto completo tareas_fts
+TRIGGERS_FTS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_fts_insertar AFTER INSERT ON tareas
+    BEGIN
+        INSERT INTO tareas_fts (rowid, titulo, descripcion)
+        VALUES (NEW.id, NEW.titulo, NEW.descripcion);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_fts_eliminar AFTER DELETE ON tareas
+    BEGIN
+        INSERT INTO tareas_fts (tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_fts_actualizar AFTER UPDATE OF titulo, descripcion ON tareas
+    BEGIN
+        INSERT INTO tareas_fts (tareas_fts, rowid, titulo, descripcion)
+        VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion);
+        INSERT INTO tareas_fts (rowid, titulo, descripcion)
+        VALUES (NEW.id, NEW.titulo, NEW.descripcion);
+    END
+    ''',
+)
+
+# Triggers que anotan en el registro de cambios la última modificación de
+# cada tarea (INSERT OR REPLACE: una sola fila por tarea, con secuencia nueva)
+TRIGGERS_CAMBIOS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_cambios_insertar AFTER INSERT ON tareas
+    BEGIN
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (NEW.id, 0);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_cambios_actualizar AFTER UPDATE ON tareas
+    BEGIN
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (NEW.id, 0);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_cambios_eliminar AFTER DELETE ON tareas
+    BEGIN
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (OLD.id, 1);
+    END
+    ''',
+)
+
+# Desde la versión 6 la eliminación guarda también el uuid y la fecha, para
+# poder sincronizarla aunque la fila ya no exista
+TRIGGER_CAMBIOS_ELIMINAR_SINCRONIZABLE = '''
+    CREATE TRIGGER IF NOT EXISTS trg_cambios_eliminar AFTER DELETE ON tareas
+    BEGIN
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada, uuid, fecha)
+        VALUES (OLD.id, 1, OLD.uuid, CAST(strftime('%s', 'now') AS INTEGER));
+    END
+'''
+
+# Las filas insertadas sin uuid (scripts, otros procesos) reciben uno
+TRIGGER_UUID = '''
+    CREATE TRIGGER IF NOT EXISTS trg_tareas_uuid AFTER INSERT ON tareas
+    WHEN NEW.uuid IS NULL
+    BEGIN
+        UPDATE tareas SET uuid = lower(hex(randomblob(16))) WHERE id = NEW.id;
+    END
+'''
+
+# Desde la versión 9 los triggers AFTER INSERT fila a fila no se disparan
+# mientras carga_masiva tiene su fila. GestorTareas.agregar_tareas_lote la
+# inserta al empezar cada lote y la borra antes del commit, de modo que
+# ninguna otra conexión llega a verla; en su lugar aplica a las filas nuevas
+# (id > ?) la sentencia de EQUIVALENTES_INSERCION_MASIVA del mismo nombre,
+# que debe hacer lo mismo que el trigger.
+TRIGGERS_INSERCION_OMITIBLES = {
+    "trg_estadisticas_insertar": '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_insertar AFTER INSERT ON tareas
+    WHEN NOT EXISTS (SELECT 1 FROM carga_masiva)
+    BEGIN
+        UPDATE estadisticas_tareas
+        SET total = total + 1, completadas = completadas + (NEW.completada = 1)
+        WHERE id = 1;
+    END
+    ''',
+    "trg_fts_insertar": '''
+    CREATE TRIGGER IF NOT EXISTS trg_fts_insertar AFTER INSERT ON tareas
+    WHEN NOT EXISTS (SELECT 1 FROM carga_masiva)
+    BEGIN
+        INSERT INTO tareas_fts (rowid, titulo, descripcion)
+        VALUES (NEW.id, NEW.titulo, NEW.descripcion);
+    END
+    ''',
+    "trg_cambios_insertar": '''
+    CREATE TRIGGER IF NOT EXISTS trg_cambios_insertar AFTER INSERT ON tareas
+    WHEN NOT EXISTS (SELECT 1 FROM carga_masiva)
+    BEGIN
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (NEW.id, 0);
+    END
+    ''',
+}
+
+EQUIVALENTES_INSERCION_MASIVA = {
+    "trg_estadisticas_insertar": '''
+        UPDATE estadisticas_tareas
+        SET total = total + (SELECT COUNT(*) FROM tareas WHERE id > ?1),
+            completadas = completadas + (SELECT COUNT(*) FROM tareas WHERE id > ?1 AND completada = 1)
+        WHERE id = 1
+    ''',
+    "trg_fts_insertar": '''
+        INSERT INTO tareas_fts (rowid, titulo, descripcion)
+        SELECT id, titulo, descripcion FROM tareas WHERE id > ?1
+    ''',
+    "trg_cambios_insertar": '''
+        INSERT OR REPLACE INTO cambios (tarea_id, eliminada)
+        SELECT id, 0 FROM tareas WHERE id > ?1 ORDER BY id
+    ''',
+}
+
+# Clave de orden por fecha límite: las tareas sin fecha van al final
+# (31/12/9999). Las consultas deben usar la misma expresión que los índices.
+SIN_FECHA_LIMITE = 253402300799
+CLAVE_FECHA_LIMITE = f"ifnull(fecha_limite, {SIN_FECHA_LIMITE})"
+
+# Esquema de la base de datos de archivo, adjunta como 'archivo'. No tiene
+# versiones: se crea con IF NOT EXISTS cada vez que se adjunta. Los
+# PRAGMA van antes de crear la primera tabla.
+ESQUEMA_ARCHIVO = (
+    "PRAGMA archivo.auto_vacuum = INCREMENTAL",
+    "PRAGMA archivo.journal_mode = WAL",
+    '''
+    CREATE TABLE IF NOT EXISTS archivo.tareas_archivadas (
+        id INTEGER PRIMARY KEY,
+        uuid TEXT,
+        titulo TEXT NOT NULL,
+        descripcion TEXT,
+        completada INTEGER NOT NULL DEFAULT 1,
+        fecha_creacion INTEGER NOT NULL,
+        fecha_actualizacion INTEGER,
+        fecha_archivo INTEGER NOT NULL,
+        prioridad INTEGER NOT NULL DEFAULT 0,
+        fecha_limite INTEGER
+    )
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS archivo.idx_archivadas_fecha_creacion
+    ON tareas_archivadas (fecha_creacion DESC, id DESC)
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS archivo.estadisticas_archivo (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL
+    )
+    ''',
+    '''
+    INSERT OR IGNORE INTO archivo.estadisticas_archivo (id, total)
+    SELECT 1, COUNT(*) FROM archivo.tareas_archivadas
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS archivo.trg_archivo_insertar AFTER INSERT ON tareas_archivadas
+    BEGIN
+        UPDATE estadisticas_archivo SET total = total + 1 WHERE id = 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS archivo.trg_archivo_eliminar AFTER DELETE ON tareas_archivadas
+    BEGIN
+        UPDATE estadisticas_archivo SET total = total - 1 WHERE id = 1;
+    END
+    ''',
+)
+
+# Columnas añadidas a tareas_archivadas después de crearse el archivo
+COLUMNAS_ARCHIVO_NUEVAS = (
+    ("prioridad", "INTEGER NOT NULL DEFAULT 0"),
+    ("fecha_limite", "INTEGER"),
+)
+
+
+def _migracion_esquema_inicial(cursor):
+    """
+    Versión 1: tabla tareas con fechas en texto, índice de orden,
+    contadores de estadísticas y búsqueda FTS5.
+    
+    Usa IF NOT EXISTS porque las bases de datos anteriores a las
+    migraciones pueden tener ya parte de estos objetos.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tareas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            descripcion TEXT,
+            completada INTEGER DEFAULT 0,
+            fecha_creacion TEXT NOT NULL,
+            fecha_actualizacion TEXT
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_fecha_creacion
+        ON tareas (fecha_creacion DESC, id DESC)
+    ''')
+    
+    # Contadores de estadísticas, partiendo de los valores reales de la tabla
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS estadisticas_tareas (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL,
+            completadas INTEGER NOT NULL
+        )
+    ''')
+    for sql in TRIGGERS_ESTADISTICAS:
+        cursor.execute(sql)
+    cursor.execute('''
+        INSERT OR IGNORE INTO estadisticas_tareas (id, total, completadas)
+        SELECT 1, COUNT(*), COALESCE(SUM(completada = 1), 0) FROM tareas
+    ''')
+    
+    # Búsqueda de texto completo con contenido externo (el texto vive en tareas)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'tareas_fts'")
+    existia_fts = cursor.fetchone() is not None
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tareas_fts USING fts5(
+            titulo, descripcion,
+            content='tareas', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''')
+    for sql in TRIGGERS_FTS:
+        cursor.execute(sql)
+    if not existia_fts:
+        cursor.execute("INSERT INTO tareas_fts (tareas_fts) VALUES ('rebuild')")
+
+
+def _migracion_fechas_enteras(cursor):
+    """
+    Versión 2: fecha_creacion y fecha_actualizacion pasan de texto
+    'YYYY-MM-DD HH:MM:SS' (hora local) a segundos desde epoch (INTEGER).
+    
+    SQLite no permite cambiar el tipo de una columna, así que la tabla se
+    copia con INSERT ... SELECT, que recorre las filas dentro del motor sin
+    pasar por Python, y se sustituye. Los IDs se conservan, por lo que el
+    índice FTS y los contadores siguen siendo válidos.
+    """
+    cursor.execute("DROP TABLE IF EXISTS tareas_migracion")
+    cursor.execute('''
+        CREATE TABLE tareas_migracion (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            descripcion TEXT,
+            completada INTEGER NOT NULL DEFAULT 0,
+            fecha_creacion INTEGER NOT NULL,
+            fecha_actualizacion INTEGER
+        )
+    ''')
+    
+    # El modificador 'utc' interpreta el texto como hora local
+    cursor.execute('''
+        INSERT INTO tareas_migracion (id, titulo, descripcion, completada, fecha_creacion, fecha_actualizacion)
+        SELECT id, titulo, descripcion, COALESCE(completada, 0),
+               COALESCE(CAST(strftime('%s', fecha_creacion, 'utc') AS INTEGER),
+                        CAST(strftime('%s', 'now') AS INTEGER)),
+               CAST(strftime('%s', fecha_actualizacion, 'utc') AS INTEGER)
+        FROM tareas
+        ORDER BY id
+    ''')
+    
+    # Conservar el contador de AUTOINCREMENT para no reutilizar IDs borrados
+    cursor.execute('''
+        UPDATE sqlite_sequence
+        SET seq = MAX(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tareas'), 0))
+        WHERE name = 'tareas_migracion'
+    ''')
+    
+    cursor.execute("DROP TABLE tareas")
+    cursor.execute("ALTER TABLE tareas_migracion RENAME TO tareas")
+    
+    cursor.execute('''
+        CREATE INDEX idx_tareas_fecha_creacion
+        ON tareas (fecha_creacion DESC, id DESC)
+    ''')
+    for sql in TRIGGERS_ESTADISTICAS + TRIGGERS_FTS:
+        cursor.execute(sql)
+
+
+def _migracion_indices_filtro(cursor):
+    """
+    Versión 3: índices para filtrar por estado y para localizar cambios
+    recientes por fecha de actualización
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_completada
+        ON tareas (completada, fecha_creacion DESC, id DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_fecha_actualizacion
+        ON tareas (fecha_actualizacion)
+    ''')
+
+
+def _migracion_indices_parciales(cursor):
+    """
+    Versión 4: un índice parcial por filtro de estado. Cada uno solo
+    contiene las tareas de su filtro, así que la primera página de
+    pendientes no recorre las miles de completadas. Sustituyen al índice
+    compuesto de la versión 3, que ya no usa ninguna consulta.
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_pendientes
+        ON tareas (fecha_creacion DESC, id DESC) WHERE completada = 0
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_completadas
+        ON tareas (fecha_creacion DESC, id DESC) WHERE completada = 1
+    ''')
+    cursor.execute("DROP INDEX IF EXISTS idx_tareas_completada")
+
+
+def _migracion_registro_cambios(cursor):
+    """
+    Versión 5: registro de cambios para detectar las escrituras de otros
+    procesos. Cada tarea creada, modificada o eliminada deja su ID con una
+    secuencia creciente; quien conoce la última secuencia que vio lee solo
+    lo que cambió después. Empieza vacío: lo anterior ya está en la tabla.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cambios (
+            secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+            tarea_id INTEGER NOT NULL UNIQUE,
+            eliminada INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for sql in TRIGGERS_CAMBIOS:
+        cursor.execute(sql)
+
+
+def _migracion_sincronizacion(cursor):
+    """
+    Versión 6: identificador global (uuid) por tarea, para reconocer la
+    misma tarea en todos los dispositivos aunque su ID local sea distinto,
+    y tabla sincronizacion con los cursores de sincronizacion.py.
+    
+    El registro de cambios guarda además el uuid y la fecha de cada
+    eliminación, y marca con remoto = 1 los cambios que llegaron del
+    servidor para no reenviarlos. Al asignar los uuid, todas las tareas
+    existentes pasan por el registro: la primera sincronización las envía.
+    """
+    cursor.execute("ALTER TABLE tareas ADD COLUMN uuid TEXT")
+    cursor.execute("UPDATE tareas SET uuid = lower(hex(randomblob(16)))")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tareas_uuid ON tareas (uuid)")
+    cursor.execute(TRIGGER_UUID)
+    
+    cursor.execute("ALTER TABLE cambios ADD COLUMN uuid TEXT")
+    cursor.execute("ALTER TABLE cambios ADD COLUMN fecha INTEGER")
+    cursor.execute("ALTER TABLE cambios ADD COLUMN remoto INTEGER NOT NULL DEFAULT 0")
+    # Eliminaciones locales por uuid, para no resucitar una tarea borrada
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_cambios_eliminadas
+        ON cambios (uuid) WHERE eliminada = 1
+    ''')
+    cursor.execute("DROP TRIGGER IF EXISTS trg_cambios_eliminar")
+    cursor.execute(TRIGGER_CAMBIOS_ELIMINAR_SINCRONIZABLE)
+    
+    # Sin tipo en valor: los cursores se guardan como enteros y el
+    # identificador del dispositivo como texto
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sincronizacion (
+            clave TEXT PRIMARY KEY,
+            valor NOT NULL
+        )
+    ''')
+
+
+def _migracion_indice_archivo(cursor):
+    """
+    Versión 7: índice parcial de las completadas por fecha de
+    actualización, para que el archivado encuentre las antiguas sin
+    recorrer las pendientes ni las completadas recientes
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_completadas_actualizacion
+        ON tareas (fecha_actualizacion) WHERE completada = 1
+    ''')
+
+
+def _migracion_prioridad_fecha_limite(cursor):
+    """
+    Versión 8: prioridad (0 ninguna a 3 alta) y fecha límite opcional.
+    
+    Cada orden nuevo de la lista tiene dos índices compuestos: uno con
+    todas las tareas y otro parcial con las pendientes, que sirve también
+    a las vencidas y las próximas. Ninguna página recorre la tabla ni
+    ordena en un B-tree temporal; las completadas usan el índice completo
+    saltando las pendientes. Un índice compuesto que empezara por
+    completada haría que SQLite dejara de elegir los parciales de la
+    versión 4 para el orden por fecha de creación.
+    
+    Añadir una columna con valor por defecto no reescribe las filas.
+    """
+    cursor.execute("ALTER TABLE tareas ADD COLUMN prioridad INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("ALTER TABLE tareas ADD COLUMN fecha_limite INTEGER")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_prioridad
+        ON tareas (prioridad DESC, fecha_creacion DESC, id DESC)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tareas_pendientes_prioridad
+        ON tareas (prioridad DESC, fecha_creacion DESC, id DESC) WHERE completada = 0
+    ''')
+    cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_tareas_fecha_limite
+        ON tareas ({CLAVE_FECHA_LIMITE}, id)
+    ''')
+    cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_tareas_pendientes_fecha_limite
+        ON tareas ({CLAVE_FECHA_LIMITE}, id) WHERE completada = 0
+    ''')
+
+
+def _migracion_carga_masiva(cursor):
+    """
+    Versión 9: tabla carga_masiva (vacía salvo dentro de la transacción de
+    un lote de agregar_tareas_lote) y triggers AFTER INSERT que no se
+    disparan mientras tiene su fila. Los lotes dejan de quitar y volver a
+    crear los triggers, lo que cambiaba el esquema en cada lote y obligaba
+    a las demás conexiones a volver a preparar sus sentencias.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS carga_masiva (
+            id INTEGER PRIMARY KEY CHECK (id = 1)
+        )
+    ''')
+    for nombre, sql in TRIGGERS_INSERCION_OMITIBLES.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+        cursor.execute(sql)
+
+
+def completar_archivo(conexion):
+    """
+    Añade a un archivo creado por una versión anterior las columnas que
+    le falten (el archivo no tiene user_version propio)
+    
+    Args:
+        conexion (sqlite3.Connection): Conexión con el archivo adjunto
+    """
+    existentes = {fila[1] for fila in conexion.execute("PRAGMA archivo.table_info(tareas_archivadas)")}
+    for nombre, definicion in COLUMNAS_ARCHIVO_NUEVAS:
+        if nombre not in existentes:
+            conexion.execute(f"ALTER TABLE archivo.tareas_archivadas ADD COLUMN {nombre} {definicion}")
+
+
+# (versión, descripción, función) en orden; nunca se modifica una ya publicada
+MIGRACIONES = (
+    (1, "esquema inicial", _migracion_esquema_inicial),
+    (2, "fechas como enteros epoch", _migracion_fechas_enteras),
+    (3, "índices de filtro", _migracion_indices_filtro),
+    (4, "índices parciales por estado", _migracion_indices_parciales),
+    (5, "registro de cambios", _migracion_registro_cambios),
+    (6, "uuid y estado de sincronización", _migracion_sincronizacion),
+    (7, "índice de archivado", _migracion_indice_archivo),
+    (8, "prioridad y fecha límite", _migracion_prioridad_fecha_limite),
+    (9, "triggers omitibles en cargas masivas", _migracion_carga_masiva),
+)
+
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+
+def version_esquema(conexion):
+    """
+    Obtiene la versión del esquema guardada en la base de datos
+    
+    Returns:
+        int: Valor de PRAGMA user_version
+    """
+    return conexion.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrar(conexion):
+    """
+    Aplica en orden las migraciones pendientes
+    
+    Cada migración se ejecuta en su propia transacción junto con el cambio
+    de user_version: si se interrumpe, se deshace entera y la siguiente
+    ejecución continúa desde la última versión completada.
+    
+    Args:
+        conexion (sqlite3.Connection): Conexión a la base de datos
+    
+    Returns:
+        list: Descripciones de las migraciones aplicadas
+    """
+    aplicadas = []
+    version = version_esquema(conexion)
+    
+    for numero, descripcion, migracion in MIGRACIONES:
+        if numero <= version:
+            continue
+        
+        cursor = conexion.cursor()
+        try:
+            # IMMEDIATE: bloquear a otros escritores desde el principio
+            cursor.execute("BEGIN IMMEDIATE")
+            # Otro proceso pudo migrar mientras esperábamos el bloqueo
+            if version_esquema(conexion) >= numero:
+                conexion.rollback()
+                continue
+            migracion(cursor)
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            conexion.commit()
+        except sqlite3.Error:
+            conexion.rollback()
+            raise
+        
+        aplicadas.append(f"v{numero}: {descripcion}")
+    
+    return aplicadas
+
+
+def probar_migraciones():
+    """
+    Comprueba la migración de una base de datos anterior a las migraciones
+    y que volver a ejecutarla no cambia nada
+    """
+    print("🧪 Probando las migraciones...")
+    
+    # tempfile solo lo usan las pruebas; importarlo arriba retrasaría la CLI
+    import tempfile
+    with tempfile.TemporaryDirectory() as directorio:
+        conexion = sqlite3.connect(os.path.join(directorio, "prueba_migraciones.db"))
+        conexion.execute('''
+            CREATE TABLE tareas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                titulo TEXT NOT NULL,
+                descripcion TEXT,
+                completada INTEGER DEFAULT 0,
+                fecha_creacion TEXT NOT NULL,
+                fecha_actualizacion TEXT
+            )
+        ''')
+        conexion.executemany(
+            "INSERT INTO tareas (titulo, completada, fecha_creacion, fecha_actualizacion) VALUES (?, ?, ?, ?)",
+            [("Antigua", 1, "2024-01-15 10:30:00", "2024-01-15 10:30:00"),
+             ("Reciente", 0, "2024-02-01 08:00:00", None)]
+        )
+        conexion.execute("DELETE FROM tareas WHERE id = 2")
+        conexion.execute("INSERT INTO tareas (titulo, fecha_creacion) VALUES ('Otra', '2024-02-01 08:00:00')")
+        conexion.commit()
+        
+        assert len(migrar(conexion)) == VERSION_ACTUAL
+        assert version_esquema(conexion) == VERSION_ACTUAL
+        assert migrar(conexion) == []
+        
+        filas = conexion.execute("SELECT id, typeof(fecha_creacion), fecha_actualizacion FROM tareas ORDER BY id").fetchall()
+        assert [fila[:2] for fila in filas] == [(1, 'integer'), (3, 'integer')]
+        assert filas[1][2] is None
+        assert conexion.execute("SELECT total, completadas FROM estadisticas_tareas").fetchone() == (2, 1)
+        assert conexion.execute("SELECT rowid FROM tareas_fts WHERE tareas_fts MATCH 'otra'").fetchall() == [(3,)]
+        
+        # El AUTOINCREMENT no debe reutilizar el ID borrado
+        cursor = conexion.execute("INSERT INTO tareas (titulo, fecha_creacion) VALUES ('Nueva', 0)")
+        assert cursor.lastrowid == 4
+        
+        # Las tareas migradas quedan en el registro para la primera sincronización
+        assert conexion.execute("SELECT tarea_id FROM cambios ORDER BY secuencia").fetchall() == [(1,), (3,), (4,)]
+        
+        # Cada tarea queda una sola vez en el registro, con su último cambio
+        conexion.execute("UPDATE tareas SET completada = 1 WHERE id = 4")
+        conexion.execute("DELETE FROM tareas WHERE id = 1")
+        assert conexion.execute("SELECT tarea_id, eliminada FROM cambios ORDER BY secuencia").fetchall() == [(3, 0), (4, 0), (1, 1)]
+        
+        # Las insertadas sin uuid reciben uno; la eliminación lo conserva
+        uuid_4 = conexion.execute("SELECT uuid FROM tareas WHERE id = 4").fetchone()[0]
+        assert uuid_4 and len(uuid_4) == 32
+        conexion.execute("DELETE FROM tareas WHERE id = 4")
+        assert conexion.execute("SELECT uuid, fecha IS NOT NULL FROM cambios WHERE tarea_id = 4").fetchone() == (uuid_4, 1)
+        
+        # Las tareas existentes quedan sin prioridad ni fecha límite
+        assert conexion.execute("SELECT prioridad, fecha_limite FROM tareas WHERE id = 3").fetchone() == (0, None)
+        
+        # Con la fila de carga_masiva los triggers de inserción no se disparan
+        conexion.execute("INSERT INTO carga_masiva (id) VALUES (1)")
+        cursor = conexion.execute("INSERT INTO tareas (titulo, fecha_creacion, uuid) VALUES ('Masiva', 0, 'x')")
+        assert conexion.execute("SELECT COUNT(*) FROM cambios WHERE tarea_id = ?", (cursor.lastrowid,)).fetchone()[0] == 0
+        assert conexion.execute("SELECT total FROM estadisticas_tareas").fetchone()[0] == 1
+        conexion.rollback()
+        conexion.close()
+    
+    print("✅ Migraciones verificadas")
+
+
+if __name__ == "__main__":
+    probar_migraciones()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelos de datos de la App To-Do
+Registro compacto de una tarea devuelto por el gestor
+"""
+
+
+class Tarea:
+    """
+    Datos de una tarea con nombre para cada columna. Usa __slots__ para
+    ocupar lo mismo que la tupla de la fila: una tarea completa no ahorra
+    memoria frente a ella (benchmark.py memoria-filas).
+    
+    El ahorro está en las tareas de la lista, que solo traen una vista
+    previa de la descripción (completa=False); la descripción entera se
+    carga al editarlas.
+    """
+    
+    __slots__ = ('id', 'titulo', 'descripcion', 'completada', 'fecha_creacion',
+                 'fecha_actualizacion', 'prioridad', 'fecha_limite', 'completa')
+    
+    def __init__(self, id, titulo, descripcion, completada, fecha_creacion,
+                 fecha_actualizacion=None, prioridad=0, fecha_limite=None, completa=True):
+        self.id = id
+        self.titulo = titulo
+        self.descripcion = descripcion
+        self.completada = completada
+        self.fecha_creacion = fecha_creacion
+        self.fecha_actualizacion = fecha_actualizacion
+        self.prioridad = prioridad
+        self.fecha_limite = fecha_limite
+        self.completa = completa
+    
+    @classmethod
+    def desde_fila(cls, cursor, fila):
+        """
+        row_factory de sqlite3 para filas con todas las columnas
+        """
+        return cls(*fila)
+    
+    @classmethod
+    def vista_previa_desde_fila(cls, cursor, fila):
+        """
+        row_factory de sqlite3 para filas de lista: las mismas columnas,
+        con una vista previa de la descripción
+        """
+        return cls(*fila, completa=False)
+    
+    def reemplazar(self, **cambios):
+        """
+        Devuelve una copia de la tarea con los campos indicados cambiados
+        """
+        valores = {campo: getattr(self, campo) for campo in self.__slots__}
+        valores.update(cambios)
+        return Tarea(**valores)
+    
+    def __eq__(self, otra):
+        if not isinstance(otra, Tarea):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(otra, campo) for campo in self.__slots__)
+    
+    def __hash__(self):
+        # Solo el ID: dos tareas iguales siempre lo comparten, y una tarea
+        # editada sigue encontrándose en los conjuntos y diccionarios
+        return hash(self.id)
+    
+    def __repr__(self):
+        estado = "completada" if self.completada else "pendiente"
+        return f"Tarea(id={self.id}, titulo={self.titulo!r}, {estado})"
@@ -1,34 +1,239 @@
 -- Script SQL para la base de datos de la App To-Do
 -- Base de datos: SQLite3
 -- Tabla: tareas
+-- Esquema equivalente a la versión 8 de migraciones.py
+-- Las fechas son segundos desde epoch (INTEGER)
+
+-- Vacuum incremental: solo surte efecto antes de crear la primera tabla
+PRAGMA auto_vacuum = INCREMENTAL;
 
 -- Crear tabla de tareas
 CREATE TABLE IF NOT EXISTS tareas (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     titulo TEXT NOT NULL,
     descripcion TEXT,
-    completada INTEGER DEFAULT 0,
-    fecha_creacion TEXT NOT NULL,
-    fecha_actualizacion TEXT
+    completada INTEGER NOT NULL DEFAULT 0,
+    fecha_creacion INTEGER NOT NULL,
+    fecha_actualizacion INTEGER,
+    uuid TEXT,
+    prioridad INTEGER NOT NULL DEFAULT 0,   -- 0 ninguna, 1 baja, 2 media, 3 alta
+    fecha_limite INTEGER                    -- NULL: sin fecha límite
+);
+
+-- Identificador global de cada tarea para la sincronización entre dispositivos
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tareas_uuid ON tareas (uuid);
+
+-- Las filas insertadas sin uuid reciben uno
+CREATE TRIGGER IF NOT EXISTS trg_tareas_uuid AFTER INSERT ON tareas
+WHEN NEW.uuid IS NULL
+BEGIN
+    UPDATE tareas SET uuid = lower(hex(randomblob(16))) WHERE id = NEW.id;
+END;
+
+-- Índice para el orden de la lista y la paginación por cursor
+CREATE INDEX IF NOT EXISTS idx_tareas_fecha_creacion
+ON tareas (fecha_creacion DESC, id DESC);
+
+-- Índices parciales para los filtros de la lista (pendientes / completadas)
+CREATE INDEX IF NOT EXISTS idx_tareas_pendientes
+ON tareas (fecha_creacion DESC, id DESC) WHERE completada = 0;
+
+CREATE INDEX IF NOT EXISTS idx_tareas_completadas
+ON tareas (fecha_creacion DESC, id DESC) WHERE completada = 1;
+
+-- Índice para localizar cambios por fecha de actualización
+CREATE INDEX IF NOT EXISTS idx_tareas_fecha_actualizacion
+ON tareas (fecha_actualizacion);
+
+-- Completadas por antigüedad, para mover las antiguas al archivo
+CREATE INDEX IF NOT EXISTS idx_tareas_completadas_actualizacion
+ON tareas (fecha_actualizacion) WHERE completada = 1;
+
+-- Orden por prioridad (la más alta primero) y por fecha límite (la más
+-- cercana primero, sin fecha al final: 253402300799 = 9999-12-31 23:59:59 UTC).
+-- Las versiones parciales sirven a los pendientes y a las vistas de
+-- vencidas y próximas
+CREATE INDEX IF NOT EXISTS idx_tareas_prioridad
+ON tareas (prioridad DESC, fecha_creacion DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_tareas_pendientes_prioridad
+ON tareas (prioridad DESC, fecha_creacion DESC, id DESC) WHERE completada = 0;
+
+CREATE INDEX IF NOT EXISTS idx_tareas_fecha_limite
+ON tareas (ifnull(fecha_limite, 253402300799), id);
+
+CREATE INDEX IF NOT EXISTS idx_tareas_pendientes_fecha_limite
+ON tareas (ifnull(fecha_limite, 253402300799), id) WHERE completada = 0;
+
+-- Contadores de estadísticas mantenidos por triggers
+CREATE TABLE IF NOT EXISTS estadisticas_tareas (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL,
+    completadas INTEGER NOT NULL
 );
 
--- Insertar datos de ejemplo
+INSERT OR IGNORE INTO estadisticas_tareas (id, total, completadas)
+SELECT 1, COUNT(*), COALESCE(SUM(completada = 1), 0) FROM tareas;
+
+CREATE TRIGGER IF NOT EXISTS trg_estadisticas_insertar AFTER INSERT ON tareas
+BEGIN
+    UPDATE estadisticas_tareas
+    SET total = total + 1, completadas = completadas + (NEW.completada = 1)
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estadisticas_eliminar AFTER DELETE ON tareas
+BEGIN
+    UPDATE estadisticas_tareas
+    SET total = total - 1, completadas = completadas - (OLD.completada = 1)
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estadisticas_actualizar AFTER UPDATE OF completada ON tareas
+BEGIN
+    UPDATE estadisticas_tareas
+    SET completadas = completadas + (NEW.completada = 1) - (OLD.completada = 1)
+    WHERE id = 1;
+END;
+
+-- Índice de texto completo sobre título y descripción (contenido externo)
+CREATE VIRTUAL TABLE IF NOT EXISTS tareas_fts USING fts5(
+    titulo, descripcion,
+    content='tareas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_insertar AFTER INSERT ON tareas
+BEGIN
+    INSERT INTO tareas_fts (rowid, titulo, descripcion)
+    VALUES (NEW.id, NEW.titulo, NEW.descripcion);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_eliminar AFTER DELETE ON tareas
+BEGIN
+    INSERT INTO tareas_fts (tareas_fts, rowid, titulo, descripcion)
+    VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_actualizar AFTER UPDATE OF titulo, descripcion ON tareas
+BEGIN
+    INSERT INTO tareas_fts (tareas_fts, rowid, titulo, descripcion)
+    VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion);
+    INSERT INTO tareas_fts (rowid, titulo, descripcion)
+    VALUES (NEW.id, NEW.titulo, NEW.descripcion);
+END;
+
+-- Registro de cambios: la última modificación de cada tarea con una
+-- secuencia creciente, para que otras instancias lean solo lo que cambió.
+-- Las eliminaciones guardan uuid y fecha; remoto = 1 marca lo recibido
+-- del servidor de sincronización, que no se vuelve a enviar
+CREATE TABLE IF NOT EXISTS cambios (
+    secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+    tarea_id INTEGER NOT NULL UNIQUE,
+    eliminada INTEGER NOT NULL DEFAULT 0,
+    uuid TEXT,
+    fecha INTEGER,
+    remoto INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_cambios_eliminadas
+ON cambios (uuid) WHERE eliminada = 1;
+
+CREATE TRIGGER IF NOT EXISTS trg_cambios_insertar AFTER INSERT ON tareas
+BEGIN
+    INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (NEW.id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cambios_actualizar AFTER UPDATE ON tareas
+BEGIN
+    INSERT OR REPLACE INTO cambios (tarea_id, eliminada) VALUES (NEW.id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cambios_eliminar AFTER DELETE ON tareas
+BEGIN
+    INSERT OR REPLACE INTO cambios (tarea_id, eliminada, uuid, fecha)
+    VALUES (OLD.id, 1, OLD.uuid, CAST(strftime('%s', 'now') AS INTEGER));
+END;
+
+-- Cursores e identificador del dispositivo de sincronizacion.py
+CREATE TABLE IF NOT EXISTS sincronizacion (
+    clave TEXT PRIMARY KEY,
+    valor NOT NULL
+);
+
+-- Versión del esquema, para que GestorTareas no vuelva a migrar
+PRAGMA user_version = 8;
+
+-- Insertar datos de ejemplo (1705314600 = 2024-01-15 10:30:00 UTC)
 INSERT INTO tareas (titulo, descripcion, completada, fecha_creacion, fecha_actualizacion) VALUES
-('Estudiar Python', 'Completar el curso de Python básico', 0, '2024-01-15 10:30:00', '2024-01-15 10:30:00'),
-('Hacer ejercicio', 'Correr 30 minutos', 0, '2024-01-15 10:30:00', '2024-01-15 10:30:00'),
-('Comprar comida', 'Ir al supermercado', 0, '2024-01-15 10:30:00', '2024-01-15 10:30:00');
+('Estudiar Python', 'Completar el curso de Python básico', 0, 1705314600, 1705314600),
+('Hacer ejercicio', 'Correr 30 minutos', 0, 1705314600, 1705314600),
+('Comprar comida', 'Ir al supermercado', 0, 1705314600, 1705314600);
 
 -- Consultas útiles para verificar los datos
 
 -- Ver todas las tareas
 SELECT * FROM tareas;
 
--- Ver solo tareas pendientes
-SELECT * FROM tareas WHERE completada = 0;
+-- Ver tareas con las fechas legibles (hora local)
+SELECT id, titulo, datetime(fecha_creacion, 'unixepoch', 'localtime') AS creada
+FROM tareas ORDER BY fecha_creacion DESC, id DESC;
+
+-- Ver solo tareas pendientes (usa idx_tareas_pendientes)
+SELECT * FROM tareas WHERE completada = 0 ORDER BY fecha_creacion DESC, id DESC LIMIT 50;
 
 -- Ver solo tareas completadas
 SELECT * FROM tareas WHERE completada = 1;
 
+-- Tareas pendientes vencidas, la más atrasada primero
+-- (usa idx_tareas_pendientes_fecha_limite; la expresión debe ser la misma del índice)
+SELECT id, titulo, datetime(fecha_limite, 'unixepoch', 'localtime') AS vence FROM tareas
+WHERE completada = 0 AND ifnull(fecha_limite, 253402300799) < CAST(strftime('%s', 'now') AS INTEGER)
+ORDER BY ifnull(fecha_limite, 253402300799), id LIMIT 50;
+
+-- Tareas pendientes que vencen en los próximos 7 días
+SELECT id, titulo, datetime(fecha_limite, 'unixepoch', 'localtime') AS vence FROM tareas
+WHERE completada = 0
+  AND ifnull(fecha_limite, 253402300799) >= CAST(strftime('%s', 'now') AS INTEGER)
+  AND ifnull(fecha_limite, 253402300799) < CAST(strftime('%s', 'now', '+7 days') AS INTEGER)
+ORDER BY ifnull(fecha_limite, 253402300799), id LIMIT 50;
+
+-- Pendientes por prioridad (usa idx_tareas_pendientes_prioridad)
+SELECT id, titulo, prioridad FROM tareas WHERE completada = 0
+ORDER BY prioridad DESC, fecha_creacion DESC, id DESC LIMIT 50;
+
+-- Buscar tareas por prefijo, ordenadas por relevancia
+SELECT t.* FROM tareas_fts JOIN tareas AS t ON t.id = tareas_fts.rowid
+WHERE tareas_fts MATCH '"estu"*' ORDER BY rank;
+
+-- Eliminar todas las completadas en una sola sentencia (usa idx_tareas_completadas)
+-- y devolver al disco las páginas liberadas
+-- DELETE FROM tareas WHERE completada = 1;
+-- PRAGMA incremental_vacuum;
+
+-- Tareas creadas, modificadas o eliminadas después de la secuencia 0
+SELECT c.secuencia, c.tarea_id, c.eliminada, t.titulo
+FROM cambios AS c LEFT JOIN tareas AS t ON t.id = c.tarea_id
+WHERE c.secuencia > 0 ORDER BY c.secuencia;
+
+-- Cambios locales pendientes de enviar al servidor de sincronización
+SELECT c.secuencia, COALESCE(t.uuid, c.uuid) AS uuid, c.eliminada
+FROM cambios AS c LEFT JOIN tareas AS t ON t.id = c.tarea_id
+WHERE c.secuencia > (SELECT COALESCE(MAX(valor), 0) FROM sincronizacion WHERE clave = 'cursor_envio')
+  AND c.remoto = 0
+ORDER BY c.secuencia;
+
+-- Tareas archivadas: viven en tareas_archivo.db (esquema en
+-- migraciones.ESQUEMA_ARCHIVO), que GestorTareas adjunta al usarla
+-- ATTACH DATABASE 'tareas_archivo.db' AS archivo;
+-- SELECT id, titulo FROM archivo.tareas_archivadas ORDER BY fecha_creacion DESC, id DESC LIMIT 50;
+-- SELECT total FROM archivo.estadisticas_archivo WHERE id = 1;
+
+-- Completadas sin cambios en 30 días (candidatas a archivar)
+SELECT id, titulo FROM tareas
+WHERE completada = 1 AND fecha_actualizacion < CAST(strftime('%s', 'now', '-30 days') AS INTEGER);
+
 -- Contar total de tareas
 SELECT COUNT(*) as total_tareas FROM tareas;
 
@@ -38,6 +243,10 @@ SELECT COUNT(*) as tareas_completadas FROM tareas WHERE completada = 1;
 -- Contar tareas pendientes
 SELECT COUNT(*) as tareas_pendientes FROM tareas WHERE completada = 0;
 
+-- Ver estadísticas mantenidas por los triggers (sin recorrer la tabla)
+SELECT total, completadas, total - completadas AS pendientes
+FROM estadisticas_tareas WHERE id = 1;
+
 -- Ver estadísticas generales
 SELECT 
     COUNT(*) as total,
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sincronización por deltas de la App To-Do
+Envía y recibe solo los cambios posteriores a un cursor guardado, en lotes
+comprimidos con gzip; ante dos versiones de una tarea gana la de
+fecha_actualizacion más reciente. Incluye un servidor HTTP local que hace
+de servidor de sincronización para las pruebas y los benchmarks.
+"""
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import urllib.parse
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from gestor import GestorTareas
+
+
+registro = logging.getLogger(__name__)
+
+
+# Cambios por petición en cada sentido
+TAMANO_LOTE_SINCRONIZACION = 500
+
+# Segundos de espera de cada petición al servidor
+TIEMPO_ESPERA_HTTP = 30
+
+
+def comprimir(datos):
+    """
+    Serializa datos a JSON comprimido con gzip
+    """
+    return gzip.compress(json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def descomprimir(cuerpo):
+    """
+    Operación inversa de comprimir()
+    """
+    return json.loads(gzip.decompress(cuerpo).decode("utf-8"))
+
+
+class SincronizadorTareas:
+    """
+    Sincroniza la base de datos de un GestorTareas con un servidor
+    
+    Protocolo (cuerpos JSON comprimidos con gzip):
+        POST /cambios  {"dispositivo", "cambios"} -> {"aceptados"}
+        GET  /cambios?desde=N&limite=M&dispositivo=D -> {"cambios", "cursor", "mas"}
+    """
+    
+    def __init__(self, gestor, url, tamano_lote=TAMANO_LOTE_SINCRONIZACION):
+        """
+        Args:
+            gestor (GestorTareas): Gestor de la base de datos local
+            url (str): URL base del servidor, sin barra final
+            tamano_lote (int): Cambios por petición
+        """
+        self.gestor = gestor
+        self.url = url.rstrip("/")
+        self.tamano_lote = tamano_lote
+        # Bytes comprimidos enviados y recibidos, para los benchmarks
+        self.bytes_enviados = 0
+        self.bytes_recibidos = 0
+    
+    @property
+    def dispositivo(self):
+        """
+        Identificador de esta base de datos ante el servidor; se crea la
+        primera vez y se guarda con los cursores
+        """
+        dispositivo = self.gestor.obtener_estado_sincronizacion("dispositivo")
+        if dispositivo is None:
+            dispositivo = uuid.uuid4().hex
+            self.gestor.guardar_estado_sincronizacion("dispositivo", dispositivo)
+        return dispositivo
+    
+    def _peticion(self, metodo, ruta, datos=None):
+        """
+        Hace una petición al servidor y devuelve la respuesta descomprimida
+        """
+        cuerpo = comprimir(datos) if datos is not None else None
+        peticion = urllib.request.Request(self.url + ruta, data=cuerpo, method=metodo, headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "Accept-Encoding": "gzip",
+        })
+        with urllib.request.urlopen(peticion, timeout=TIEMPO_ESPERA_HTTP) as respuesta:
+            recibido = respuesta.read()
+        self.bytes_enviados += len(cuerpo or b"")
+        self.bytes_recibidos += len(recibido)
+        return descomprimir(recibido)
+    
+    def enviar(self):
+        """
+        Envía los cambios locales posteriores al cursor de envío
+        
+        Returns:
+            int: Número de cambios enviados
+        """
+        dispositivo = self.dispositivo
+        desde = self.gestor.obtener_estado_sincronizacion("cursor_envio", 0)
+        enviados = 0
+        
+        while True:
+            cambios, cursor = self.gestor.cambios_para_enviar(desde, self.tamano_lote)
+            if cursor == desde:
+                return enviados
+            if cambios:
+                self._peticion("POST", "/cambios", {"dispositivo": dispositivo, "cambios": cambios})
+                enviados += len(cambios)
+            # El cursor solo avanza cuando el servidor ha confirmado el lote
+            self.gestor.guardar_estado_sincronizacion("cursor_envio", cursor)
+            desde = cursor
+    
+    def recibir(self):
+        """
+        Recibe y aplica los cambios de otros dispositivos posteriores al
+        cursor de recepción
+        
+        Returns:
+            tuple: (recibidos, aplicados)
+        """
+        dispositivo = self.dispositivo
+        desde = self.gestor.obtener_estado_sincronizacion("cursor_recepcion", 0)
+        recibidos = aplicados = 0
+        
+        while True:
+            consulta = urllib.parse.urlencode({"desde": desde, "limite": self.tamano_lote, "dispositivo": dispositivo})
+            respuesta = self._peticion("GET", f"/cambios?{consulta}")
+            # El cursor se guarda en la misma transacción que los cambios
+            resultado = self.gestor.aplicar_cambios_remotos(respuesta["cambios"],
+                                                            {"cursor_recepcion": respuesta["cursor"]})
+            if resultado is None:
+                raise sqlite3.Error("no se pudieron aplicar los cambios recibidos")
+            recibidos += len(respuesta["cambios"])
+            aplicados += resultado
+            desde = respuesta["cursor"]
+            if not respuesta["mas"]:
+                return recibidos, aplicados
+    
+    def sincronizar(self):
+        """
+        Envía los cambios locales y después recibe los remotos (en este
+        orden, para que un empate de fechas no descarte el cambio local sin
+        haberlo enviado)
+        
+        Returns:
+            dict: 'enviados', 'recibidos' y 'aplicados', o None si falló
+        """
+        try:
+            enviados = self.enviar()
+            recibidos, aplicados = self.recibir()
+            registro.info("🔄 Sincronización: %s enviados, %s recibidos, %s aplicados",
+                          enviados, recibidos, aplicados)
+            return {'enviados': enviados, 'recibidos': recibidos, 'aplicados': aplicados}
+        
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            # urllib.error.URLError es un OSError; los cursores no avanzan
+            registro.error("❌ Error al sincronizar con %s: %s", self.url, e)
+            return None
+
+
+class ServidorSincronizacion:
+    """
+    Servidor de sincronización local (un hilo, SQLite en memoria) que hace
+    las veces del servidor real en pruebas y benchmarks
+    
+    Guarda la última versión de cada tarea con una secuencia creciente, así
+    que cada petición lee solo lo posterior al cursor del cliente.
+    """
+    
+    def __init__(self, puerto=0):
+        """
+        Args:
+            puerto (int): Puerto local; 0 elige uno libre
+        """
+        self._conexion = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conexion.execute('''
+            CREATE TABLE registro (
+                secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+                uuid TEXT NOT NULL UNIQUE,
+                dispositivo TEXT NOT NULL,
+                fecha INTEGER NOT NULL,
+                cambio TEXT NOT NULL
+            )
+        ''')
+        self._candado = threading.Lock()
+        self._servidor = HTTPServer(("127.0.0.1", puerto), self._crear_manejador())
+        self._hilo = None
+        self.peticiones = 0
+    
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._servidor.server_address[1]}"
+    
+    def iniciar(self):
+        """
+        Atiende peticiones en un hilo en segundo plano
+        """
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name="servidor-sincronizacion",
+                                      daemon=True)
+        self._hilo.start()
+        return self
+    
+    def detener(self):
+        """
+        Detiene el servidor y libera el puerto
+        """
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._conexion.close()
+    
+    def recibir_cambios(self, dispositivo, cambios):
+        """
+        Guarda los cambios enviados por un dispositivo salvo los que sean
+        más antiguos que la versión ya guardada (la última escritura gana)
+        
+        Returns:
+            int: Número de cambios aceptados
+        """
+        aceptados = 0
+        with self._candado, self._conexion:
+            for cambio in cambios:
+                fila = self._conexion.execute('SELECT fecha FROM registro WHERE uuid = ?',
+                                              (cambio['uuid'],)).fetchone()
+                if fila and cambio['fecha_actualizacion'] < fila[0]:
+                    continue
+                # REPLACE le da una secuencia nueva: los demás lo recibirán
+                self._conexion.execute('''
+                    INSERT OR REPLACE INTO registro (uuid, dispositivo, fecha, cambio) VALUES (?, ?, ?, ?)
+                ''', (cambio['uuid'], dispositivo, cambio['fecha_actualizacion'], json.dumps(cambio)))
+                aceptados += 1
+        return aceptados
+    
+    def leer_cambios(self, desde, limite, dispositivo):
+        """
+        Devuelve los cambios posteriores a `desde`, sin los del propio dispositivo
+        
+        Returns:
+            dict: 'cambios', 'cursor' (última secuencia leída) y 'mas'
+        """
+        with self._candado:
+            filas = self._conexion.execute('''
+                SELECT secuencia, dispositivo, cambio FROM registro
+                WHERE secuencia > ? ORDER BY secuencia LIMIT ?
+            ''', (desde, limite)).fetchall()
+        return {
+            'cambios': [json.loads(cambio) for _, origen, cambio in filas if origen != dispositivo],
+            'cursor': filas[-1][0] if filas else desde,
+            'mas': len(filas) == limite,
+        }
+    
+    def _crear_manejador(self):
+        servidor = self
+        
+        class Manejador(BaseHTTPRequestHandler):
+            def _responder(self, datos):
+                cuerpo = comprimir(datos)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+            
+            def do_POST(self):
+                servidor.peticiones += 1
+                datos = descomprimir(self.rfile.read(int(self.headers["Content-Length"])))
+                self._responder({'aceptados': servidor.recibir_cambios(datos['dispositivo'], datos['cambios'])})
+            
+            def do_GET(self):
+                servidor.peticiones += 1
+                consulta = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                self._responder(servidor.leer_cambios(int(consulta["desde"][0]), int(consulta["limite"][0]),
+                                                      consulta["dispositivo"][0]))
+            
+            def log_message(self, formato, *args):
+                registro.debug("🌐 " + formato, *args)
+        
+        return Manejador
+
+
+# Función de prueba para verificar el funcionamiento
+def probar_sincronizacion():
+    """
+    Sincroniza dos bases de datos a través del servidor local y comprueba
+    que convergen, que gana la última escritura y que la segunda
+    sincronización solo envía lo que cambió
+    """
+    print("🧪 Probando la sincronización...")
+    
+    # tempfile solo lo usan las pruebas; importarlo arriba retrasaría la CLI
+    import tempfile
+    servidor = ServidorSincronizacion().iniciar()
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor_a = GestorTareas(os.path.join(directorio, "a.db"))
+        gestor_b = GestorTareas(os.path.join(directorio, "b.db"))
+        sinc_a = SincronizadorTareas(gestor_a, servidor.url, tamano_lote=100)
+        sinc_b = SincronizadorTareas(gestor_b, servidor.url, tamano_lote=100)
+        
+        gestor_a.agregar_tareas_lote(({'titulo': f"Tarea {i}"} for i in range(1000)))
+        assert sinc_a.sincronizar()['enviados'] == 1000
+        assert sinc_b.sincronizar()['aplicados'] == 1000
+        assert gestor_b.obtener_estadisticas()['total'] == 1000
+        
+        # Segunda ronda: solo viajan los cambios nuevos
+        tarea_b = gestor_b.obtener_tareas_pagina(1)[0]
+        gestor_b.marcar_completada(tarea_b.id, True)
+        gestor_b.agregar_tarea("Solo en B", prioridad=3, fecha_limite=2_000_000_000)
+        assert sinc_b.sincronizar() == {'enviados': 2, 'recibidos': 0, 'aplicados': 0}
+        assert sinc_a.sincronizar() == {'enviados': 0, 'recibidos': 2, 'aplicados': 2}
+        assert gestor_a.obtener_estadisticas() == {'total': 1001, 'completadas': 1, 'pendientes': 1000,
+                                                  'archivadas': 0}
+        solo_en_b = gestor_a.obtener_tareas_pagina(1, orden="prioridad")[0]
+        assert (solo_en_b.titulo, solo_en_b.fecha_limite) == ("Solo en B", 2_000_000_000)
+        
+        # Última escritura gana: A edita después que B
+        uuid_tarea = gestor_a._obtener_conexion().execute(
+            "SELECT uuid FROM tareas WHERE titulo = 'Tarea 0'").fetchone()[0]
+        for gestor, titulo, fecha in ((gestor_b, "Editada en B", 2_000_000_000),
+                                      (gestor_a, "Editada en A", 2_000_000_100)):
+            with gestor._obtener_conexion() as conexion:
+                conexion.execute("UPDATE tareas SET titulo = ?, fecha_actualizacion = ? WHERE uuid = ?",
+                                 (titulo, fecha, uuid_tarea))
+        sinc_a.sincronizar()
+        sinc_b.sincronizar()
+        for gestor in (gestor_a, gestor_b):
+            assert gestor._obtener_conexion().execute(
+                "SELECT titulo FROM tareas WHERE uuid = ?", (uuid_tarea,)).fetchone() == ("Editada en A",)
+        
+        # Las eliminaciones también se propagan
+        assert gestor_a.eliminar_completadas() == 1
+        sinc_a.sincronizar()
+        sinc_b.sincronizar()
+        assert gestor_b.obtener_estadisticas()['completadas'] == 0
+        
+        # Sin cambios, una sincronización no envía nada
+        assert sinc_a.sincronizar() == {'enviados': 0, 'recibidos': 0, 'aplicados': 0}
+        print(f"📦 {sinc_a.bytes_enviados + sinc_b.bytes_enviados} bytes enviados, "
+              f"{servidor.peticiones} peticiones")
+        
+        gestor_a.cerrar_conexion()
+        gestor_b.cerrar_conexion()
+    servidor.detener()
+    
+    print("✅ Prueba de sincronización completada")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    probar_sincronizacion()